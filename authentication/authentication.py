@@ -0,0 +1,92 @@
+from django.utils.functional import cached_property
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from authentication import denylist, profiles
+
+TOKEN_USER_CLAIMS = ("email", "is_staff", "is_active")
+
+
+def get_employee(user):
+    """
+    Return the Employee behind request.user, whichever authentication class
+    produced it.
+    """
+    if isinstance(user, EmployeeTokenUser):
+        return user.employee
+    return user
+
+
+class EmployeeTokenUser(TokenUser):
+    """
+    Request user built from the claims of an access token. Attributes that are
+    not carried by the token are read from the employee it belongs to.
+    """
+
+    @cached_property
+    def email(self):
+        return self.token["email"]
+
+    @cached_property
+    def is_active(self):
+        return self.token["is_active"]
+
+    @cached_property
+    def employee(self):
+        return profiles.get_employee(self.pk)
+
+    def __str__(self):
+        return self.email
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.employee, attr)
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    JWTAuthentication that also rejects tokens on the denylist.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if denylist.is_revoked(validated_token):
+            raise InvalidToken({"detail": "Token has been revoked"})
+        return validated_token
+
+    def get_user(self, validated_token):
+        """
+        Load the employee from the profile cache rather than the database.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        try:
+            user = profiles.get_employee(user_id)
+        except profiles.Employee.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate from the token claims alone, without loading the employee.
+    Tokens issued before the claims were added fall back to the database.
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in TOKEN_USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        user = EmployeeTokenUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
@@ -0,0 +1,113 @@
+"""
+Revoked JWTs, checked on every authenticated request.
+
+Revocations are kept in a small in-process dictionary in the process that made
+them, and mirrored to Django's cache so the other worker processes see them
+too. Every entry expires together with the tokens it covers, which keeps the
+denylist small.
+
+What the shared cache answers, including that a token is not revoked, is kept
+in each process for LOCAL_TIMEOUT seconds, so checking a token that was seen
+recently costs no I/O. A token revoked by another process may therefore keep
+being accepted here for up to LOCAL_TIMEOUT seconds.
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+from authentication.profiles import LocalCache
+
+LOCAL_MAX_SIZE = 4096
+LOCAL_TIMEOUT = 10
+
+# Stands for keys that the shared cache does not hold, since LocalCache.get()
+# returns None for its own misses
+NOT_REVOKED = False
+
+_entries = {}
+_lock = threading.Lock()
+_checked = LocalCache(LOCAL_MAX_SIZE, LOCAL_TIMEOUT)
+
+
+def get_token_key(jti):
+    return f"auth:denylist:token:{jti}"
+
+
+def get_user_key(user_id):
+    return f"auth:denylist:user:{user_id}"
+
+
+def _remember(key, value, expires_at):
+    now = time.time()
+    with _lock:
+        for stale_key in [k for k, (_, expiry) in _entries.items() if expiry <= now]:
+            del _entries[stale_key]
+        _entries[key] = (value, expires_at)
+    cache.set(key, value, max(1, int(expires_at - now)))
+
+
+def _lookup(keys):
+    now = time.time()
+    found = {}
+    with _lock:
+        for key in keys:
+            entry = _entries.get(key)
+            if entry and entry[1] > now:
+                found[key] = entry[0]
+    missing = []
+    for key in keys:
+        if key in found:
+            continue
+        value = _checked.get(key)
+        if value is None:
+            missing.append(key)
+        elif value is not NOT_REVOKED:
+            found[key] = value
+    if missing:
+        shared = cache.get_many(missing)
+        for key in missing:
+            _checked.set(key, shared.get(key, NOT_REVOKED))
+        found.update(shared)
+    return found
+
+
+def revoke_token(token):
+    """
+    Reject a single access or refresh token until it expires.
+    """
+    _remember(get_token_key(token[api_settings.JTI_CLAIM]), True, token["exp"])
+
+
+def revoke_user(user_id):
+    """
+    Reject every token issued to a user before now, e.g. on logout from all
+    devices or when the claims of the account change.
+
+    Tokens carry their issue time in whole seconds, so the revocation is
+    recorded in whole seconds too: tokens issued in the second of the
+    revocation, such as the ones of a login that follows it, stay valid.
+    """
+    now = int(time.time())
+    lifetime = max(
+        api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME
+    )
+    _remember(get_user_key(user_id), now, now + lifetime.total_seconds())
+
+
+def is_revoked(token):
+    token_key = get_token_key(token.get(api_settings.JTI_CLAIM))
+    user_key = get_user_key(token.get(api_settings.USER_ID_CLAIM))
+    found = _lookup([token_key, user_key])
+    if found.get(token_key):
+        return True
+    revoked_at = found.get(user_key)
+    return revoked_at is not None and token.get("iat", 0) < revoked_at
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+    _checked.clear()
@@ -0,0 +1,125 @@
+import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+Employee = get_user_model()
+
+NAME_FIELDS = ("first_name", "last_name")
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Create employees in bulk from a CSV file with email, first_name, "
+        "last_name and an optional password column. Passwords are hashed in "
+        "parallel with the default hasher; rows without one get an unusable "
+        "password so the employee has to set it before logging in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header row.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Processes hashing passwords. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Employees checked and inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="") as csv_file:
+                rows = list(csv.DictReader(csv_file))
+        except OSError as error:
+            raise CommandError(f"Cannot read {options['path']}: {error}")
+
+        employees = self.validate_rows(rows)
+
+        created = 0
+        # Spawned rather than forked workers, so none inherits a database
+        # connection it could close under this process
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            for batch in batched(employees, options["batch_size"]):
+                batch = self.exclude_existing(batch)
+                passwords = [employee.password for employee in batch]
+                hashes = executor.map(make_password, passwords, chunksize=16)
+                for employee, password_hash in zip(batch, hashes):
+                    employee.password = password_hash
+                try:
+                    with transaction.atomic():
+                        Employee.objects.bulk_create(batch)
+                except IntegrityError:
+                    # Someone registered with one of the emails meanwhile
+                    batch = self.exclude_existing(batch)
+                    with transaction.atomic():
+                        Employee.objects.bulk_create(batch)
+                created += len(batch)
+
+        skipped = len(rows) - created
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {created} employees, skipped {skipped}")
+        )
+
+    def validate_rows(self, rows):
+        """
+        Return unsaved employees for the valid rows, with the raw password (or
+        None) in their password field, and report the invalid ones.
+        """
+        employees = []
+        seen = set()
+        for line, row in enumerate(rows, start=2):
+            email = Employee.objects.normalize_email((row.get("email") or "").strip())
+            employee = Employee(
+                email=email,
+                password=row.get("password") or None,
+                **{field: (row.get(field) or "").strip() for field in NAME_FIELDS},
+            )
+            try:
+                validate_email(email)
+                if email.lower() in seen:
+                    raise ValidationError(f"Duplicate email {email} in file")
+                for field in NAME_FIELDS:
+                    if not getattr(employee, field):
+                        raise ValidationError(f"Missing {field}")
+                if employee.password:
+                    validate_password(employee.password, employee)
+            except ValidationError as error:
+                self.stderr.write(f"Line {line}: {'; '.join(error.messages)}")
+                continue
+            seen.add(email.lower())
+            employees.append(employee)
+        return employees
+
+    def exclude_existing(self, employees):
+        existing = set(
+            Employee.objects.filter(
+                email__in=[employee.email for employee in employees]
+            ).values_list("email", flat=True)
+        )
+        for email in existing:
+            self.stderr.write(f"Employee {email} already exists")
+        return [employee for employee in employees if employee.email not in existing]
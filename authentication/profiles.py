@@ -0,0 +1,101 @@
+"""
+Employee profiles cached for authentication and profile reads.
+
+Lookups go through two tiers: a small LRU dictionary in each process, then
+Django's shared cache, and only then the database. Saving or deleting an
+employee clears the shared entry and this process's local entry; other
+processes may keep serving their local copy for up to LOCAL_TIMEOUT seconds.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+Employee = get_user_model()
+
+LOCAL_MAX_SIZE = 1024
+LOCAL_TIMEOUT = 10
+SHARED_TIMEOUT = 60 * 5
+
+# Every column but the password hash, in model order as Model.from_db() expects
+PROFILE_FIELDS = tuple(
+    field.attname
+    for field in Employee._meta.concrete_fields
+    if field.attname != "password"
+)
+
+
+class LocalCache:
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_profiles = LocalCache(LOCAL_MAX_SIZE, LOCAL_TIMEOUT)
+
+
+def get_profile_key(pk):
+    return f"auth:profile:{pk}"
+
+
+def get_profile(pk):
+    """
+    Return the cached column values of an employee, in PROFILE_FIELDS order.
+    Raises Employee.DoesNotExist for unknown employees.
+    """
+    key = get_profile_key(pk)
+    profile = local_profiles.get(key)
+    if profile is None:
+        profile = cache.get(key)
+        if profile is None:
+            profile = Employee.objects.values_list(*PROFILE_FIELDS).get(pk=pk)
+            cache.set(key, profile, SHARED_TIMEOUT)
+        local_profiles.set(key, profile)
+    return profile
+
+
+def get_employee(pk):
+    """
+    Build an Employee from its cached profile. The password is deferred and
+    loads from the database if a caller touches it.
+    """
+    return Employee.from_db(DEFAULT_DB_ALIAS, PROFILE_FIELDS, get_profile(pk))
+
+
+def invalidate(pk):
+    key = get_profile_key(pk)
+    local_profiles.delete(key)
+    cache.delete(key)
@@ -1,6 +1,15 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication import denylist
+from authentication.authentication import TOKEN_USER_CLAIMS
 
 Employee = get_user_model()
 
@@ -36,3 +45,34 @@ class EmployeeRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop("password_confirm")
         return Employee.objects.create_user(**validated_data)
+
+
+class EmployeeTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Embed the claims StatelessJWTAuthentication needs to build the request user.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in TOKEN_USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class EmployeeTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        if denylist.is_revoked(RefreshToken(attrs["refresh"])):
+            raise InvalidToken({"detail": "Token has been revoked"})
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+    everywhere = serializers.BooleanField(default=False)
+
+    def validate_refresh(self, value):
+        try:
+            return RefreshToken(value)
+        except TokenError as error:
+            raise serializers.ValidationError(str(error))
@@ -0,0 +1,41 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from authentication import denylist, profiles
+from authentication.authentication import TOKEN_USER_CLAIMS
+
+Employee = get_user_model()
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_profile(sender, instance, **kwargs):
+    profiles.invalidate(instance.pk)
+    # Again once committed, in case a concurrent read cached the old row
+    transaction.on_commit(partial(profiles.invalidate, instance.pk))
+
+
+@receiver(pre_save, sender=Employee)
+def remember_token_claims(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_USER_CLAIMS):
+        return
+    instance._saved_token_claims = (
+        Employee.objects.filter(pk=instance.pk).values(*TOKEN_USER_CLAIMS).first()
+    )
+
+
+@receiver(post_save, sender=Employee)
+def revoke_tokens_with_stale_claims(sender, instance, created, **kwargs):
+    # Stateless authentication trusts the claims of a token until it expires,
+    # so a demoted, deactivated or renamed employee needs new tokens
+    saved_claims = instance.__dict__.pop("_saved_token_claims", None)
+    if saved_claims and any(
+        saved_claims[claim] != getattr(instance, claim) for claim in TOKEN_USER_CLAIMS
+    ):
+        denylist.revoke_user(instance.pk)
@@ -0,0 +1,199 @@
+import time as clock
+from datetime import datetime, time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication import denylist
+from authentication.authentication import (
+    EmployeeTokenUser,
+    StatelessJWTAuthentication,
+)
+from authentication.serializers import EmployeeTokenObtainPairSerializer
+from authentication.tests.factories import EmployeeFactory
+from restaurants.tests.factories import MenuFactory
+from voting.models import Vote
+
+
+def patch_revocation_time():
+    # Revocations cover tokens issued before their second, not during it
+    return patch("authentication.denylist.time.time", return_value=clock.time() + 1)
+
+
+def get_request(token):
+    return APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+@pytest.mark.django_db
+class TestStatelessJWTAuthentication:
+    def setup_method(self):
+        self.employee = EmployeeFactory(is_staff=True)
+        self.token = EmployeeTokenObtainPairSerializer.get_token(
+            self.employee
+        ).access_token
+
+    def test_authenticate_from_claims(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            user, token = StatelessJWTAuthentication().authenticate(
+                get_request(self.token)
+            )
+
+        assert isinstance(user, EmployeeTokenUser)
+        assert user.pk == self.employee.pk
+        assert user.email == self.employee.email
+        assert user.is_staff is True
+        assert user.is_authenticated
+
+    def test_full_employee_is_loaded_once(self, django_assert_num_queries):
+        user, _ = StatelessJWTAuthentication().authenticate(get_request(self.token))
+        other, _ = StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+        with django_assert_num_queries(1):
+            assert user.first_name == self.employee.first_name
+            assert other.last_name == self.employee.last_name
+
+    def test_tokens_without_claims_load_the_employee(self):
+        token = RefreshToken.for_user(self.employee).access_token
+
+        user, _ = StatelessJWTAuthentication().authenticate(get_request(token))
+
+        assert user == self.employee
+
+    def test_inactive_claim_is_rejected(self):
+        self.token["is_active"] = False
+
+        with pytest.raises(AuthenticationFailed):
+            StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+    def test_revoked_token_is_rejected(self):
+        denylist.revoke_token(self.token)
+
+        with pytest.raises(InvalidToken):
+            StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+    def test_deactivated_employee_is_rejected(self):
+        self.employee.is_active = False
+        with patch_revocation_time():
+            self.employee.save()
+
+        with pytest.raises(InvalidToken):
+            StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+    def test_demoted_employee_is_rejected(self):
+        self.employee.is_staff = False
+        with patch_revocation_time():
+            self.employee.save(update_fields=["is_staff"])
+
+        with pytest.raises(InvalidToken):
+            StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+    def test_unclaimed_field_change_keeps_tokens(self):
+        self.employee.first_name = "Updated"
+        with patch_revocation_time():
+            self.employee.save()
+
+        user, _ = StatelessJWTAuthentication().authenticate(get_request(self.token))
+        assert user.id == self.employee.id
+
+    def test_accepted_token_is_checked_without_io(self):
+        StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+        with patch("authentication.denylist.cache.get_many") as get_many:
+            StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+        get_many.assert_not_called()
+
+    def test_revocation_by_other_process_is_seen_within_local_timeout(self):
+        with patch("authentication.profiles.time.monotonic", return_value=100):
+            StatelessJWTAuthentication().authenticate(get_request(self.token))
+        # Revoked through the shared cache only, as another process would
+        cache.set(denylist.get_token_key(self.token["jti"]), True)
+
+        with patch("authentication.profiles.time.monotonic", return_value=100):
+            StatelessJWTAuthentication().authenticate(get_request(self.token))
+        timeout = 100 + denylist.LOCAL_TIMEOUT
+        with patch("authentication.profiles.time.monotonic", return_value=timeout):
+            with pytest.raises(InvalidToken):
+                StatelessJWTAuthentication().authenticate(get_request(self.token))
+
+    def test_token_issued_in_the_revocation_second_is_accepted(self):
+        denylist.revoke_user(self.employee.id)
+        token = EmployeeTokenObtainPairSerializer.get_token(self.employee).access_token
+
+        user, _ = StatelessJWTAuthentication().authenticate(get_request(token))
+        assert user.id == self.employee.id
+
+
+@pytest.mark.django_db
+class TestStatelessJWTAuthenticationViews:
+    def setup_method(self):
+        self.client = APIClient()
+        self.employee = EmployeeFactory()
+        token = EmployeeTokenObtainPairSerializer.get_token(self.employee)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        self.patchers = [
+            patch.object(
+                APIView, "authentication_classes", [StatelessJWTAuthentication]
+            ),
+            patch(
+                "django.utils.timezone.localtime",
+                return_value=datetime.combine(timezone.now().date(), time(10, 0)),
+            ),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def teardown_method(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_vote_and_history(self):
+        menu = MenuFactory(date=timezone.now().date())
+
+        response = self.client.post(reverse("voting:create-vote"), {"menu": menu.id})
+        assert response.status_code == status.HTTP_201_CREATED
+        response = self.client.put(reverse("voting:create-vote"), {"menu": menu.id})
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.get(reverse("voting:vote-history"))
+
+        assert Vote.objects.get().employee == self.employee
+        assert len(response.data["results"]) == 1
+
+    def test_profile(self):
+        url = reverse("authentication:profile")
+
+        response = self.client.get(url)
+        assert response.data["first_name"] == self.employee.first_name
+
+        response = self.client.patch(url, {"first_name": "Updated"})
+        assert response.data["first_name"] == "Updated"
+
+        response = self.client.get(url)
+        assert response.data["first_name"] == "Updated"
+
+    def test_demoted_admin_loses_admin_rights(self):
+        admin = EmployeeFactory(is_staff=True)
+        token = EmployeeTokenObtainPairSerializer.get_token(admin).access_token
+        # Issued a second before the demotion
+        token["iat"] -= 1
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse("voting:bulk-create-vote")
+
+        admin.is_staff = False
+        admin.save()
+
+        response = self.client.post(url, {"votes": []}, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        token = EmployeeTokenObtainPairSerializer.get_token(admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.post(url, {"votes": []}, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,85 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authentication.models import Employee
+from authentication.tests.factories import EmployeeFactory
+
+
+@pytest.mark.django_db
+class TestImportEmployeesCommand:
+    def write_csv(self, tmp_path, lines):
+        path = tmp_path / "employees.csv"
+        path.write_text("\n".join(["email,first_name,last_name,password", *lines]))
+        return str(path)
+
+    def test_import_employees(self, tmp_path):
+        path = self.write_csv(
+            tmp_path,
+            [
+                "ada@example.com,Ada,Lovelace,analytical-engine-1843",
+                "alan@example.com,Alan,Turing,",
+            ],
+        )
+        out = StringIO()
+
+        call_command("import_employees", path, "--workers", "1", stdout=out)
+
+        assert "Imported 2 employees, skipped 0" in out.getvalue()
+        ada = Employee.objects.get(email="ada@example.com")
+        assert ada.first_name == "Ada"
+        assert ada.is_active
+        assert ada.check_password("analytical-engine-1843")
+        assert not Employee.objects.get(email="alan@example.com").has_usable_password()
+
+    def test_import_reports_invalid_rows(self, tmp_path):
+        EmployeeFactory(email="taken@example.com")
+        path = self.write_csv(
+            tmp_path,
+            [
+                "taken@example.com,Taken,Employee,",
+                "not-an-email,Bad,Email,",
+                "grace@example.com,,Hopper,",
+                "ada@example.com,Ada,Lovelace,123",
+                "alan@example.com,Alan,Turing,",
+                "alan@example.com,Alan,Again,",
+            ],
+        )
+        out = StringIO()
+        err = StringIO()
+
+        call_command("import_employees", path, "--workers", "1", stdout=out, stderr=err)
+
+        assert "Imported 1 employees, skipped 5" in out.getvalue()
+        errors = err.getvalue()
+        assert "Line 3: Enter a valid email address." in errors
+        assert "Line 4: Missing first_name" in errors
+        assert "Line 5: This password is too short" in errors
+        assert "Line 7: Duplicate email alan@example.com in file" in errors
+        assert "Employee taken@example.com already exists" in errors
+        assert Employee.objects.filter(email="alan@example.com").count() == 1
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(CommandError, match="Cannot read"):
+            call_command("import_employees", str(tmp_path / "missing.csv"))
+
+
+@pytest.mark.django_db
+def test_outdated_password_hash_is_upgraded_at_login():
+    employee = EmployeeFactory()
+    employee.password = make_password("testpass123", hasher="pbkdf2_sha1")
+    employee.save()
+
+    response = APIClient().post(
+        reverse("authentication:token-obtain-pair"),
+        {"email": employee.email, "password": "testpass123"},
+    )
+
+    employee.refresh_from_db()
+    assert response.status_code == status.HTTP_200_OK
+    assert employee.password.startswith("pbkdf2_sha256$")
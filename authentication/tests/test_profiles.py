@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication import profiles
+from authentication.tests.factories import EmployeeFactory
+from restaurants.tests.factories import RestaurantFactory
+
+
+@pytest.mark.django_db
+class TestProfileCache:
+    def setup_method(self):
+        self.employee = EmployeeFactory(is_staff=True)
+
+    def test_get_employee_queries_once(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            first = profiles.get_employee(self.employee.pk)
+            second = profiles.get_employee(self.employee.pk)
+
+        assert first == second == self.employee
+        assert first is not second
+        assert first.email == self.employee.email
+        assert first.is_staff is True
+
+    def test_shared_tier_serves_other_processes(self, django_assert_num_queries):
+        profiles.get_employee(self.employee.pk)
+        profiles.local_profiles.clear()
+
+        with django_assert_num_queries(0):
+            assert profiles.get_employee(self.employee.pk) == self.employee
+
+    def test_save_invalidates_profile(self):
+        profiles.get_employee(self.employee.pk)
+
+        self.employee.first_name = "Renamed"
+        self.employee.save()
+
+        assert profiles.get_employee(self.employee.pk).first_name == "Renamed"
+
+    def test_password_is_not_cached(self, django_assert_num_queries):
+        employee = profiles.get_employee(self.employee.pk)
+
+        with django_assert_num_queries(1):
+            assert employee.check_password("testpass123")
+
+    def test_unknown_employee(self):
+        with pytest.raises(profiles.Employee.DoesNotExist):
+            profiles.get_employee(0)
+
+
+class TestLocalCache:
+    def test_least_recently_used_entry_is_evicted(self):
+        local = profiles.LocalCache(max_size=2, timeout=10)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_entries_expire(self):
+        local = profiles.LocalCache(max_size=2, timeout=10)
+        with patch("authentication.profiles.time.monotonic", return_value=100):
+            local.set("a", 1)
+        with patch("authentication.profiles.time.monotonic", return_value=110):
+            assert local.get("a") is None
+
+
+@pytest.mark.django_db
+class TestProfileCacheViews:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = EmployeeFactory(is_staff=True)
+        token = RefreshToken.for_user(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_profile_served_from_cache(self, django_assert_num_queries):
+        url = reverse("authentication:profile")
+        self.client.get(url)
+
+        with django_assert_num_queries(0):
+            response = self.client.get(url)
+
+        assert response.data["email"] == self.admin.email
+
+    def test_admin_check_served_from_cache(self, django_assert_num_queries):
+        restaurant = RestaurantFactory()
+        url = reverse("restaurants:restaurant-detail", kwargs={"pk": restaurant.pk})
+        self.client.get(reverse("authentication:profile"))
+
+        # Restaurant, unique name check, update and today's menu; no employee
+        with django_assert_num_queries(4):
+            response = self.client.patch(url, {"name": "Renamed"})
+
+        assert response.status_code == status.HTTP_200_OK
@@ -1,9 +1,13 @@
+import time
+from unittest.mock import patch
+
 import pytest
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from authentication import denylist
 from authentication.tests.factories import EmployeeFactory
 
 
@@ -105,3 +109,59 @@ class TestTokenViews:
         data = {"token": str(token)}
         response = self.client.post(self.verify_url, data)
         assert response.status_code == status.HTTP_200_OK
+
+    def test_obtained_token_carries_user_claims(self):
+        data = {"email": self.employee.email, "password": "testpass123"}
+        response = self.client.post(self.login_url, data)
+
+        token = AccessToken(response.data["access"])
+        assert token["email"] == self.employee.email
+        assert token["is_staff"] is False
+        assert token["is_active"] is True
+
+    def test_refresh_revoked_token(self):
+        refresh = RefreshToken.for_user(self.employee)
+        denylist.revoke_token(refresh)
+
+        response = self.client.post(self.refresh_url, {"refresh": str(refresh)})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestTokenRevokeView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse("authentication:token-revoke")
+        self.profile_url = reverse("authentication:profile")
+        self.employee = EmployeeFactory()
+        self.refresh = RefreshToken.for_user(self.employee)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}"
+        )
+
+    def test_revoke_access_and_refresh_token(self):
+        response = self.client.post(self.url, {"refresh": str(self.refresh)})
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert self.client.get(self.profile_url).status_code == 401
+        response = self.client.post(
+            reverse("authentication:token-refresh"), {"refresh": str(self.refresh)}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoke_everywhere(self):
+        other_token = RefreshToken.for_user(self.employee).access_token
+
+        with patch("authentication.denylist.time.time", return_value=time.time() + 1):
+            response = self.client.post(self.url, {"everywhere": True})
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {other_token}")
+        assert self.client.get(self.profile_url).status_code == 401
+
+    def test_revoke_invalid_refresh_token(self):
+        response = self.client.post(self.url, {"refresh": "not-a-token"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert self.client.get(self.profile_url).status_code == 200
@@ -5,7 +5,11 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
-from authentication.views import EmployeeProfileView, EmployeeRegistrationView
+from authentication.views import (
+    EmployeeProfileView,
+    EmployeeRegistrationView,
+    TokenRevokeView,
+)
 
 app_name = "authentication"
 
@@ -15,4 +19,5 @@ urlpatterns = [
     path("token/", TokenObtainPairView.as_view(), name="token-obtain-pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token-verify"),
+    path("token/revoke/", TokenRevokeView.as_view(), name="token-revoke"),
 ]
@@ -1,11 +1,17 @@
+from django.contrib.auth import get_user_model
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 
+from authentication import denylist
+from authentication.authentication import get_employee
 from authentication.serializers import (
     EmployeeRegistrationSerializer,
     EmployeeSerializer,
+    TokenRevokeSerializer,
 )
 
+Employee = get_user_model()
+
 
 class EmployeeRegistrationView(generics.CreateAPIView):
     permission_classes = (permissions.AllowAny,)
@@ -29,4 +35,31 @@ class EmployeeProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        if self.request.method in permissions.SAFE_METHODS:
+            return get_employee(self.request.user)
+        # Updates start from the current row, never from a cached copy
+        return Employee.objects.get(pk=self.request.user.pk)
+
+
+class TokenRevokeView(generics.GenericAPIView):
+    """
+    Log out by revoking the access token of the request and, if given, its
+    refresh token. With "everywhere" every token of the employee is revoked.
+    """
+
+    serializer_class = TokenRevokeSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if serializer.validated_data["everywhere"]:
+            denylist.revoke_user(request.user.pk)
+        else:
+            if request.auth is not None:
+                denylist.revoke_token(request.auth)
+            refresh = serializer.validated_data.get("refresh")
+            if refresh is not None:
+                denylist.revoke_token(refresh)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,199 @@
+"""
+Compare the sync read views behind Django's WSGI handler, driven by a pool of
+threads like a threaded WSGI worker, with their async variants behind the ASGI
+handler, driven by concurrent tasks on one event loop like an ASGI worker.
+
+Both run in this process against the same database, so the numbers compare the
+two request paths on the same hardware rather than any particular server.
+
+Usage:
+    python -m benchmarks.asgi_vs_wsgi --requests 2000 --concurrency 50 --threads 8
+"""
+
+import argparse
+import asyncio
+import queue
+import threading
+import time
+
+from benchmarks.utils import (
+    Timer,
+    benchmark_database,
+    report,
+    setup_django,
+    voting_window,
+)
+
+ENDPOINTS = ("menus", "results", "history")
+
+
+def seed(menus_count, employees_count):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from authentication.tests.factories import EmployeeFactory
+    from restaurants.tests.factories import MenuFactory, MenuItemFactory
+    from voting.tests.factories import VoteFactory
+
+    menus = MenuFactory.create_batch(menus_count)
+    for menu in menus:
+        MenuItemFactory.create_batch(3, menu=menu)
+    employees = EmployeeFactory.create_batch(employees_count)
+    for index, employee in enumerate(employees):
+        VoteFactory(employee=employee, menu=menus[index % menus_count])
+    return [
+        f"Bearer {RefreshToken.for_user(employee).access_token}"
+        for employee in employees
+    ]
+
+
+def wsgi_get(application, path, token):
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {"PATH_INFO": path, "HTTP_AUTHORIZATION": token}
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(environ, lambda status, headers: statuses.append(status))
+    try:
+        b"".join(response)
+    finally:
+        # Fires request_finished, which closes the request's connection
+        response.close()
+    return statuses[0]
+
+
+async def asgi_get(application, path, token):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"authorization", token.encode())],
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    messages = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return messages[0]["status"]
+
+
+def run_wsgi(path, tokens, requests, threads):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    application = WSGIHandler()
+    jobs = queue.Queue()
+    for index in range(requests):
+        jobs.put(tokens[index % len(tokens)])
+    timer = Timer()
+
+    def worker():
+        while True:
+            try:
+                token = jobs.get_nowait()
+            except queue.Empty:
+                return
+            with timer.measure():
+                status = wsgi_get(application, path, token)
+            assert status.startswith("200"), status
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return timer.timings, time.perf_counter() - start
+
+
+async def run_asgi(path, tokens, requests, concurrency):
+    from django.core.handlers.asgi import ASGIHandler
+
+    application = ASGIHandler()
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def fetch(token):
+        async with semaphore:
+            start = time.perf_counter()
+            status = await asgi_get(application, path, token)
+            timings.append(time.perf_counter() - start)
+        assert status == 200, status
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(fetch(tokens[index % len(tokens)]) for index in range(requests))
+    )
+    return timings, time.perf_counter() - start
+
+
+def run_event_loop(coroutine):
+    """
+    Run the coroutine in a fresh thread, as an ASGI server would, so that it
+    does not inherit this thread's database connection through its context.
+    """
+    result = {}
+
+    def target():
+        result["value"] = asyncio.run(coroutine)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def run(requests, concurrency, threads, menus, employees):
+    tokens = seed(menus, employees)
+
+    for endpoint in ENDPOINTS:
+        timings, elapsed = run_wsgi(f"/sync/{endpoint}/", tokens, requests, threads)
+        report(f"wsgi {endpoint} ({threads} threads)", timings, elapsed)
+        timings, elapsed = run_event_loop(
+            run_asgi(f"/async/{endpoint}/", tokens, requests, concurrency)
+        )
+        report(f"asgi {endpoint} ({concurrency} concurrent)", timings, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--menus", type=int, default=10)
+    parser.add_argument("--employees", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.ROOT_URLCONF = "benchmarks.urls"
+    settings.ALLOWED_HOSTS = ["*"]
+    with benchmark_database(), voting_window():
+        run(
+            args.requests,
+            args.concurrency,
+            args.threads,
+            args.menus,
+            args.employees,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare vote ingestion throughput of the single-vote endpoint against the bulk
+endpoint used by offline kiosks.
+
+Usage:
+    python -m benchmarks.bulk_votes --votes 500 --batch-size 250
+"""
+
+import argparse
+
+from benchmarks.utils import (
+    Timer,
+    benchmark_database,
+    report,
+    setup_django,
+    voting_window,
+)
+
+
+def run(votes, batch_size):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from authentication.tests.factories import EmployeeFactory
+    from restaurants.tests.factories import MenuFactory
+    from voting.models import Vote
+
+    menus = MenuFactory.create_batch(5)
+    single_employees = EmployeeFactory.create_batch(votes)
+    bulk_employees = EmployeeFactory.create_batch(votes)
+    admin = EmployeeFactory(is_staff=True)
+    client = APIClient()
+
+    single = Timer()
+    for index, employee in enumerate(single_employees):
+        token = RefreshToken.for_user(employee).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with single.measure():
+            response = client.post(
+                reverse("voting:create-vote"), {"menu": menus[index % 5].id}
+            )
+        assert response.status_code == 201, response.data
+    report("single vote requests", single.timings)
+
+    token = RefreshToken.for_user(admin).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    entries = [
+        {"employee": employee.id, "menu": menus[index % 5].id}
+        for index, employee in enumerate(bulk_employees)
+    ]
+    bulk = Timer()
+    for start in range(0, votes, batch_size):
+        with bulk.measure():
+            response = client.post(
+                reverse("voting:bulk-create-vote"),
+                {"votes": entries[start : start + batch_size]},
+                format="json",
+            )
+        assert response.status_code == 200, response.data
+    report(f"bulk requests of {batch_size} votes", bulk.timings)
+
+    assert Vote.objects.count() == votes * 2
+    single_rate = votes / sum(single.timings)
+    bulk_rate = votes / sum(bulk.timings)
+    print(
+        f"votes/s: single {single_rate:.1f}, bulk {bulk_rate:.1f} "
+        f"({bulk_rate / single_rate:.1f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--votes", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=250)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database(), voting_window():
+        run(args.votes, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the cost and size of compressing the menu/today/ payload per response
+with serving the variants stored by config.compression.compress_variants(),
+on menus seeded with the test factories.
+
+Usage:
+    python -m benchmarks.compression --menus 20 --items 8 --iterations 500
+"""
+
+import argparse
+
+from benchmarks.utils import Timer, benchmark_database, report, setup_django
+
+
+def get_content(menus_count, items_count):
+    from rest_framework.renderers import JSONRenderer
+
+    from restaurants.models import Menu
+    from restaurants.serializers import MenuDetailSerializer
+    from restaurants.tests.factories import MenuFactory, MenuItemFactory
+
+    for menu in MenuFactory.create_batch(menus_count):
+        MenuItemFactory.create_batch(items_count, menu=menu)
+    data = MenuDetailSerializer(Menu.objects.with_details(), many=True).data
+    return JSONRenderer().render(data)
+
+
+def run(menus, items, iterations):
+    from django.test import RequestFactory
+
+    from config import compression
+
+    content = get_content(menus, items)
+    variants = compression.compress_variants(content)
+    print(
+        ", ".join(
+            f"{encoding}: {len(variant)} bytes"
+            for encoding, variant in variants.items()
+        )
+    )
+
+    for encoding in compression.get_encodings():
+        timer = Timer()
+        for _ in range(iterations):
+            with timer.measure():
+                compression.compress(content, encoding)
+        report(f"compress per response {encoding}", timer.timings)
+
+        request = RequestFactory().get("/", headers={"accept-encoding": encoding})
+        timer = Timer()
+        for _ in range(iterations):
+            with timer.measure():
+                compression.get_variant_response(request, variants, "application/json")
+        report(f"stored variant {encoding}", timer.timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--menus", type=int, default=20)
+    parser.add_argument("--items", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.menus, args.items, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
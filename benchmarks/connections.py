@@ -0,0 +1,140 @@
+"""
+Compare per-request latency of the vote and results endpoints with a fresh
+database connection per request, persistent connections (CONN_MAX_AGE with
+health checks) and, when psycopg 3 with psycopg_pool is installed, a
+connection pool.
+
+The gap grows with the round trip to the database server; point
+POSTGRES_HOST at a remote server to see the cost of connecting over the
+network.
+
+Usage:
+    python -m benchmarks.connections --employees 200 --requests 1000 --threads 8
+"""
+
+import argparse
+
+from benchmarks.morning_rush import (
+    RESULTS_PATH,
+    VOTE_PATH,
+    get_requests,
+    report_phase,
+    run_phase,
+)
+from benchmarks.utils import benchmark_database, setup_django, voting_window
+
+MODES = {
+    "fresh": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+    "pool": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True, "pool": True},
+}
+
+
+def seed(employees_count, menus_count):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from authentication.tests.factories import EmployeeFactory
+    from restaurants.tests.factories import MenuFactory, MenuItemFactory
+    from voting.tests.factories import VoteFactory
+
+    menus = MenuFactory.create_batch(menus_count)
+    for menu in menus:
+        MenuItemFactory.create_batch(3, menu=menu)
+    employees = EmployeeFactory.create_batch(employees_count)
+    # Everyone has voted already, so every PUT changes a vote and answers 200
+    for index, employee in enumerate(employees):
+        VoteFactory(employee=employee, menu=menus[index % menus_count])
+    tokens = [
+        f"Bearer {RefreshToken.for_user(employee).access_token}"
+        for employee in employees
+    ]
+    return [menu.id for menu in menus], tokens
+
+
+def is_pool_available():
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return is_psycopg3
+
+
+def configure(mode):
+    """
+    Switch the default database to one of the connection modes. Connections
+    opened from now on, in any thread, use the new settings.
+    """
+    from django.db import connection
+
+    connection.close()
+    connection.close_pool()
+    options = dict(MODES[mode])
+    pool = options.pop("pool", False)
+    connection.settings_dict.update(options)
+    connection.settings_dict["OPTIONS"].pop("pool", None)
+    if pool:
+        connection.settings_dict["OPTIONS"]["pool"] = {"min_size": 2, "max_size": 10}
+
+
+def run(employees, menus, requests, threads):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+
+    menu_ids, tokens = seed(employees, menus)
+    application = WSGIHandler()
+
+    modes = list(MODES)
+    if not is_pool_available():
+        print("pool: skipped, it needs psycopg 3 with psycopg[pool]")
+        modes.remove("pool")
+
+    for mode in modes:
+        configure(mode)
+        print(mode)
+        report_phase(
+            *run_phase(
+                application,
+                get_requests(
+                    "PUT voting/",
+                    "PUT",
+                    VOTE_PATH,
+                    tokens,
+                    requests,
+                    body=lambda index: {"menu": menu_ids[index % len(menu_ids)]},
+                ),
+                threads,
+            )
+        )
+        report_phase(
+            *run_phase(
+                application,
+                get_requests(
+                    "GET results/today/", "GET", RESULTS_PATH, tokens, requests
+                ),
+                threads,
+            )
+        )
+    configure("fresh")
+    connection.close_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--menus", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.ALLOWED_HOSTS = ["*"]
+    with benchmark_database(), voting_window():
+        run(args.employees, args.menus, args.requests, args.threads)
+
+
+if __name__ == "__main__":
+    main()
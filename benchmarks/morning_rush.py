@@ -0,0 +1,202 @@
+"""
+Replay a voting morning against the real URLconf: a read storm on today's
+menus, a burst of votes through the create-vote endpoint, then polling of
+today's results, with requests split evenly between mobile app versions.
+
+Requests go through Django's WSGI handler from a pool of threads, like a
+threaded WSGI worker, so the numbers include middleware, authentication and
+rendering. Each phase reports throughput and latency per endpoint and version.
+
+Usage:
+    python -m benchmarks.morning_rush --employees 300 --restaurants 10 --threads 8
+"""
+
+import argparse
+import io
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks.utils import benchmark_database, report, setup_django, voting_window
+
+VERSIONS = ("1.0", "2.0")
+MENUS_PATH = "/api/v1/restaurants/menu/today/"
+VOTE_PATH = "/api/v1/voting/"
+RESULTS_PATH = "/api/v1/voting/results/today/"
+
+
+def seed(employees_count, restaurants_count, items_count):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from authentication.tests.factories import EmployeeFactory
+    from restaurants.tests.factories import MenuFactory, MenuItemFactory
+
+    menus = MenuFactory.create_batch(restaurants_count)
+    for menu in menus:
+        MenuItemFactory.create_batch(items_count, menu=menu)
+    employees = EmployeeFactory.create_batch(employees_count)
+    tokens = [
+        f"Bearer {RefreshToken.for_user(employee).access_token}"
+        for employee in employees
+    ]
+    return [menu.id for menu in menus], tokens
+
+
+def wsgi_request(application, method, path, token, version, body=None):
+    from wsgiref.util import setup_testing_defaults
+
+    content = json.dumps(body).encode() if body is not None else b""
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "HTTP_AUTHORIZATION": token,
+        "HTTP_MOBILE_APP_VERSION": version,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(content)),
+        "wsgi.input": io.BytesIO(content),
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(environ, lambda status, headers: statuses.append(status))
+    try:
+        b"".join(response)
+    finally:
+        # Fires request_finished, which closes or keeps the connection as
+        # CONN_MAX_AGE and the pool settings say
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+def run_phase(application, requests, threads):
+    """
+    Send (label, method, path, token, version, body, expected status) requests
+    from a pool of threads. Return the timings per label and the elapsed time.
+    """
+    jobs = queue.Queue()
+    for request in requests:
+        jobs.put(request)
+    timings = defaultdict(list)
+    lock = threading.Lock()
+
+    def worker():
+        from django.db import connections
+
+        while True:
+            try:
+                label, method, path, token, version, body, expected = jobs.get_nowait()
+            except queue.Empty:
+                # Persistent connections outlive requests, like a server's
+                # threads; close them when the thread is done
+                connections.close_all()
+                return
+            start = time.perf_counter()
+            status = wsgi_request(application, method, path, token, version, body)
+            duration = time.perf_counter() - start
+            assert status == expected, (label, status)
+            with lock:
+                timings[label].append(duration)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return timings, time.perf_counter() - start
+
+
+def report_phase(timings, elapsed):
+    """
+    Report every label of a phase against the phase's wall-clock time, so the
+    request rates of its labels add up to the phase's throughput.
+    """
+    for label, label_timings in sorted(timings.items()):
+        report(label, label_timings, elapsed)
+
+
+def get_requests(label, method, path, tokens, count, body=None, expected=200):
+    return [
+        (
+            f"{label} v{VERSIONS[index % len(VERSIONS)]}",
+            method,
+            path,
+            tokens[index % len(tokens)],
+            VERSIONS[index % len(VERSIONS)],
+            body(index) if body else None,
+            expected,
+        )
+        for index in range(count)
+    ]
+
+
+def run(employees, restaurants, items, reads, polls, threads):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    menu_ids, tokens = seed(employees, restaurants, items)
+    application = WSGIHandler()
+
+    print("read storm")
+    report_phase(
+        *run_phase(
+            application,
+            get_requests("GET menu/today/", "GET", MENUS_PATH, tokens, reads),
+            threads,
+        )
+    )
+
+    print("vote burst")
+    report_phase(
+        *run_phase(
+            application,
+            get_requests(
+                "POST voting/",
+                "POST",
+                VOTE_PATH,
+                tokens,
+                len(tokens),
+                body=lambda index: {"menu": menu_ids[index % len(menu_ids)]},
+                expected=201,
+            ),
+            threads,
+        )
+    )
+
+    print("results polling")
+    report_phase(
+        *run_phase(
+            application,
+            get_requests("GET results/today/", "GET", RESULTS_PATH, tokens, polls),
+            threads,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=300)
+    parser.add_argument("--restaurants", type=int, default=10)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--polls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.ALLOWED_HOSTS = ["*"]
+    with benchmark_database(), voting_window():
+        run(
+            args.employees,
+            args.restaurants,
+            args.items,
+            args.reads,
+            args.polls,
+            args.threads,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare DRF's JSONRenderer and JSONParser with the orjson-backed classes in
+config.renderers on the payload of menu/today/, serialized from menus seeded
+with the test factories.
+
+Usage:
+    python -m benchmarks.renderers --menus 20 --items 8 --iterations 2000
+"""
+
+import argparse
+import io
+
+from benchmarks.utils import Timer, benchmark_database, report, setup_django
+
+
+def get_payload(menus_count, items_count):
+    from restaurants.models import Menu
+    from restaurants.serializers import MenuDetailSerializer
+    from restaurants.tests.factories import MenuFactory, MenuItemFactory
+
+    for menu in MenuFactory.create_batch(menus_count):
+        MenuItemFactory.create_batch(items_count, menu=menu)
+    return MenuDetailSerializer(Menu.objects.with_details(), many=True).data
+
+
+def run(menus, items, iterations):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from config import renderers
+
+    payload = get_payload(menus, items)
+    content = JSONRenderer().render(payload)
+    print(f"payload: {len(content)} bytes, orjson installed: {bool(renderers.orjson)}")
+
+    for label, renderer in (
+        ("render JSONRenderer", JSONRenderer()),
+        ("render FastJSONRenderer", renderers.FastJSONRenderer()),
+    ):
+        timer = Timer()
+        for _ in range(iterations):
+            with timer.measure():
+                renderer.render(payload)
+        report(label, timer.timings)
+
+    for label, parser in (
+        ("parse JSONParser", JSONParser()),
+        ("parse FastJSONParser", renderers.FastJSONParser()),
+    ):
+        timer = Timer()
+        for _ in range(iterations):
+            with timer.measure():
+                parser.parse(io.BytesIO(content))
+        report(label, timer.timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--menus", type=int, default=20)
+    parser.add_argument("--items", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.menus, args.items, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
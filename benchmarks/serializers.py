@@ -0,0 +1,90 @@
+"""
+Compare the read serializers with their compiled counterparts from
+config.compiled on today's menus, the restaurant list and a page of votes,
+seeded with the test factories.
+
+Usage:
+    python -m benchmarks.serializers --menus 20 --items 8 --votes 20 --iterations 500
+"""
+
+import argparse
+
+from benchmarks.utils import (
+    Timer,
+    benchmark_database,
+    report,
+    setup_django,
+    voting_window,
+)
+
+
+def seed(menus_count, items_count, votes_count):
+    from authentication.tests.factories import EmployeeFactory
+    from restaurants.tests.factories import MenuFactory, MenuItemFactory
+    from voting.tests.factories import VoteFactory
+
+    menus = MenuFactory.create_batch(menus_count)
+    for menu in menus:
+        MenuItemFactory.create_batch(items_count, menu=menu)
+    for index, employee in enumerate(EmployeeFactory.create_batch(votes_count)):
+        VoteFactory(employee=employee, menu=menus[index % menus_count])
+
+
+def get_cases():
+    from restaurants.models import Menu, Restaurant
+    from restaurants.serializers import (
+        MenuDetailSerializer,
+        RestaurantDetailSerializer,
+    )
+    from voting.api.v1.serializers import VoteDetailSerializerV1
+    from voting.api.v2.serializers import VoteDetailSerializerV2
+    from voting.models import Vote
+
+    menus = list(Menu.objects.with_details())
+    restaurants = list(Restaurant.objects.with_menu_for_date())
+    votes = list(
+        Vote.objects.select_related("employee", "menu__restaurant").prefetch_related(
+            "menu__items"
+        )
+    )
+    return (
+        ("menus", MenuDetailSerializer, menus),
+        ("restaurants", RestaurantDetailSerializer, restaurants),
+        ("votes v1", VoteDetailSerializerV1, votes),
+        ("votes v2", VoteDetailSerializerV2, votes),
+    )
+
+
+def run(menus, items, votes, iterations):
+    from config.compiled import get_read_serializer
+
+    seed(menus, items, votes)
+    for label, serializer_class, instances in get_cases():
+        timer = Timer()
+        for _ in range(iterations):
+            with timer.measure():
+                serializer_class(instances, many=True).data
+        report(f"{label} serializer", timer.timings)
+
+        timer = Timer()
+        for _ in range(iterations):
+            with timer.measure():
+                get_read_serializer(serializer_class, instances, many=True).data
+        report(f"{label} compiled", timer.timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--menus", type=int, default=20)
+    parser.add_argument("--items", type=int, default=8)
+    parser.add_argument("--votes", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database(), voting_window():
+        run(args.menus, args.items, args.votes, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
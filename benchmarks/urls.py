@@ -0,0 +1,23 @@
+"""
+URLconf serving the read endpoints both as sync and as async views, so that a
+single process can benchmark them side by side.
+"""
+
+from django.urls import path
+
+from restaurants.views import AsyncTodayMenuListView, TodayMenuListView
+from voting.views import (
+    AsyncTodayResultsView,
+    AsyncUserVoteHistoryView,
+    TodayResultsView,
+    UserVoteHistoryView,
+)
+
+urlpatterns = [
+    path("sync/menus/", TodayMenuListView.as_view()),
+    path("sync/results/", TodayResultsView.as_view()),
+    path("sync/history/", UserVoteHistoryView.as_view()),
+    path("async/menus/", AsyncTodayMenuListView.as_view()),
+    path("async/results/", AsyncTodayResultsView.as_view()),
+    path("async/history/", AsyncUserVoteHistoryView.as_view()),
+]
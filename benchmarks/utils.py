@@ -0,0 +1,89 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against the PostgreSQL server configured in the environment
+(see .env.sample), inside a throwaway test database that is created before and
+dropped after each run, so they never touch real data.
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import time as dt_time
+from unittest.mock import patch
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import django
+    from django.conf import settings
+
+    django.setup()
+    # Seeding hundreds of employees with the production hasher takes minutes
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@contextmanager
+def benchmark_database():
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    cache.clear()
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def voting_window(hour=10):
+    """
+    Pretend the clock shows the given hour so votes pass the 11:00 AM check.
+    """
+    from django.utils import timezone
+
+    now = datetime.combine(timezone.now().date(), dt_time(hour, 0))
+    with patch("django.utils.timezone.localtime", return_value=now):
+        yield
+
+
+class Timer:
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def measure(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append(time.perf_counter() - start)
+
+
+def percentile(timings, percent):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def report(label, timings, elapsed=None):
+    """
+    Print throughput and latency percentiles for a list of timings in seconds.
+    Pass the wall-clock elapsed time when the timings overlapped.
+    """
+    elapsed = elapsed if elapsed is not None else sum(timings)
+    print(
+        f"{label:<40} {len(timings):>7} req "
+        f"{len(timings) / elapsed:>10.1f} req/s "
+        f"p50 {percentile(timings, 50) * 1000:>8.2f} ms "
+        f"p99 {percentile(timings, 99) * 1000:>8.2f} ms "
+        f"mean {statistics.mean(timings) * 1000:>8.2f} ms"
+    )
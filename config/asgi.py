@@ -2,6 +2,10 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn config.asgi:application``) to use the
+live results stream at ``/api/v1/voting/results/today/stream/``, and set
+ASYNC_VIEWS=1 so today's menus, today's results and the vote history are served
+by async views that do not hold a thread while waiting on the database.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -0,0 +1,84 @@
+"""
+Async counterparts of DRF's APIView and ListAPIView.
+
+DRF only dispatches to synchronous handlers, so these views run the request
+setup (content negotiation, versioning, JWT authentication, permissions and
+throttling) in a worker thread and then await coroutine handlers on the event
+loop. Under an ASGI server a request waiting on the database no longer holds
+a thread of its own.
+"""
+
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncGenericAPIView(AsyncAPIView, generics.GenericAPIView):
+    async def aget_queryset(self):
+        """
+        Return the objects to list. Override when building them needs the
+        database; the default queryset stays lazy until it is paginated.
+        """
+        return self.get_queryset()
+
+    async def apaginate_queryset(self, queryset):
+        paginator = self.paginator
+        if paginator is None:
+            return None
+        if hasattr(paginator, "apaginate_queryset"):
+            return await paginator.apaginate_queryset(queryset, self.request, self)
+        return await sync_to_async(paginator.paginate_queryset)(
+            queryset, self.request, self
+        )
+
+
+class AsyncListModelMixin:
+    async def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(await self.aget_queryset())
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        if isinstance(queryset, QuerySet):
+            queryset = [obj async for obj in queryset]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class AsyncListAPIView(AsyncListModelMixin, AsyncGenericAPIView):
+    async def get(self, request, *args, **kwargs):
+        return await self.list(request, *args, **kwargs)
@@ -0,0 +1,313 @@
+"""
+Compiled read path for DRF serializers.
+
+Every serializer instance deep-copies its declared fields and, for model
+serializers, builds the rest from model introspection, then dispatches each
+value through its field. compile_serializer() does the field work once per
+serializer class and keeps, for every readable field, the field's bound
+attribute getter and a converter that produces exactly what the field's
+to_representation() would. The result is the same representation, key for key,
+from model instances or from mappings such as .values() rows.
+
+Only fields whose output cannot depend on the serializer context or on
+overridden methods are compiled. For any other serializer compile_serializer()
+returns None and callers keep using the serializer itself.
+
+Sparse fieldsets (config.fieldsets) compile the pruned serializer instead, once
+per serializer class and fieldset.
+"""
+
+import functools
+from decimal import Decimal
+
+from django.db.models.manager import BaseManager
+from rest_framework import ISO_8601, fields, relations, serializers
+from rest_framework.fields import SkipField, empty
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+# Fields that only read their own attributes when representing a value
+PLAIN_REPRESENTATIONS = {
+    field_class.to_representation
+    for field_class in (
+        fields.BooleanField,
+        fields.ChoiceField,
+        fields.DateTimeField,
+        fields.DurationField,
+        fields.JSONField,
+        fields.ReadOnlyField,
+        fields.TimeField,
+        fields.UUIDField,
+        relations.PrimaryKeyRelatedField,
+        relations.SlugRelatedField,
+    )
+}
+
+PLAIN_GETTERS = {
+    fields.Field.get_attribute,
+    relations.RelatedField.get_attribute,
+    serializers.ListSerializer.get_attribute,
+}
+
+
+class NotCompilable(Exception):
+    pass
+
+
+class State:
+    """
+    Per-call state: the serializer context and the serializer instances that
+    method fields are called on.
+    """
+
+    def __init__(self, context):
+        self.context = context or {}
+        self.serializers = {}
+
+    def get_serializer(self, serializer_class):
+        serializer = self.serializers.get(serializer_class)
+        if serializer is None:
+            serializer = serializer_class(context=self.context)
+            self.serializers[serializer_class] = serializer
+        return serializer
+
+
+def convert_date(field):
+    output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+    if output_format is None:
+        return lambda value, state: value or None
+    is_iso = output_format.lower() == ISO_8601
+
+    def convert(value, state):
+        if not value:
+            return None
+        if isinstance(value, str):
+            return value
+        if is_iso:
+            return value.isoformat()
+        return value.strftime(output_format)
+
+    return convert
+
+
+def convert_decimal(field):
+    to_representation = field.to_representation
+    coerce_to_string = getattr(
+        field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+    )
+    if (
+        not coerce_to_string
+        or field.localize
+        or field.normalize_output
+        or field.decimal_places is None
+    ):
+        return lambda value, state: to_representation(value)
+    exponent = -field.decimal_places
+    max_digits = field.max_digits
+
+    def convert(value, state):
+        # Decimals read from a column of the same precision need no quantizing
+        if type(value) is Decimal:
+            _, digits, value_exponent = value.as_tuple()
+            if value_exponent == exponent and (
+                max_digits is None or len(digits) <= max_digits
+            ):
+                return f"{value:f}"
+        return to_representation(value)
+
+    return convert
+
+
+def convert_method(field):
+    serializer_class = type(field.parent)
+    method_name = field.method_name
+
+    def convert(value, state):
+        return getattr(state.get_serializer(serializer_class), method_name)(value)
+
+    return convert
+
+
+def convert_list(field):
+    child = compile_bound_serializer(field.child)
+
+    def convert(value, state):
+        iterable = value.all() if isinstance(value, BaseManager) else value
+        return [child.represent(item, state) for item in iterable]
+
+    return convert
+
+
+def convert_nested(field):
+    nested = compile_bound_serializer(field)
+    return nested.represent
+
+
+def get_converter(field):
+    representation = type(field).to_representation
+    if representation is fields.IntegerField.to_representation:
+        return lambda value, state: int(value)
+    if representation is fields.FloatField.to_representation:
+        return lambda value, state: float(value)
+    if representation in (
+        fields.CharField.to_representation,
+        relations.StringRelatedField.to_representation,
+    ):
+        return lambda value, state: str(value)
+    if representation is fields.DateField.to_representation:
+        return convert_date(field)
+    if representation is fields.DecimalField.to_representation:
+        return convert_decimal(field)
+    if representation is fields.SerializerMethodField.to_representation:
+        return convert_method(field)
+    if representation is serializers.ListSerializer.to_representation:
+        return convert_list(field)
+    if representation is serializers.Serializer.to_representation:
+        return convert_nested(field)
+    if representation in PLAIN_REPRESENTATIONS:
+        to_representation = field.to_representation
+        return lambda value, state: to_representation(value)
+    raise NotCompilable(f"{type(field).__name__} {field.field_name!r}")
+
+
+def compile_field(field):
+    if type(field).get_attribute not in PLAIN_GETTERS:
+        raise NotCompilable(f"{field.field_name!r} overrides get_attribute()")
+    if field.default is not empty and getattr(field.default, "requires_context", 0):
+        raise NotCompilable(f"{field.field_name!r} has a context-aware default")
+    return field.field_name, field.get_attribute, get_converter(field)
+
+
+class CompiledSerializer:
+    def __init__(self, serializer_class, compiled_fields):
+        self.serializer_class = serializer_class
+        self.fields = compiled_fields
+
+    def represent(self, instance, state):
+        ret = {}
+        for field_name, get_attribute, convert in self.fields:
+            try:
+                attribute = get_attribute(instance)
+            except SkipField:
+                continue
+            check_for_none = (
+                attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            )
+            if check_for_none is None:
+                ret[field_name] = None
+            else:
+                ret[field_name] = convert(attribute, state)
+        return ret
+
+    def to_representation(self, instance, context=None):
+        return self.represent(instance, State(context))
+
+    def to_list_representation(self, instances, context=None):
+        state = State(context)
+        iterable = instances.all() if isinstance(instances, BaseManager) else instances
+        return [self.represent(instance, state) for instance in iterable]
+
+    def __call__(self, instance, many=False, context=None):
+        """
+        Bind to an instance, or many, for code written against serializers'
+        .data.
+        """
+        return BoundCompiledSerializer(self, instance, many, context)
+
+
+class BoundCompiledSerializer:
+    def __init__(self, compiled, instance, many, context):
+        self.compiled = compiled
+        self.instance = instance
+        self.many = many
+        self.context = context
+
+    @functools.cached_property
+    def data(self):
+        if self.many:
+            return ReturnList(
+                self.compiled.to_list_representation(self.instance, self.context),
+                serializer=self,
+            )
+        return ReturnDict(
+            self.compiled.to_representation(self.instance, self.context),
+            serializer=self,
+        )
+
+
+def compile_bound_serializer(serializer):
+    if type(serializer).to_representation is not (
+        serializers.Serializer.to_representation
+    ):
+        raise NotCompilable(
+            f"{type(serializer).__name__} overrides to_representation()"
+        )
+    return CompiledSerializer(
+        type(serializer),
+        [compile_field(field) for field in serializer._readable_fields],
+    )
+
+
+@functools.cache
+def compile_serializer(serializer_class):
+    """
+    Return a CompiledSerializer for the class, or None when some field cannot
+    be compiled.
+    """
+    try:
+        return compile_bound_serializer(serializer_class())
+    except NotCompilable:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_sparse_serializer(serializer_class, fieldset):
+    """
+    Return a CompiledSerializer for the fields of the class that the fieldset
+    keeps, or None when some of them cannot be compiled.
+    """
+    try:
+        return compile_bound_serializer(fieldset.prune(serializer_class()))
+    except NotCompilable:
+        return None
+
+
+def get_read_serializer(
+    serializer_class, instance, many=False, context=None, fieldset=None
+):
+    """
+    Return the compiled serializer bound to the instance, or an instance of
+    the serializer class when it does not compile. Both offer .data and render
+    only the fields the fieldset keeps, if one is given.
+    """
+    if fieldset is None:
+        compiled = compile_serializer(serializer_class)
+    else:
+        compiled = compile_sparse_serializer(serializer_class, fieldset)
+    if compiled is None:
+        serializer = serializer_class(instance, many=many, context=context or {})
+        if fieldset is not None:
+            fieldset.prune(serializer)
+        return serializer
+    return compiled(instance, many=many, context=context)
+
+
+class CompiledReadMixin:
+    """
+    Mixin for generic views that serializes the responses of safe methods
+    through the compiled serializer, pruned to the view's ``fieldset``.
+    """
+
+    fieldset = None
+
+    def get_serializer(self, *args, **kwargs):
+        if args and "data" not in kwargs and self.request.method in ("GET", "HEAD"):
+            return get_read_serializer(
+                self.get_serializer_class(),
+                args[0],
+                many=kwargs.get("many", False),
+                context=self.get_serializer_context(),
+                fieldset=self.fieldset,
+            )
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,175 @@
+"""
+Negotiated gzip and brotli response compression.
+
+CompressionMiddleware compresses responses of at least COMPRESSION_MIN_SIZE
+bytes with the best encoding the client accepts: brotli when the brotli package
+is installed, gzip otherwise. Views that cache rendered documents store their
+compressed variants with compress_variants() and answer with
+get_variant_response(), so a cache hit is never compressed again.
+"""
+
+import gzip
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+
+# Per-response compression runs on every request; cached variants are
+# compressed once, so they get the slowest and smallest settings
+GZIP_RANDOM_BYTES = 100
+BROTLI_QUALITY = 5
+STORED_GZIP_LEVEL = 9
+STORED_BROTLI_QUALITY = 11
+
+
+def get_encodings():
+    return (BROTLI, GZIP) if brotli else (GZIP,)
+
+
+def parse_accept_encoding(header):
+    """
+    Return the quality value of each coding in an Accept-Encoding header.
+    """
+    qualities = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def get_accepted_encoding(request, encodings=None):
+    """
+    Return the preferred encoding, among ours, that the request accepts, or
+    None when it accepts none of them.
+    """
+    header = request.META.get("HTTP_ACCEPT_ENCODING")
+    if not header:
+        return None
+    if encodings is None:
+        encodings = get_encodings()
+    qualities = parse_accept_encoding(header)
+    default = qualities.get("*", 0.0)
+    for encoding in encodings:
+        if qualities.get(encoding, default) > 0:
+            return encoding
+    return None
+
+
+def compress(content, encoding):
+    if encoding == BROTLI:
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    # Random bytes in the gzip header mitigate BREACH, as Django's
+    # GZipMiddleware does
+    return compress_string(content, max_random_bytes=GZIP_RANDOM_BYTES)
+
+
+def compress_stored(content, encoding):
+    if encoding == BROTLI:
+        return brotli.compress(content, quality=STORED_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=STORED_GZIP_LEVEL, mtime=0)
+
+
+def compress_variants(content):
+    """
+    Return the content and its compressed variants by encoding, leaving out
+    compressed variants that would not be smaller.
+    """
+    variants = {IDENTITY: content}
+    if len(content) >= settings.COMPRESSION_MIN_SIZE:
+        for encoding in get_encodings():
+            compressed = compress_stored(content, encoding)
+            if len(compressed) < len(content):
+                variants[encoding] = compressed
+    return variants
+
+
+def get_variant_response(request, variants, content_type):
+    """
+    Return a response with the variant that the request accepts best.
+    """
+    encoding = get_accepted_encoding(
+        request, [encoding for encoding in get_encodings() if encoding in variants]
+    )
+    response = HttpResponse(variants[encoding or IDENTITY], content_type=content_type)
+    if len(variants) > 1:
+        patch_vary_headers(response, ("Accept-Encoding",))
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def weaken_etag(response):
+    # Compressed bytes differ from the identity ones (RFC 9110 Section 8.8.1);
+    # If-None-Match still matches weak ETags
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts. Short,
+    streamed and already encoded responses are passed through; event streams
+    have to reach clients event by event.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return response
+        if response.has_header("Content-Encoding"):
+            weaken_etag(response)
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = get_accepted_encoding(request)
+        if encoding is None:
+            return response
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        weaken_etag(response)
+        return response
@@ -0,0 +1,77 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin that answers GET requests with a strong ETag derived from a cheap
+    version stamp and returns 304 Not Modified when the client already holds
+    that version. The stamp is checked after authentication and versioning but
+    before the view builds its queryset; the view finds the ETag in
+    ``self.etag``.
+    """
+
+    etag = None
+
+    def get_etag_stamp(self):
+        """
+        Return a value that changes whenever the response body would change,
+        or None to skip conditional handling.
+        """
+        raise NotImplementedError
+
+    def get_etag(self, request):
+        stamp = self.get_etag_stamp()
+        if stamp is None:
+            return None
+        key = "|".join(
+            (
+                str(stamp),
+                str(request.version),
+                request.accepted_media_type,
+                request.get_full_path(),
+            )
+        )
+        return f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+    def get_not_modified_response(self, request, etag):
+        if etag:
+            if_none_match = {
+                # Weak comparison: compressed responses carry weak ETags
+                tag.removeprefix("W/")
+                for tag in parse_etags(request.headers.get("If-None-Match", ""))
+            }
+            if etag in if_none_match or "*" in if_none_match:
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+        return None
+
+    def set_etag(self, response, etag):
+        if etag and response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+        return response
+
+    def get(self, request, *args, **kwargs):
+        etag = self.etag = self.get_etag(request)
+        not_modified = self.get_not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+        return self.set_etag(super().get(request, *args, **kwargs), etag)
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """
+    ConditionalGetMixin for views built on config.async_views.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        etag = self.etag = await sync_to_async(self.get_etag)(request)
+        not_modified = self.get_not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+        return self.set_etag(await super().get(request, *args, **kwargs), etag)
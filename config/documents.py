@@ -0,0 +1,100 @@
+"""
+Rendered JSON responses kept in Django's cache framework, together with their
+compressed variants.
+
+DocumentCacheMixin serves a list view from that cache, so a hit costs no
+queries, no serialization and no compression. Views only say under which key
+a response is stored; they keep the key current themselves, e.g. by making it
+part of what changes when the response would.
+"""
+
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from config.compression import compress_variants, get_variant_response
+
+DOCUMENT_TIMEOUT = 60 * 60 * 24
+
+
+def get_document(key):
+    return cache.get(key)
+
+
+async def aget_document(key):
+    return await cache.aget(key)
+
+
+def set_document(key, content):
+    """
+    Store the content with its compressed variants and return them.
+    """
+    variants = compress_variants(content)
+    cache.set(key, variants, DOCUMENT_TIMEOUT)
+    return variants
+
+
+async def aset_document(key, content):
+    variants = compress_variants(content)
+    await cache.aset(key, variants, DOCUMENT_TIMEOUT)
+    return variants
+
+
+class DocumentCacheMixin:
+    """
+    Mixin for list views that serves JSON responses from the document cache.
+    Responses without a document key, including the ones of other renderers,
+    go through the regular path.
+    """
+
+    def get_document_key(self, request):
+        """
+        Return the key of the response's document, or None to skip the cache.
+        """
+        raise NotImplementedError
+
+    def is_document_cacheable(self, request):
+        return isinstance(request.accepted_renderer, JSONRenderer)
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_document_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+
+        variants = get_document(key)
+        if variants is None:
+            content = self.render_document(super().list(request, *args, **kwargs))
+            variants = set_document(key, content)
+        return self.get_document_response(variants)
+
+    def render_document(self, response):
+        return self.request.accepted_renderer.render(
+            response.data,
+            self.request.accepted_media_type,
+            self.get_renderer_context(),
+        )
+
+    def get_document_response(self, variants):
+        return get_variant_response(
+            self.request, variants, self.request.accepted_renderer.media_type
+        )
+
+
+class AsyncDocumentCacheMixin(DocumentCacheMixin):
+    """
+    DocumentCacheMixin for views built on config.async_views, reading through
+    the async cache API.
+    """
+
+    async def aget_document_key(self, request):
+        return self.get_document_key(request)
+
+    async def list(self, request, *args, **kwargs):
+        key = await self.aget_document_key(request)
+        if key is None:
+            return await super().list(request, *args, **kwargs)
+
+        variants = await aget_document(key)
+        if variants is None:
+            response = await super().list(request, *args, **kwargs)
+            variants = await aset_document(key, self.render_document(response))
+        return self.get_document_response(variants)
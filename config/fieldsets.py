@@ -0,0 +1,233 @@
+"""
+Sparse fieldsets for read endpoints.
+
+``?fields=`` names the fields to render, with dotted paths into nested
+serializers (``fields=id,menu.date``); a serializer that no path reaches into
+renders all of its fields. Once a request sends ``fields`` or ``expand``,
+nested serializers are rendered only when a path reaches them, so unrequested
+relations are left out; ``?expand=`` names the nested serializers to render on
+top of the fields (``expand=menu.items``).
+
+FieldSet.load() narrows a queryset to what the remaining fields read: only()
+for the columns, select_related() for the relations to one object and
+prefetch_related() for the relations to many. Serializer method fields read
+nothing the fieldset can see, so serializers declare their sources in
+``Meta.method_field_sources``; without one their model is loaded whole.
+"""
+
+import functools
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+
+
+def parse_paths(value):
+    """
+    Parse comma-separated dotted paths into a tree of sorted tuples, which
+    keeps fieldsets hashable.
+    """
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in filter(None, (name.strip() for name in path.split("."))):
+            node = node.setdefault(name, {})
+    return freeze(tree)
+
+
+def freeze(tree):
+    return tuple(sorted((name, freeze(subtree)) for name, subtree in tree.items()))
+
+
+def get_fields(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return serializer.fields
+
+
+def join(path, name):
+    return f"{path}__{name}" if path else name
+
+
+class Plan:
+    """
+    The columns and relations that the fields of a serializer read.
+    """
+
+    def __init__(self):
+        self.only = set()
+        self.select_related = set()
+        self.prefetch_related = set()
+
+    def add_model(self, model, path):
+        for model_field in model._meta.concrete_fields:
+            self.only.add(join(path, model_field.name))
+
+    def add_serializer(self, serializer, model, path, prefetched):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        meta = getattr(serializer, "Meta", None)
+        sources = getattr(meta, "method_field_sources", {})
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.SerializerMethodField):
+                if field.field_name not in sources:
+                    self.add_model(model, path)
+                for source in sources.get(field.field_name, ()):
+                    self.add_source(field, source.split("."), model, path, prefetched)
+            elif field.source == "*":
+                if isinstance(field, serializers.BaseSerializer):
+                    self.add_serializer(field, model, path, prefetched)
+                else:
+                    self.add_model(model, path)
+            else:
+                self.add_source(field, field.source_attrs, model, path, prefetched)
+
+    def add_source(self, field, attrs, model, path, prefetched):
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # A property or method, which may read any column
+                self.add_model(model, path)
+                return
+            path = join(path, attr)
+            if not model_field.is_relation:
+                if not prefetched:
+                    self.only.add(path)
+                return
+            last = index == len(attrs) - 1
+            if (
+                last
+                and isinstance(field, relations.RelatedField)
+                and field.use_pk_only_optimization()
+                and model_field.concrete
+            ):
+                # Rendered from the foreign key column alone
+                if not prefetched:
+                    self.only.add(path)
+                return
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetched = True
+            if prefetched:
+                self.prefetch_related.add(path)
+            else:
+                self.only.add(path)
+                self.select_related.add(path)
+            model = model_field.related_model
+            if last:
+                if isinstance(field, serializers.BaseSerializer):
+                    self.add_serializer(field, model, path, prefetched)
+                elif not prefetched:
+                    self.add_model(model, path)
+
+    def apply(self, queryset, keep=()):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(self.prefetch_related))
+        return queryset.only(*sorted(self.only | set(keep)))
+
+
+class FieldSet:
+    """
+    The fields and expanded relations a request asks for, as trees of names.
+    """
+
+    def __init__(self, fields=(), expand=()):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Return the fieldset of a read request, or None when it asks for
+        every field.
+        """
+        if request.method not in ("GET", "HEAD"):
+            return None
+        fields = request.query_params.get(FIELDS_QUERY_PARAM)
+        expand = request.query_params.get(EXPAND_QUERY_PARAM)
+        if fields is None and expand is None:
+            return None
+        return cls(parse_paths(fields or ""), parse_paths(expand or ""))
+
+    def __eq__(self, other):
+        if not isinstance(other, FieldSet):
+            return NotImplemented
+        return (self.fields, self.expand) == (other.fields, other.expand)
+
+    def __hash__(self):
+        return hash((self.fields, self.expand))
+
+    def prune(self, serializer):
+        """
+        Remove the fields that were not asked for from the serializer and its
+        nested serializers, and return it.
+        """
+        self.prune_fields(serializer, self.fields, self.expand, "")
+        return serializer
+
+    def prune_fields(self, serializer, fields, expand, path):
+        fields, expand = dict(fields), dict(expand)
+        serializer_fields = get_fields(serializer)
+        unknown = sorted((fields.keys() | expand.keys()) - serializer_fields.keys())
+        if unknown:
+            raise ValidationError(
+                {FIELDS_QUERY_PARAM: f"Unknown field: {path}{unknown[0]}"}
+            )
+
+        for name, field in list(serializer_fields.items()):
+            nested = isinstance(field, serializers.BaseSerializer)
+            if name not in fields and name not in expand and (fields or nested):
+                del serializer_fields[name]
+            elif nested:
+                self.prune_fields(
+                    field, fields.get(name, ()), expand.get(name, ()), f"{path}{name}."
+                )
+            elif fields.get(name) or expand.get(name):
+                raise ValidationError(
+                    {FIELDS_QUERY_PARAM: f"Not a nested field: {path}{name}"}
+                )
+
+    def includes(self, serializer_class, name):
+        """
+        Return whether the field of the serializer is rendered.
+        """
+        return name in get_pruned_serializer(serializer_class, self).fields
+
+    def load(self, queryset, serializer_class, keep=()):
+        """
+        Narrow the queryset to what the requested fields of the serializer
+        read. ``keep`` names further columns to load, such as the ordering
+        that pagination reads back from the objects.
+        """
+        plan = get_plan(serializer_class, self)
+        return plan.apply(queryset, keep)
+
+
+@functools.lru_cache(maxsize=256)
+def get_pruned_serializer(serializer_class, fieldset):
+    return fieldset.prune(serializer_class())
+
+
+@functools.lru_cache(maxsize=256)
+def get_plan(serializer_class, fieldset):
+    serializer = get_pruned_serializer(serializer_class, fieldset)
+    plan = Plan()
+    plan.add_serializer(serializer, serializer.Meta.model, "", prefetched=False)
+    return plan
+
+
+class SparseFieldsMixin:
+    """
+    Mixin for read views that renders only the fields a request asks for with
+    ``?fields=`` and ``?expand=``. Views narrow their queryset with
+    ``self.fieldset.load()`` when a fieldset is given.
+    """
+
+    @functools.cached_property
+    def fieldset(self):
+        return FieldSet.from_request(self.request)
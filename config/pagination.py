@@ -0,0 +1,178 @@
+from django.core.paginator import InvalidPage
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    CursorPagination,
+    PageNumberPagination,
+    _reverse_ordering,
+)
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination for async views, counting and fetching the page
+    through Django's async ORM. Lists built in memory are paginated as usual.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if not isinstance(queryset, QuerySet):
+            return self.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return self.page.object_list
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a unique ordering, so every page costs one indexed
+    range scan instead of a COUNT(*) and a growing OFFSET.
+
+    Clients opt in with ``?cursor=`` (left empty for the first page) and follow
+    the ``next`` links from there. Other requests keep the page-number
+    responses, with their ``count``, ordered the same way. Both are fetched
+    through Django's async ORM in async views.
+    """
+
+    def __init__(self):
+        self.page_number_pagination = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.page_number_pagination = PageNumberPagination()
+            return self.page_number_pagination.paginate_queryset(
+                self.get_ordered_queryset(queryset, request, view), request, view
+            )
+
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if not isinstance(queryset, QuerySet):
+            return self.paginate_queryset(queryset, request, view)
+
+        if self.cursor_query_param not in request.query_params:
+            self.page_number_pagination = AsyncPageNumberPagination()
+            return await self.page_number_pagination.apaginate_queryset(
+                self.get_ordered_queryset(queryset, request, view), request, view
+            )
+
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page([obj async for obj in page_queryset])
+
+    def get_ordered_queryset(self, queryset, request, view=None):
+        return queryset.order_by(*self.get_ordering(request, queryset, view))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the query for the requested cursor page, as
+        CursorPagination.paginate_queryset() builds it, with one extra object
+        that tells whether a next page follows.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            order = self.ordering[0]
+            order_attr = order.lstrip("-")
+            # The cursor and the ordering run in opposite directions
+            if self.cursor.reverse != order.startswith("-"):
+                queryset = queryset.filter(**{f"{order_attr}__lt": current_position})
+            else:
+                queryset = queryset.filter(**{f"{order_attr}__gt": current_position})
+
+        return queryset[offset : offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """
+        Keep the page out of the fetched objects and find the positions of the
+        next and previous pages, as CursorPagination.paginate_queryset() does.
+        """
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        self.page = list(results[: self.page_size])
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            # The query ran in reverse, so the page is turned back around
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.page_number_pagination:
+            return self.page_number_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return PageNumberPagination().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *PageNumberPagination().get_schema_operation_parameters(view),
+            *super().get_schema_operation_parameters(view),
+        ]
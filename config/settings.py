@@ -51,9 +51,12 @@ INSTALLED_APPS = [
     "authentication",
     "restaurants",
     "voting",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.RequestMetricsMiddleware",
+    "config.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -95,9 +98,65 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "postgres"),
         "HOST": os.getenv("POSTGRES_HOST", "db"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        # Seconds to keep a connection open across requests (0 closes it after
+        # every request). Keep it at 0 under ASGI, where requests do not reuse
+        # threads, and use the pool instead.
+        "CONN_MAX_AGE": int(os.getenv("POSTGRES_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": bool(int(os.getenv("POSTGRES_CONN_HEALTH_CHECKS", "0"))),
     }
 }
 
+# Connection pooling needs psycopg 3 with its pool extra (psycopg[pool]).
+# Pooled connections go back to the pool after every request, so they do not
+# combine with CONN_MAX_AGE.
+if bool(int(os.getenv("POSTGRES_POOL", "0"))):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("POSTGRES_POOL_TIMEOUT", "30")),
+        }
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "daily-menu-voting"),
+    }
+}
+
+# Live results events: "local" for a single process, "postgres" to fan out
+# through LISTEN/NOTIFY when several worker processes serve the API
+VOTING_EVENTS_BACKEND = os.getenv("VOTING_EVENTS_BACKEND", "local")
+
+# Route the busiest read endpoints to their async views; enable when serving
+# config.asgi with an ASGI server
+ASYNC_VIEWS = bool(int(os.getenv("ASYNC_VIEWS", "0")))
+
+# Responses shorter than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.1/topics/auth/passwords/
+# New passwords use the first hasher. Hashes made by any other one, or with an
+# older work factor, are upgraded the next time their employee logs in.
+
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -145,12 +204,29 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom user model
 AUTH_USER_MODEL = "authentication.Employee"
 
+# Build request.user from access token claims instead of loading the employee
+STATELESS_JWT_AUTH = bool(int(os.getenv("STATELESS_JWT_AUTH", "0")))
+
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication"
+        (
+            "authentication.authentication.StatelessJWTAuthentication"
+            if STATELESS_JWT_AUTH
+            else "authentication.authentication.JWTAuthentication"
+        )
     ],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+    # orjson-backed when it is installed, DRF's JSON classes otherwise
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_VERSIONING_CLASS": "config.versioning.MobileAppVersioning",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -162,6 +238,12 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "authentication.serializers.EmployeeTokenObtainPairSerializer"
+    ),
+    "TOKEN_REFRESH_SERIALIZER": (
+        "authentication.serializers.EmployeeTokenRefreshSerializer"
+    ),
 }
 
 # Spectacular settings
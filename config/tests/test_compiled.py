@@ -0,0 +1,171 @@
+from datetime import datetime, time
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from authentication.tests.factories import EmployeeFactory
+from config.compiled import compile_serializer, get_read_serializer
+from restaurants.models import Menu, MenuItem, Restaurant
+from restaurants.serializers import (
+    MenuDetailSerializer,
+    MenuItemSerializer,
+    MenuSerializer,
+    RestaurantDetailSerializer,
+    RestaurantSerializer,
+)
+from restaurants.tests.factories import MenuFactory, MenuItemFactory, RestaurantFactory
+from voting.api.v1.serializers import VoteDetailSerializerV1, VotingResultSerializerV1
+from voting.api.v2.serializers import VoteDetailSerializerV2, VotingResultSerializerV2
+from voting.models import Vote
+from voting.results import get_results_for_date
+from voting.tests.factories import VoteFactory
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestCompiledSerializerContract:
+    """
+    The compiled serializers must render byte for byte what the serializers
+    they are compiled from render.
+    """
+
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+
+        menus = [
+            MenuFactory(date=self.today, restaurant__name="Café \u2028 Ünïcode"),
+            MenuFactory(date=self.today),
+            MenuFactory(date=self.today),
+        ]
+        MenuItemFactory(menu=menus[0], description="", price=Decimal("0.50"))
+        MenuItemFactory(menu=menus[0], price=Decimal("1234567.89"))
+        MenuItemFactory(menu=menus[1], price=Decimal("0"))
+        RestaurantFactory()
+        employees = [
+            EmployeeFactory(first_name="", last_name=""),
+            *EmployeeFactory.create_batch(4),
+        ]
+        for index, employee in enumerate(employees):
+            VoteFactory(employee=employee, menu=menus[index % 2])
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def assert_identical(self, serializer_class, instance, many=False):
+        assert compile_serializer(serializer_class) is not None
+
+        expected = render(serializer_class(instance, many=many).data)
+        compiled = get_read_serializer(serializer_class, instance, many=many)
+
+        assert render(compiled.data) == expected
+
+    @pytest.mark.parametrize("serializer_class", [MenuSerializer, MenuDetailSerializer])
+    def test_menus(self, serializer_class):
+        self.assert_identical(serializer_class, Menu.objects.with_details(), many=True)
+
+    def test_menu_items(self):
+        self.assert_identical(MenuItemSerializer, MenuItem.objects.all(), many=True)
+
+    @pytest.mark.parametrize(
+        "serializer_class", [RestaurantSerializer, RestaurantDetailSerializer]
+    )
+    def test_restaurants(self, serializer_class):
+        self.assert_identical(
+            serializer_class, Restaurant.objects.with_menu_for_date(), many=True
+        )
+        self.assert_identical(serializer_class, Restaurant.objects.first())
+
+    @pytest.mark.parametrize(
+        "serializer_class", [VoteDetailSerializerV1, VoteDetailSerializerV2]
+    )
+    def test_votes(self, serializer_class):
+        votes = Vote.objects.select_related("employee", "menu__restaurant")
+
+        self.assert_identical(serializer_class, votes, many=True)
+        self.assert_identical(serializer_class, votes.first())
+
+    @pytest.mark.parametrize(
+        "serializer_class", [VotingResultSerializerV1, VotingResultSerializerV2]
+    )
+    def test_results(self, serializer_class):
+        self.assert_identical(
+            serializer_class, get_results_for_date(self.today), many=True
+        )
+
+
+class TestCompileSerializer:
+    def test_reads_mappings(self):
+        class RowSerializer(serializers.Serializer):
+            id = serializers.IntegerField()
+            name = serializers.CharField(source="restaurant__name")
+            date = serializers.DateField()
+            note = serializers.CharField(required=False)
+
+        row = {"id": 1, "restaurant__name": "Bistro", "date": None}
+
+        compiled = compile_serializer(RowSerializer)
+
+        assert compiled.to_representation(row) == RowSerializer(row).data
+        assert compiled.to_representation(row) == {
+            "id": 1,
+            "name": "Bistro",
+            "date": None,
+        }
+
+    def test_decimals(self):
+        class PriceSerializer(serializers.Serializer):
+            price = serializers.DecimalField(max_digits=5, decimal_places=2)
+            rounded = serializers.DecimalField(
+                max_digits=5, decimal_places=1, source="price"
+            )
+            number = serializers.DecimalField(
+                max_digits=5, decimal_places=2, coerce_to_string=False, source="price"
+            )
+
+        compiled = compile_serializer(PriceSerializer)
+
+        for price in (Decimal("1.25"), Decimal("-0.00"), Decimal("3"), 2.5, "7.1"):
+            assert compiled.to_representation({"price": price}) == (
+                PriceSerializer({"price": price}).data
+            )
+
+    def test_method_fields_see_the_context(self):
+        class GreetingSerializer(serializers.Serializer):
+            greeting = serializers.SerializerMethodField()
+
+            def get_greeting(self, obj):
+                return f"{self.context['word']} {obj['name']}"
+
+        compiled = compile_serializer(GreetingSerializer)
+
+        assert compiled.to_representation({"name": "Ann"}, context={"word": "Hi"}) == {
+            "greeting": "Hi Ann"
+        }
+
+    def test_overridden_representation_is_not_compiled(self):
+        class UpperSerializer(serializers.Serializer):
+            name = serializers.CharField()
+
+            def to_representation(self, instance):
+                return {"name": instance["name"].upper()}
+
+        class CustomField(serializers.CharField):
+            def to_representation(self, value):
+                return value.upper()
+
+        class CustomFieldSerializer(serializers.Serializer):
+            name = CustomField()
+
+        assert compile_serializer(UpperSerializer) is None
+        assert compile_serializer(CustomFieldSerializer) is None
+        assert get_read_serializer(UpperSerializer, {"name": "a"}).data == {"name": "A"}
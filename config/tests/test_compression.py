@@ -0,0 +1,145 @@
+import gzip
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from config import compression
+from config.compression import (
+    CompressionMiddleware,
+    compress_variants,
+    get_accepted_encoding,
+    get_variant_response,
+    parse_accept_encoding,
+)
+
+CONTENT = b'{"results": [' + b'{"name": "Pho", "price": "12.50"}, ' * 100 + b"]}"
+
+
+def get_request(accept_encoding=None):
+    headers = {"accept-encoding": accept_encoding} if accept_encoding else {}
+    return RequestFactory().get("/", headers=headers)
+
+
+def get_response(content=CONTENT, **headers):
+    def view(request):
+        response = HttpResponse(content, content_type="application/json")
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    return view
+
+
+class TestAcceptEncoding:
+    def test_parse(self):
+        assert parse_accept_encoding("gzip;q=0.5, br , identity;q=0,;q=x") == {
+            "gzip": 0.5,
+            "br": 1.0,
+            "identity": 0.0,
+        }
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            (None, None),
+            ("gzip, deflate", "gzip"),
+            ("GZIP", "gzip"),
+            ("deflate", None),
+            ("gzip;q=0", None),
+            ("*", "gzip"),
+            ("*, gzip;q=0", None),
+            ("gzip;q=abc", None),
+        ],
+    )
+    def test_gzip(self, header, expected, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+
+        assert get_accepted_encoding(get_request(header)) == expected
+
+    def test_prefers_brotli_when_installed(self):
+        pytest.importorskip("brotli")
+
+        assert get_accepted_encoding(get_request("gzip, br")) == "br"
+        assert get_accepted_encoding(get_request("gzip, br;q=0")) == "gzip"
+
+
+class TestCompressionMiddleware:
+    def test_compresses_accepted_encoding(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        middleware = CompressionMiddleware(get_response(ETag='"abc"'))
+
+        response = middleware(get_request("gzip"))
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert response["ETag"] == 'W/"abc"'
+        assert response["Content-Length"] == str(len(response.content))
+        assert gzip.decompress(response.content) == CONTENT
+
+    def test_keeps_identity_without_accepted_encoding(self):
+        middleware = CompressionMiddleware(get_response(ETag='"abc"'))
+
+        response = middleware(get_request("deflate"))
+
+        assert response.content == CONTENT
+        assert response["Vary"] == "Accept-Encoding"
+        assert response["ETag"] == '"abc"'
+        assert not response.has_header("Content-Encoding")
+
+    @override_settings(COMPRESSION_MIN_SIZE=len(CONTENT) + 1)
+    def test_short_responses_are_not_compressed(self):
+        response = CompressionMiddleware(get_response())(get_request("gzip"))
+
+        assert response.content == CONTENT
+        assert not response.has_header("Vary")
+
+    def test_streaming_responses_are_not_compressed(self):
+        def view(request):
+            return StreamingHttpResponse(iter([CONTENT]))
+
+        response = CompressionMiddleware(view)(get_request("gzip"))
+
+        assert b"".join(response.streaming_content) == CONTENT
+        assert not response.has_header("Content-Encoding")
+
+    def test_encoded_responses_are_passed_through(self):
+        content = gzip.compress(CONTENT)
+        middleware = CompressionMiddleware(
+            get_response(content, ETag='"abc"', **{"Content-Encoding": "gzip"})
+        )
+
+        response = middleware(get_request("gzip"))
+
+        assert response.content == content
+        assert response["ETag"] == 'W/"abc"'
+
+
+class TestVariants:
+    def test_compress_variants(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+
+        variants = compress_variants(CONTENT)
+
+        assert set(variants) == {"identity", "gzip"}
+        assert gzip.decompress(variants["gzip"]) == CONTENT
+
+    @override_settings(COMPRESSION_MIN_SIZE=len(CONTENT) + 1)
+    def test_short_content_has_no_variants(self):
+        assert compress_variants(CONTENT) == {"identity": CONTENT}
+
+    def test_variant_response(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        variants = compress_variants(CONTENT)
+
+        compressed = get_variant_response(
+            get_request("br, gzip"), variants, "application/json"
+        )
+        plain = get_variant_response(get_request(), variants, "application/json")
+
+        assert compressed.content == variants["gzip"]
+        assert compressed["Content-Encoding"] == "gzip"
+        assert compressed["Vary"] == "Accept-Encoding"
+        assert plain.content == CONTENT
+        assert not plain.has_header("Content-Encoding")
+        assert plain["Vary"] == "Accept-Encoding"
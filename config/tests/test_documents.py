@@ -0,0 +1,56 @@
+import gzip
+from unittest.mock import patch
+
+from django.test import override_settings
+from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from config.documents import DocumentCacheMixin, get_document, set_document
+
+CONTENT = b'{"results": [' + b'{"name": "Pho", "price": "12.50"}, ' * 100 + b"]}"
+
+
+class DocumentListView(DocumentCacheMixin, generics.ListAPIView):
+    authentication_classes = ()
+    permission_classes = ()
+    document_key = "tests:document"
+
+    def get_document_key(self, request):
+        return self.document_key
+
+
+def get_response(**initkwargs):
+    view = DocumentListView.as_view(**initkwargs)
+    return view(APIRequestFactory().get("/"))
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1)
+def test_set_document_stores_variants():
+    variants = set_document("tests:document", CONTENT)
+
+    assert get_document("tests:document") == variants
+    assert gzip.decompress(variants["gzip"]) == CONTENT
+
+
+class TestDocumentCacheMixin:
+    def test_document_is_rendered_once(self):
+        with patch.object(
+            generics.ListAPIView, "list", return_value=Response([1, 2])
+        ) as list_view:
+            first = get_response()
+            second = get_response()
+
+        list_view.assert_called_once()
+        assert first.content == second.content == b"[1,2]"
+        assert get_document("tests:document") == {"identity": b"[1,2]"}
+
+    def test_views_without_key_are_not_cached(self):
+        with patch.object(
+            generics.ListAPIView, "list", return_value=Response([1, 2])
+        ) as list_view:
+            get_response(document_key=None)
+            get_response(document_key=None)
+
+        assert list_view.call_count == 2
+        assert get_document("tests:document") is None
@@ -0,0 +1,163 @@
+import pytest
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from config.compiled import get_read_serializer
+from config.fieldsets import FieldSet, get_fields, get_plan, parse_paths
+from restaurants.models import Menu
+from restaurants.serializers import MenuDetailSerializer
+from restaurants.tests.factories import MenuFactory, MenuItemFactory
+from voting.api.v2.serializers import VoteDetailSerializerV2
+from voting.models import Vote
+from voting.tests.factories import VoteFactory
+
+
+def get_fieldset(fields=None, expand=None):
+    return FieldSet(parse_paths(fields or ""), parse_paths(expand or ""))
+
+
+class TestParsePaths:
+    def test_builds_a_tree(self):
+        assert parse_paths("id, menu.date,menu.items.name,,menu.") == (
+            ("id", ()),
+            ("menu", (("date", ()), ("items", (("name", ()),)))),
+        )
+
+    def test_equal_fieldsets_hash_alike(self):
+        assert get_fieldset("id,menu.date") == get_fieldset("menu.date,id")
+        assert hash(get_fieldset("id,menu.date")) == hash(get_fieldset("menu.date,id"))
+
+
+class TestPrune:
+    def get_fields(self, fieldset, serializer_class=VoteDetailSerializerV2):
+        serializer = fieldset.prune(serializer_class())
+        return {
+            name: (
+                sorted(get_fields(field))
+                if isinstance(field, serializers.BaseSerializer)
+                else None
+            )
+            for name, field in serializer.fields.items()
+        }
+
+    def test_fields(self):
+        assert self.get_fields(get_fieldset("id,menu_date")) == {
+            "id": None,
+            "menu_date": None,
+        }
+
+    def test_nested_fields_are_collapsed_unless_reached(self):
+        assert self.get_fields(get_fieldset(expand="")) == {
+            "id": None,
+            "date": None,
+            "restaurant_name": None,
+            "menu_date": None,
+            "employee_email": None,
+            "employee_name": None,
+        }
+        assert self.get_fields(get_fieldset("id,menu"))["menu"] == [
+            "date",
+            "id",
+            "restaurant",
+        ]
+
+    def test_expand(self):
+        fields = self.get_fields(get_fieldset("id", expand="menu.items"))
+
+        assert fields == {"id": None, "menu": ["date", "id", "items", "restaurant"]}
+
+    @pytest.mark.parametrize(
+        "fields,expand,message",
+        [
+            ("id,price", None, "Unknown field: price"),
+            ("menu.price", None, "Unknown field: menu.price"),
+            (None, "menu.items.calories", "Unknown field: menu.items.calories"),
+            ("menu_date.year", None, "Not a nested field: menu_date"),
+        ],
+    )
+    def test_invalid_fields(self, fields, expand, message):
+        with pytest.raises(ValidationError) as error:
+            get_fieldset(fields, expand).prune(VoteDetailSerializerV2())
+
+        assert error.value.detail == {"fields": message}
+
+
+class TestPlan:
+    def test_columns_and_relations(self):
+        plan = get_plan(
+            VoteDetailSerializerV2,
+            get_fieldset("restaurant_name,employee_name,menu.date", "menu.items"),
+        )
+
+        assert plan.only == {
+            "employee",
+            "employee__first_name",
+            "employee__last_name",
+            "menu",
+            "menu__date",
+            "menu__restaurant",
+            "menu__restaurant__name",
+        }
+        assert plan.select_related == {"employee", "menu", "menu__restaurant"}
+        assert plan.prefetch_related == {"menu__items"}
+
+    def test_primary_keys_are_read_from_the_foreign_key(self):
+        class VoteMenuSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = Vote
+                fields = ("id", "menu")
+
+        plan = get_plan(VoteMenuSerializer, get_fieldset("menu"))
+
+        assert plan.only == {"menu"}
+        assert plan.select_related == set()
+
+    def test_method_fields_without_sources_load_the_model(self):
+        class MenuTodaySerializer(serializers.ModelSerializer):
+            is_today = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Menu
+                fields = ("id", "is_today")
+
+            def get_is_today(self, obj):
+                return obj.is_today
+
+        plan = get_plan(MenuTodaySerializer, get_fieldset("is_today"))
+
+        assert plan.only == {"id", "restaurant", "date", "created_at", "updated_at"}
+
+
+@pytest.mark.django_db
+class TestSparseReadSerializer:
+    def test_compiled_matches_pruned_serializer(self):
+        vote = VoteFactory()
+        MenuItemFactory.create_batch(2, menu=vote.menu)
+        fieldset = get_fieldset("id,employee_name,menu.restaurant", "menu.items")
+        votes = Vote.objects.all()
+
+        compiled = get_read_serializer(
+            VoteDetailSerializerV2, votes, many=True, fieldset=fieldset
+        )
+        expected = fieldset.prune(VoteDetailSerializerV2(votes, many=True))
+
+        rendered = JSONRenderer().render(compiled.data)
+        assert rendered == JSONRenderer().render(expected.data)
+        assert list(compiled.data[0]) == ["id", "menu", "employee_name"]
+
+    def test_serializer_that_does_not_compile_is_pruned(self):
+        class UpperMenuSerializer(MenuDetailSerializer):
+            def to_representation(self, instance):
+                return {
+                    name: value.upper() if isinstance(value, str) else value
+                    for name, value in super().to_representation(instance).items()
+                }
+
+        menu = MenuFactory(restaurant__name="Bistro")
+
+        serializer = get_read_serializer(
+            UpperMenuSerializer, menu, fieldset=get_fieldset("id,restaurant")
+        )
+
+        assert serializer.data == {"id": menu.id, "restaurant": "BISTRO"}
@@ -0,0 +1,60 @@
+import io
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config.renderers import FastJSONParser, FastJSONRenderer
+
+PAYLOAD = {
+    "id": 1,
+    "restaurant": "Caf\u00e9 \u2028 \u2029 \U0001f35c",
+    "price": Decimal("12.50"),
+    "date": date(2025, 3, 14),
+    "created_at": datetime(2025, 3, 14, 9, 30, 15, 123456, tzinfo=timezone.utc),
+    "naive": datetime(2025, 3, 14, 9, 30),
+    "uuid": uuid.UUID(int=1),
+    "label": gettext_lazy("Menu"),
+    "counts": {1: 3, 2: 0},
+    "items": [{"name": "Soup", "price": "4.20", "available": True, "note": None}],
+    "ratio": 0.1,
+}
+
+
+class TestFastJSONRenderer:
+    def test_output_matches_drf(self):
+        assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+    def test_indented_output_matches_drf(self):
+        media_type = "application/json; indent=2"
+
+        assert FastJSONRenderer().render(PAYLOAD, media_type) == (
+            JSONRenderer().render(PAYLOAD, media_type)
+        )
+
+    def test_none_renders_empty(self):
+        assert FastJSONRenderer().render(None) == b""
+
+    def test_uses_orjson_when_installed(self):
+        orjson = pytest.importorskip("orjson")
+
+        assert FastJSONRenderer().render({"a": [1]}) == orjson.dumps({"a": [1]})
+
+
+class TestFastJSONParser:
+    def test_parses_like_drf(self):
+        content = JSONRenderer().render(PAYLOAD)
+
+        assert FastJSONParser().parse(io.BytesIO(content)) == JSONParser().parse(
+            io.BytesIO(content)
+        )
+
+    @pytest.mark.parametrize("content", [b"{", b'{"a": NaN}', b"\xff"])
+    def test_invalid_json(self, content):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(content))
@@ -0,0 +1,78 @@
+from datetime import datetime, time
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from authentication.tests.factories import EmployeeFactory
+from config.versioning import MobileAppVersioning, VersionRegistry, version_registry
+from restaurants.tests.factories import MenuFactory
+from voting.api.v1.serializers import VotingResultSerializerV1
+from voting.tests.factories import VoteFactory
+
+
+class TestVersionRegistry:
+    def setup_method(self):
+        self.registry = VersionRegistry(default_version="1.0")
+        self.registry.register("vote", "1.0", input="input-v1", output="output-v1")
+        self.registry.register("vote", "2.0", output="output-v2")
+        self.registry.register("results", "3.0", results="results-v3")
+
+    def test_registered_versions_are_active(self):
+        assert self.registry.versions == {"1.0", "2.0", "3.0"}
+
+    def test_resolve_falls_back_to_default_version(self):
+        assert self.registry.resolve("vote", "2.0").output == "output-v2"
+        assert self.registry.resolve("vote", "3.0").output == "output-v1"
+        assert self.registry.resolve("vote", None).input == "input-v1"
+
+    def test_resolve_counts_requests(self):
+        self.registry.resolve("vote", "2.0")
+        self.registry.resolve("vote", "2.0")
+        self.registry.resolve("vote", "3.0")
+
+        assert self.registry.get_usage() == {("vote", "2.0"): 2, ("vote", "3.0"): 1}
+
+
+class TestMobileAppVersioning:
+    def determine_version(self, **headers):
+        request = APIRequestFactory().get("/", **headers)
+        return MobileAppVersioning().determine_version(request)
+
+    def test_reads_version_header(self):
+        assert self.determine_version(HTTP_MOBILE_APP_VERSION="2.0") == "2.0"
+
+    def test_unknown_or_missing_version_is_default(self):
+        assert self.determine_version(HTTP_MOBILE_APP_VERSION="9.0") == "1.0"
+        assert self.determine_version() == "1.0"
+
+
+@pytest.mark.django_db
+def test_new_version_is_a_registration():
+    client = APIClient()
+    client.force_authenticate(user=EmployeeFactory())
+    today = timezone.now().date()
+    VoteFactory(menu=MenuFactory(date=today))
+
+    with (
+        patch.object(version_registry, "bundles", dict(version_registry.bundles)),
+        patch.object(version_registry, "versions", version_registry.versions),
+        patch(
+            "django.utils.timezone.localtime",
+            return_value=datetime.combine(today, time(10, 0)),
+        ),
+    ):
+        version_registry.register("results", "3.0", results=VotingResultSerializerV1)
+        response = client.get(
+            reverse("voting:today-results"), HTTP_MOBILE_APP_VERSION="3.0"
+        )
+        history = client.get(
+            reverse("voting:vote-history"), HTTP_MOBILE_APP_VERSION="3.0"
+        )
+
+    assert response.renderer_context["request"].version == "3.0"
+    assert list(response.data["results"][0]) == ["votes_count", "restaurant_name"]
+    # Views without a 3.0 bundle serve the default version
+    assert history.status_code == 200
@@ -11,6 +11,7 @@ urlpatterns = [
     path("api/v1/auth/", include("authentication.urls")),
     path("api/v1/restaurants/", include("restaurants.urls")),
     path("api/v1/voting/", include("voting.urls")),
+    path("api/v1/monitoring/", include("monitoring.urls")),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/docs/",
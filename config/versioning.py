@@ -1,21 +1,119 @@
+import threading
+from collections import Counter
+from functools import cached_property
+
 from rest_framework import versioning
 
 
+class SerializerBundle:
+    """
+    The serializers of one view in one API version: what it reads from the
+    request, what it answers with and how it renders results, plus the
+    relations the output needs loaded along with each object.
+    """
+
+    def __init__(
+        self,
+        input=None,
+        output=None,
+        results=None,
+        select_related=(),
+        prefetch_related=(),
+    ):
+        self.input = input
+        self.output = output
+        self.results = results
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related
+
+    def load_related(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+class VersionRegistry:
+    """
+    Serializer bundles per view name and API version, registered once at
+    startup. A version is active as soon as any view registers it; views
+    without a bundle for the requested version use the default version's.
+    """
+
+    def __init__(self, default_version):
+        self.default_version = default_version
+        self.versions = frozenset([default_version])
+        self.bundles = {}
+        self.usage = Counter()
+        self.lock = threading.Lock()
+
+    def register(self, name, version, **serializers):
+        self.bundles[(name, version)] = SerializerBundle(**serializers)
+        self.versions = self.versions | {version}
+
+    def resolve(self, name, version):
+        """
+        Return the bundle serving a request for the view in the version, and
+        count the request.
+        """
+        bundle = self.bundles.get((name, version))
+        if bundle is None:
+            bundle = self.bundles[(name, self.default_version)]
+        with self.lock:
+            self.usage[(name, version)] += 1
+        return bundle
+
+    def get_usage(self):
+        """
+        Return the requests served per (view name, version) so far.
+        """
+        with self.lock:
+            return dict(self.usage)
+
+
+version_registry = VersionRegistry(default_version="1.0")
+
+
 class MobileAppVersioning(versioning.BaseVersioning):
     """
     Custom versioning scheme that expects the client to send the mobile app version
-    in a header.
+    in a header. Versions other than the registered ones get the default.
     """
 
-    default_version = "1.0"
-    allowed_versions = ["1.0", "2.0"]
+    default_version = version_registry.default_version
     version_param = "mobile-app-version"
+    # request.META key of the header, read without building request.headers
+    version_header = "HTTP_MOBILE_APP_VERSION"
+
+    @property
+    def allowed_versions(self):
+        return version_registry.versions
 
     def determine_version(self, request, *args, **kwargs):
-        version = request.headers.get(self.version_param, self.default_version)
+        version = request.META.get(self.version_header, self.default_version)
         return self.validate_version(version)
 
     def validate_version(self, version):
-        if version not in self.allowed_versions:
+        if version not in version_registry.versions:
             return self.default_version
         return version
+
+
+class VersionedSerializerMixin:
+    """
+    Mixin that takes the view's serializers from the bundle registered for its
+    name and the request's API version. ``serializer_role`` names the bundle
+    entry that get_serializer_class() returns.
+    """
+
+    versioned_name = None
+    serializer_role = "output"
+
+    @cached_property
+    def versioned_serializers(self):
+        version = getattr(self.request, "version", None)
+        return version_registry.resolve(self.versioned_name, version)
+
+    def get_serializer_class(self):
+        return getattr(self.versioned_serializers, self.serializer_role)
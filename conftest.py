@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication import denylist, profiles
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    profiles.local_profiles.clear()
+    denylist.clear()
+    yield
+    cache.clear()
+    profiles.local_profiles.clear()
+    denylist.clear()
+
+
+def is_savepoint_query(sql):
+    return sql.split(maxsplit=1)[0] in ("SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+@pytest.fixture
+def django_assert_num_business_queries():
+    """
+    django_assert_num_queries() without the savepoint statements, which only
+    reflect how transactions happen to be nested.
+    """
+
+    @contextmanager
+    def assert_num_queries(num):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if not is_savepoint_query(query["sql"])
+        ]
+        assert len(queries) == num, "\n".join(queries)
+
+    return assert_num_queries
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from monitoring.middleware import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
@@ -0,0 +1,156 @@
+"""
+In-memory request histograms, one set per URL name and API version.
+
+Each process keeps its own histograms from the moment it starts; scrape every
+worker (or sum their Prometheus exports) to see the whole deployment.
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERIES_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+METRICS = {
+    "duration_seconds": ("Time to handle the request", SECONDS_BUCKETS),
+    "queries": ("Database queries run by the request", QUERIES_BUCKETS),
+    "sql_seconds": ("Time spent running database queries", SECONDS_BUCKETS),
+    "view_python_seconds": (
+        "Time spent in the view outside of database queries: authentication, "
+        "permissions, pagination and serializers",
+        SECONDS_BUCKETS,
+    ),
+    "render_seconds": (
+        "Time spent rendering the response body, outside of database queries",
+        SECONDS_BUCKETS,
+    ),
+    "response_bytes": ("Size of the response body", BYTES_BUCKETS),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self):
+        """
+        Return (upper bound, observations at or below it) pairs, ending with
+        infinity.
+        """
+        total = 0
+        pairs = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q):
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative_counts():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = defaultdict(self.create_histograms)
+
+    def create_histograms(self):
+        return {name: Histogram(buckets) for name, (_, buckets) in METRICS.items()}
+
+    def observe(self, url_name, version, values):
+        with self.lock:
+            histograms = self.series[(url_name, version)]
+            for name, value in values.items():
+                if value is not None:
+                    histograms[name].observe(value)
+
+    def snapshot(self):
+        """
+        Return a copy of every histogram, keyed by (url_name, version).
+        """
+        with self.lock:
+            return {
+                labels: {name: self.copy(h) for name, h in histograms.items()}
+                for labels, histograms in self.series.items()
+            }
+
+    def copy(self, histogram):
+        copy = Histogram(histogram.buckets)
+        copy.counts = list(histogram.counts)
+        copy.count = histogram.count
+        copy.sum = histogram.sum
+        return copy
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+
+
+registry = Registry()
+
+
+def escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def to_prometheus(snapshot, prefix="http_request_"):
+    """
+    Render a registry snapshot in the Prometheus text exposition format.
+    """
+    lines = []
+    for name, (description, _) in METRICS.items():
+        metric = f"{prefix}{name}"
+        lines.append(f"# HELP {metric} {description}.")
+        lines.append(f"# TYPE {metric} histogram")
+        for (url_name, version), histograms in sorted(snapshot.items()):
+            histogram = histograms[name]
+            labels = (
+                f'url_name="{escape_label(url_name)}",'
+                f'version="{escape_label(version)}"'
+            )
+            for bound, total in histogram.cumulative_counts():
+                lines.append(
+                    f'{metric}_bucket{{{labels},le="{format_bound(bound)}"}} {total}'
+                )
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def usage_to_prometheus(usage, metric="api_version_requests_total"):
+    """
+    Render the requests per (view name, API version) of the version registry
+    as a Prometheus counter.
+    """
+    lines = [
+        f"# HELP {metric} Requests served per versioned view and API version.",
+        f"# TYPE {metric} counter",
+    ]
+    for (name, version), count in sorted(usage.items(), key=str):
+        lines.append(
+            f'{metric}{{view="{escape_label(str(name))}",'
+            f'version="{escape_label(str(version))}"}} {count}'
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,138 @@
+import functools
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from rest_framework.settings import api_settings
+
+from monitoring.metrics import registry
+
+current_sample = ContextVar("current_sample", default=None)
+
+
+class Sample:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0
+        self.view_start = None
+        self.view_sql_seconds = 0
+        self.render_start = None
+        self.render_sql_seconds = 0
+        self.render_seconds = None
+
+
+def record_query(execute, sql, params, many, context):
+    sample = current_sample.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.queries += 1
+        sample.sql_seconds += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Time the queries of every new database connection. The context variable
+    follows requests into sync_to_async threads, so async views are covered
+    too.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record the duration, query count, SQL time, view and rendering time and
+    response size of every request into the histograms of its URL name and
+    API version.
+
+    View time covers what the view does outside of database queries:
+    authentication, permissions, pagination and serializer.data. Rendering
+    time covers turning the response data into bytes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.versioning = api_settings.DEFAULT_VERSIONING_CLASS()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        sample = Sample()
+        token = current_sample.set(sample)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, response, sample)
+        return response
+
+    async def __acall__(self, request):
+        sample = Sample()
+        token = current_sample.set(sample)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, response, sample)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        sample = current_sample.get()
+        if sample is not None:
+            sample.view_start = time.perf_counter()
+            sample.view_sql_seconds = sample.sql_seconds
+
+    def process_template_response(self, request, response):
+        sample = current_sample.get()
+        if sample is not None:
+            sample.render_start = time.perf_counter()
+            sample.render_sql_seconds = sample.sql_seconds
+            response.add_post_render_callback(
+                functools.partial(self.record_rendering, sample)
+            )
+        return response
+
+    def record_rendering(self, sample, response):
+        render_sql_seconds = sample.sql_seconds - sample.render_sql_seconds
+        sample.render_seconds = max(
+            0, time.perf_counter() - sample.render_start - render_sql_seconds
+        )
+
+    def record(self, request, response, sample):
+        end = time.perf_counter()
+        view_python_seconds = None
+        if sample.view_start is not None:
+            view_end, view_end_sql_seconds = end, sample.sql_seconds
+            if sample.render_start is not None:
+                view_end = sample.render_start
+                view_end_sql_seconds = sample.render_sql_seconds
+            view_sql_seconds = view_end_sql_seconds - sample.view_sql_seconds
+            view_python_seconds = max(
+                0, view_end - sample.view_start - view_sql_seconds
+            )
+
+        match = request.resolver_match
+        registry.observe(
+            match.view_name if match else "unresolved",
+            self.versioning.determine_version(request),
+            {
+                "duration_seconds": end - sample.start,
+                "queries": sample.queries,
+                "sql_seconds": sample.sql_seconds,
+                "view_python_seconds": view_python_seconds,
+                "render_seconds": sample.render_seconds,
+                "response_bytes": (
+                    None if response.streaming else len(response.content)
+                ),
+            },
+        )
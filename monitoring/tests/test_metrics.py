@@ -0,0 +1,70 @@
+from monitoring.metrics import Histogram, Registry, to_prometheus
+
+
+class TestHistogram:
+    def test_observations_fall_in_the_first_bucket_they_fit(self):
+        histogram = Histogram((1, 5, 10))
+
+        for value in (0, 1, 3, 7, 50):
+            histogram.observe(value)
+
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.count == 5
+        assert histogram.sum == 61
+        assert histogram.cumulative_counts() == [
+            (1, 2),
+            (5, 3),
+            (10, 4),
+            (float("inf"), 5),
+        ]
+
+    def test_quantile_is_the_upper_bound_of_its_bucket(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (1, 1, 2, 8):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == 1
+        assert histogram.quantile(0.75) == 5
+        assert histogram.quantile(0.99) == 10
+        assert Histogram((1,)).quantile(0.5) is None
+
+
+class TestRegistry:
+    def test_series_are_kept_per_url_name_and_version(self):
+        registry = Registry()
+
+        registry.observe("voting:today-results", "1.0", {"queries": 2})
+        registry.observe("voting:today-results", "2.0", {"queries": 3})
+        registry.observe("voting:today-results", "2.0", {"queries": None})
+
+        snapshot = registry.snapshot()
+        assert set(snapshot) == {
+            ("voting:today-results", "1.0"),
+            ("voting:today-results", "2.0"),
+        }
+        assert snapshot[("voting:today-results", "2.0")]["queries"].count == 1
+        assert snapshot[("voting:today-results", "2.0")]["sql_seconds"].count == 0
+
+    def test_snapshot_is_a_copy(self):
+        registry = Registry()
+        registry.observe("a", "1.0", {"queries": 1})
+
+        snapshot = registry.snapshot()
+        registry.observe("a", "1.0", {"queries": 1})
+
+        assert snapshot[("a", "1.0")]["queries"].count == 1
+
+
+def test_to_prometheus():
+    registry = Registry()
+    registry.observe('odd"name', "1.0", {"queries": 2})
+
+    text = to_prometheus(registry.snapshot())
+
+    assert "# TYPE http_request_queries histogram\n" in text
+    labels = 'url_name="odd\\"name",version="1.0"'
+    assert f'http_request_queries_bucket{{{labels},le="1.0"}} 0\n' in text
+    assert f'http_request_queries_bucket{{{labels},le="2.0"}} 1\n' in text
+    assert f'http_request_queries_bucket{{{labels},le="+Inf"}} 1\n' in text
+    assert f"http_request_queries_sum{{{labels}}} 2\n" in text
+    assert f"http_request_queries_count{{{labels}}} 1\n" in text
@@ -0,0 +1,136 @@
+from datetime import datetime, time
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.tests.factories import EmployeeFactory
+from config.versioning import version_registry
+from monitoring.metrics import registry
+from restaurants.tests.factories import MenuFactory
+
+
+@pytest.mark.django_db
+class TestRequestMetricsMiddleware:
+    def setup_method(self):
+        registry.clear()
+        self.client = APIClient()
+        self.employee = EmployeeFactory()
+        self.client.force_authenticate(user=self.employee)
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+        MenuFactory.create_batch(2, date=self.today)
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_records_request_per_url_name_and_version(self, django_assert_num_queries):
+        url = reverse("voting:today-results")
+
+        # Tally rebuild, menus and their items
+        with django_assert_num_queries(3):
+            response = self.client.get(url, HTTP_MOBILE_APP_VERSION="2.0")
+        self.client.get(url)
+
+        snapshot = registry.snapshot()
+        histograms = snapshot[("voting:today-results", "2.0")]
+        assert histograms["duration_seconds"].count == 1
+        assert histograms["queries"].sum == 3
+        assert histograms["sql_seconds"].sum > 0
+        assert histograms["view_python_seconds"].count == 1
+        assert histograms["render_seconds"].count == 1
+        assert histograms["render_seconds"].sum < histograms["duration_seconds"].sum
+        assert histograms["response_bytes"].sum == len(response.content)
+        assert snapshot[("voting:today-results", "1.0")]["queries"].count == 1
+
+    def test_records_unresolved_requests(self):
+        self.client.get("/api/v1/missing/")
+
+        histograms = registry.snapshot()[("unresolved", "1.0")]
+        assert histograms["duration_seconds"].count == 1
+        assert histograms["view_python_seconds"].count == 0
+
+    def test_records_async_requests(self):
+        token = RefreshToken.for_user(self.employee).access_token
+        response = async_to_sync(AsyncClient().get)(
+            reverse("restaurants:today-menu-list"),
+            headers={"authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        histograms = registry.snapshot()[("restaurants:today-menu-list", "1.0")]
+        assert histograms["queries"].sum >= 2
+        assert histograms["response_bytes"].sum == len(response.content)
+
+
+@pytest.mark.django_db
+class TestMetricsViews:
+    def setup_method(self):
+        registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=EmployeeFactory(is_staff=True))
+        registry.observe(
+            "voting:today-results", "2.0", {"queries": 2, "duration_seconds": 0.02}
+        )
+
+    def test_metrics_require_staff(self):
+        self.client.force_authenticate(user=EmployeeFactory())
+
+        for name in ("monitoring:metrics", "monitoring:metrics-prometheus"):
+            response = self.client.get(reverse(name))
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_metrics(self):
+        response = self.client.get(reverse("monitoring:metrics"))
+
+        assert response.status_code == status.HTTP_200_OK
+        series = next(
+            row
+            for row in response.data
+            if row["url_name"] == "voting:today-results" and row["version"] == "2.0"
+        )
+        assert series["queries"] == {
+            "count": 1,
+            "sum": 2,
+            "mean": 2,
+            "p50": 2,
+            "p99": 2,
+        }
+        assert series["duration_seconds"]["p99"] == 0.025
+        assert series["response_bytes"]["count"] == 0
+
+    def test_prometheus_metrics(self):
+        response = self.client.get(reverse("monitoring:metrics-prometheus"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/plain; charset=utf-8"
+        assert (
+            'http_request_queries_count{url_name="voting:today-results",'
+            'version="2.0"} 1\n'
+        ) in response.content.decode()
+        assert "# TYPE api_version_requests_total counter\n" in (
+            response.content.decode()
+        )
+
+    def test_versions(self):
+        version_registry.usage.clear()
+        version_registry.resolve("results", "2.0")
+
+        response = self.client.get(reverse("monitoring:versions"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["default_version"] == "1.0"
+        versions = {row["version"]: row for row in response.data["versions"]}
+        assert versions["2.0"]["requests"] == 1
+        assert "results" in versions["2.0"]["views"]
+        assert {"view": "results", "version": "2.0", "requests": 1} in (
+            response.data["usage"]
+        )
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from monitoring.views import MetricsView, PrometheusMetricsView, VersionsView
+
+app_name = "monitoring"
+
+urlpatterns = [
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path(
+        "metrics/prometheus/",
+        PrometheusMetricsView.as_view(),
+        name="metrics-prometheus",
+    ),
+    path("versions/", VersionsView.as_view(), name="versions"),
+]
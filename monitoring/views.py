@@ -0,0 +1,107 @@
+from rest_framework import permissions
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from config.versioning import version_registry
+from monitoring.metrics import METRICS, registry, to_prometheus, usage_to_prometheus
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Render exposition text as is, and errors as their detail message.
+    """
+
+    media_type = "text/plain"
+    format = "txt"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            data = f"# {data.get('detail', '')}\n"
+        return data.encode(self.charset)
+
+
+def summarize(histogram):
+    return {
+        "count": histogram.count,
+        "sum": histogram.sum,
+        "mean": histogram.sum / histogram.count if histogram.count else None,
+        "p50": histogram.quantile(0.5),
+        "p99": histogram.quantile(0.99),
+    }
+
+
+class MetricsView(APIView):
+    """
+    Per-endpoint request metrics of this process. Percentiles are the upper
+    bounds of the histogram buckets they fall in.
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            [
+                {
+                    "url_name": url_name,
+                    "version": version,
+                    **{name: summarize(histograms[name]) for name in METRICS},
+                }
+                for (url_name, version), histograms in sorted(
+                    registry.snapshot().items()
+                )
+            ]
+        )
+
+
+class PrometheusMetricsView(APIView):
+    """
+    The same metrics in the Prometheus text exposition format.
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+    renderer_classes = (PrometheusRenderer,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            to_prometheus(registry.snapshot())
+            + usage_to_prometheus(version_registry.get_usage())
+        )
+
+
+class VersionsView(APIView):
+    """
+    The active API versions and the requests each versioned view served in
+    each of them since this process started.
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        usage = version_registry.get_usage()
+        return Response(
+            {
+                "default_version": version_registry.default_version,
+                "versions": [
+                    {
+                        "version": version,
+                        "requests": sum(
+                            count
+                            for (_, used_version), count in usage.items()
+                            if used_version == version
+                        ),
+                        "views": sorted(
+                            name
+                            for name, registered_version in version_registry.bundles
+                            if registered_version == version
+                        ),
+                    }
+                    for version in sorted(version_registry.versions)
+                ],
+                "usage": [
+                    {"view": name, "version": version, "requests": count}
+                    for (name, version), count in sorted(usage.items(), key=str)
+                ],
+            }
+        )
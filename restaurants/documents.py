@@ -0,0 +1,50 @@
+"""
+Rendered today-menu responses kept in Django's cache framework.
+
+The menu list only changes when restaurants, menus or items are written, so the
+JSON bytes sent to clients are stored per date, API version and page, together
+with their compressed variants. Every write bumps a single generation number
+that is part of each key, which retires all stored documents at once without
+having to know their keys.
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from config.documents import DOCUMENT_TIMEOUT
+
+GENERATION_KEY = "restaurants:menus:generation"
+
+
+def get_generation():
+    return cache.get_or_set(GENERATION_KEY, time.time_ns, DOCUMENT_TIMEOUT)
+
+
+async def aget_generation():
+    return await cache.aget_or_set(GENERATION_KEY, time.time_ns, DOCUMENT_TIMEOUT)
+
+
+def invalidate():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # The next read starts a fresh generation
+        pass
+
+
+def build_document_key(request, date, generation):
+    variant = "|".join(
+        (str(request.version), request.accepted_media_type, request.get_full_path())
+    )
+    digest = hashlib.md5(variant.encode(), usedforsecurity=False).hexdigest()
+    return f"restaurants:menus:variants:{generation}:{date.isoformat()}:{digest}"
+
+
+def get_document_key(request, date):
+    return build_document_key(request, date, get_generation())
+
+
+async def aget_document_key(request, date):
+    return build_document_key(request, date, await aget_generation())
@@ -14,12 +14,35 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+def get_menus_attr(date):
+    return f"menus_for_{date:%Y%m%d}"
+
+
+class RestaurantQuerySet(models.QuerySet):
+    def with_menu_for_date(self, date=None):
+        """
+        Prefetch the menus of a date with their items for all restaurants at
+        once, for get_menu_for_date() to read instead of querying per row.
+        """
+        if not date:
+            date = timezone.now().date()
+        return self.prefetch_related(
+            models.Prefetch(
+                "menus",
+                queryset=Menu.objects.filter(date=date).prefetch_related("items"),
+                to_attr=get_menus_attr(date),
+            )
+        )
+
+
 class Restaurant(TimeStampedModel):
     name = models.CharField(max_length=255, unique=True, db_index=True)
     address = models.TextField()
     contact_phone = models.CharField(max_length=31)
     contact_email = models.EmailField()
 
+    objects = RestaurantQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
 
@@ -32,15 +55,29 @@ class Restaurant(TimeStampedModel):
         """
         if not date:
             date = timezone.now().date()
+        menus = getattr(self, get_menus_attr(date), None)
+        if menus is not None:
+            return menus[0] if menus else None
         return self.menus.filter(date=date).first()
 
 
+class MenuQuerySet(models.QuerySet):
+    def with_details(self):
+        """
+        Load the restaurant and items that menu serializers render, so a list of
+        menus costs two queries however long it is.
+        """
+        return self.select_related("restaurant").prefetch_related("items")
+
+
 class Menu(TimeStampedModel):
     restaurant = models.ForeignKey(
         Restaurant, on_delete=models.CASCADE, related_name="menus"
     )
     date = models.DateField(default=timezone.now, db_index=True)
 
+    objects = MenuQuerySet.as_manager()
+
     class Meta:
         ordering = ["-date"]
         constraints = [
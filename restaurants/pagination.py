@@ -0,0 +1,5 @@
+from config.pagination import KeysetPagination
+
+
+class RestaurantPagination(KeysetPagination):
+    ordering = "name"
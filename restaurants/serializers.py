@@ -1,5 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
 
+from config.compiled import get_read_serializer
 from restaurants.models import Menu, MenuItem, Restaurant
 
 
@@ -20,11 +22,12 @@ class MenuSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         items_data = validated_data.pop("items", [])
-        menu = Menu.objects.create(**validated_data)
-
-        MenuItem.objects.bulk_create(
-            [MenuItem(menu=menu, **item_data) for item_data in items_data]
-        )
+        # One transaction so the menu is never published without its items
+        with transaction.atomic():
+            menu = Menu.objects.create(**validated_data)
+            MenuItem.objects.bulk_create(
+                [MenuItem(menu=menu, **item_data) for item_data in items_data]
+            )
 
         return menu
 
@@ -53,9 +56,11 @@ class RestaurantDetailSerializer(RestaurantSerializer):
 
     class Meta(RestaurantSerializer.Meta):
         fields = RestaurantSerializer.Meta.fields + ("today_menu",)
+        # Read from the menus that the views prefetch with with_menu_for_date()
+        method_field_sources = {"today_menu": ()}
 
     def get_today_menu(self, obj):
         menu = obj.get_menu_for_date()
         if menu:
-            return MenuDetailSerializer(menu).data
+            return get_read_serializer(MenuDetailSerializer, menu).data
         return None
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from restaurants import documents
+from restaurants.models import Menu, MenuItem, Restaurant
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def touch_menu_on_item_change(sender, instance, **kwargs):
+    Menu.objects.filter(pk=instance.menu_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def invalidate_menu_documents(sender, **kwargs):
+    transaction.on_commit(documents.invalidate)
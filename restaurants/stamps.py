@@ -0,0 +1,17 @@
+from django.db.models import Max, Q
+
+from restaurants.models import Restaurant
+
+
+def get_restaurant_stamp(pk, date):
+    """
+    Version stamp of a restaurant together with its menu for a date, or None if
+    the restaurant does not exist.
+    """
+    return (
+        Restaurant.objects.filter(pk=pk)
+        .values_list("updated_at")
+        .annotate(menu_updated_at=Max("menus__updated_at", filter=Q(menus__date=date)))
+        .order_by("pk")
+        .first()
+    )
@@ -2,6 +2,7 @@ import pytest
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from restaurants.models import Restaurant
 from restaurants.tests.factories import MenuFactory, MenuItemFactory, RestaurantFactory
 
 
@@ -29,6 +30,18 @@ class TestRestaurantModel:
         future_date = timezone.now().date() + timezone.timedelta(days=7)
         assert not restaurant.get_menu_for_date(future_date)
 
+    def test_get_menu_for_date_uses_prefetch(self, django_assert_num_queries):
+        restaurant = RestaurantFactory()
+        menu = MenuFactory(restaurant=restaurant)
+        future_date = timezone.now().date() + timezone.timedelta(days=7)
+
+        restaurant = Restaurant.objects.with_menu_for_date().get(pk=restaurant.pk)
+        empty = Restaurant.objects.with_menu_for_date(future_date).get(pk=restaurant.pk)
+
+        with django_assert_num_queries(0):
+            assert restaurant.get_menu_for_date() == menu
+            assert empty.get_menu_for_date(future_date) is None
+
 
 @pytest.mark.django_db
 class TestMenuModel:
@@ -1,11 +1,17 @@
+import gzip
+from unittest.mock import patch
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 
 from authentication.tests.factories import EmployeeFactory
 from restaurants.tests.factories import MenuFactory, MenuItemFactory, RestaurantFactory
+from restaurants.views import AsyncTodayMenuListView
 
 
 @pytest.mark.django_db
@@ -24,6 +30,81 @@ class TestRestaurantListCreateView:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == len(restaurants)
 
+    @pytest.mark.parametrize("restaurants_count", [1, 5])
+    def test_list_restaurants_query_count(
+        self, restaurants_count, django_assert_num_queries
+    ):
+        for restaurant in RestaurantFactory.create_batch(restaurants_count):
+            MenuItemFactory.create_batch(
+                2, menu=MenuFactory(restaurant=restaurant, date=timezone.now().date())
+            )
+        self.client.force_authenticate(user=self.user)
+
+        # Page of restaurants, today's menus and their items; no COUNT(*)
+        with django_assert_num_queries(3):
+            response = self.client.get(self.url, {"cursor": ""})
+
+        results = response.data["results"]
+        assert len(results) == restaurants_count
+        assert all(len(row["today_menu"]["items"]) == 2 for row in results)
+
+    def test_list_restaurants_cursor_pagination(self):
+        names = sorted(
+            restaurant.name for restaurant in RestaurantFactory.create_batch(12)
+        )
+        self.client.force_authenticate(user=self.user)
+
+        first = self.client.get(self.url, {"cursor": ""})
+        second = self.client.get(first.data["next"])
+
+        assert "count" not in first.data
+        assert [row["name"] for row in first.data["results"]] == names[:10]
+        assert [row["name"] for row in second.data["results"]] == names[10:]
+        assert second.data["next"] is None
+
+    def test_list_restaurants_page_number_by_default(self):
+        names = sorted(
+            restaurant.name for restaurant in RestaurantFactory.create_batch(12)
+        )
+        self.client.force_authenticate(user=self.user)
+
+        first = self.client.get(self.url)
+        second = self.client.get(self.url, {"page": 2})
+
+        assert first.data["count"] == 12
+        assert first.data["next"].endswith("?page=2")
+        assert [row["name"] for row in first.data["results"]] == names[:10]
+        assert [row["name"] for row in second.data["results"]] == names[10:]
+
+    def test_list_restaurants_fields(self, django_assert_num_queries):
+        restaurant = RestaurantFactory()
+        MenuFactory(restaurant=restaurant, date=timezone.now().date())
+        self.client.force_authenticate(user=self.user)
+
+        # Names only: no menus are prefetched
+        with django_assert_num_queries(1) as queries:
+            response = self.client.get(self.url, {"fields": "id,name", "cursor": ""})
+
+        assert response.json()["results"] == [
+            {"id": restaurant.id, "name": restaurant.name}
+        ]
+        assert "address" not in queries.captured_queries[0]["sql"]
+
+    def test_list_restaurants_fields_with_today_menu(self, django_assert_num_queries):
+        restaurant = RestaurantFactory()
+        menu = MenuFactory(restaurant=restaurant, date=timezone.now().date())
+        MenuItemFactory(menu=menu)
+        self.client.force_authenticate(user=self.user)
+
+        with django_assert_num_queries(3):
+            response = self.client.get(
+                self.url, {"fields": "name,today_menu", "cursor": ""}
+            )
+
+        row = response.json()["results"][0]
+        assert list(row) == ["name", "today_menu"]
+        assert row["today_menu"]["id"] == menu.id
+
     def test_create_restaurant_as_admin(self):
         self.client.force_authenticate(user=self.admin)
         data = {
@@ -69,6 +150,38 @@ class TestRestaurantDetailView:
         assert response.data["id"] == self.restaurant.id
         assert response.data["name"] == self.restaurant.name
 
+    def test_retrieve_restaurant_fields(self, django_assert_num_queries):
+        self.client.force_authenticate(user=self.user)
+
+        # ETag stamp, then the two columns; today's menu is not read
+        with django_assert_num_queries(2):
+            response = self.client.get(self.url, {"fields": "name,contact_email"})
+
+        assert response.json() == {
+            "name": self.restaurant.name,
+            "contact_email": self.restaurant.contact_email,
+        }
+
+    def test_retrieve_restaurant_not_modified(self, django_assert_num_queries):
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_retrieve_restaurant_etag_changes_after_update(self):
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(self.url)["ETag"]
+
+        self.restaurant.name = "Renamed"
+        self.restaurant.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
     def test_update_restaurant_as_admin(self):
         self.client.force_authenticate(user=self.admin)
         data = {"name": "Updated Restaurant"}
@@ -179,10 +292,21 @@ class TestTodayMenuListView:
         response = self.client.get(self.url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data["results"]) == len(today_menus)
-        for menu_data in response.data["results"]:
+        assert len(response.json()["results"]) == len(today_menus)
+        for menu_data in response.json()["results"]:
             assert menu_data["date"] == timezone.now().date().isoformat()
 
+    @pytest.mark.parametrize("menus_count", [1, 5])
+    def test_list_today_menus_query_count(self, menus_count, django_assert_num_queries):
+        for menu in MenuFactory.create_batch(menus_count, date=timezone.now().date()):
+            MenuItemFactory.create_batch(2, menu=menu)
+
+        # Count, menus with restaurants and their items
+        with django_assert_num_queries(3):
+            response = self.client.get(self.url)
+
+        assert len(response.json()["results"]) == menus_count
+
     def test_list_today_menus_when_empty(self):
         tomorrow = timezone.now().date() + timezone.timedelta(days=1)
         tomorrow_menu = MenuFactory(date=tomorrow)
@@ -191,4 +315,178 @@ class TestTodayMenuListView:
         response = self.client.get(self.url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data["results"]) == 0
+        assert len(response.json()["results"]) == 0
+
+    def test_list_today_menus_not_modified(self, django_assert_num_queries):
+        MenuItemFactory(menu=MenuFactory(date=timezone.now().date()))
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_list_today_menus_etag_changes_after_item_change(
+        self, django_capture_on_commit_callbacks
+    ):
+        item = MenuItemFactory(menu=MenuFactory(date=timezone.now().date()))
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            item.name = "Changed dish"
+            item.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_list_today_menus_fields(self, django_assert_num_queries):
+        menu = MenuFactory(date=timezone.now().date())
+        MenuItemFactory(menu=menu)
+
+        # Count and menus with their restaurants; no items
+        with django_assert_num_queries(2):
+            response = self.client.get(self.url, {"fields": "id,restaurant"})
+
+        assert response.json()["results"] == [
+            {"id": menu.id, "restaurant": menu.restaurant.name}
+        ]
+
+    def test_list_today_menus_expand(self, django_assert_num_queries):
+        item = MenuItemFactory(menu=MenuFactory(date=timezone.now().date()))
+
+        with django_assert_num_queries(3):
+            response = self.client.get(self.url, {"fields": "id", "expand": "items"})
+
+        assert response.json()["results"] == [
+            {
+                "id": item.menu.id,
+                "items": [
+                    {
+                        "id": item.id,
+                        "name": item.name,
+                        "description": item.description,
+                        "price": str(item.price),
+                    }
+                ],
+            }
+        ]
+
+    def test_list_today_menus_unknown_field(self):
+        response = self.client.get(self.url, {"fields": "id,items.calories"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"fields": "Unknown field: items.calories"}
+
+    def test_list_today_menus_served_from_cache(self, django_assert_num_queries):
+        MenuItemFactory(menu=MenuFactory(date=timezone.now().date()))
+        first = self.client.get(self.url)
+
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/json"
+        assert response.content == first.content
+
+    def test_list_today_menus_precompressed(self, django_assert_num_queries):
+        for menu in MenuFactory.create_batch(5, date=timezone.now().date()):
+            MenuItemFactory.create_batch(3, menu=menu)
+        plain = self.client.get(self.url)
+
+        with django_assert_num_queries(0):
+            with patch("config.compression.compress_stored") as compress_stored:
+                response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        compress_stored.assert_not_called()
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert gzip.decompress(response.content) == plain.content
+
+        not_modified = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response["ETag"] == f"W/{plain['ETag']}"
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_list_today_menus_cached_per_version_and_page(self):
+        MenuFactory.create_batch(11, date=timezone.now().date())
+        self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_MOBILE_APP_VERSION="2.0")
+        assert len(response.json()["results"]) == 10
+
+        response = self.client.get(self.url, {"page": 2})
+        assert len(response.json()["results"]) == 1
+
+    def test_list_today_menus_cache_invalidated_on_menu_create(
+        self, django_capture_on_commit_callbacks
+    ):
+        MenuFactory(date=timezone.now().date())
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            MenuFactory(date=timezone.now().date())
+        response = self.client.get(self.url)
+
+        assert len(response.json()["results"]) == 2
+
+    def test_list_today_menus_cache_invalidated_on_item_create(
+        self, django_capture_on_commit_callbacks
+    ):
+        menu = MenuFactory(date=timezone.now().date())
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            MenuItemFactory(menu=menu, name="Fresh dish")
+        response = self.client.get(self.url)
+
+        items = response.json()["results"][0]["items"]
+        assert [item["name"] for item in items] == ["Fresh dish"]
+
+
+@pytest.mark.django_db
+class TestAsyncTodayMenuListView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse("restaurants:today-menu-list")
+        self.user = EmployeeFactory()
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, **extra):
+        request = APIRequestFactory().get(self.url, **extra)
+        force_authenticate(request, user=self.user)
+        response = async_to_sync(AsyncTodayMenuListView.as_view())(request)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def test_list_today_menus_matches_sync_view(self):
+        for menu in MenuFactory.create_batch(11, date=timezone.now().date()):
+            MenuItemFactory(menu=menu)
+
+        for page in (1, 2):
+            response = self.get(data={"page": page})
+            # Render the sync response from scratch rather than the cache
+            cache.clear()
+            expected = self.client.get(self.url, {"page": page})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == expected.content
+
+    def test_list_today_menus_shares_document_cache(self, django_assert_num_queries):
+        MenuItemFactory(menu=MenuFactory(date=timezone.now().date()))
+        expected = self.client.get(self.url)
+
+        with django_assert_num_queries(0):
+            response = self.get()
+
+        assert response.content == expected.content
+
+    def test_list_today_menus_browsable_api(self):
+        MenuFactory(date=timezone.now().date())
+
+        response = self.get(HTTP_ACCEPT="text/html")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/html")
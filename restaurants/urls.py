@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path
 
 from restaurants.views import (
+    AsyncTodayMenuListView,
     MenuCreateView,
     RestaurantDetailView,
     RestaurantListCreateView,
@@ -9,9 +11,13 @@ from restaurants.views import (
 
 app_name = "restaurants"
 
+today_menu_list_view = (
+    AsyncTodayMenuListView if settings.ASYNC_VIEWS else TodayMenuListView
+)
+
 urlpatterns = [
     path("", RestaurantListCreateView.as_view(), name="restaurant-list"),
     path("<int:pk>/", RestaurantDetailView.as_view(), name="restaurant-detail"),
     path("<int:pk>/menu/", MenuCreateView.as_view(), name="menu-create"),
-    path("menu/today/", TodayMenuListView.as_view(), name="today-menu-list"),
+    path("menu/today/", today_menu_list_view.as_view(), name="today-menu-list"),
 ]
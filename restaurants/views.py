@@ -2,7 +2,15 @@ from django.utils import timezone
 from rest_framework import generics
 from rest_framework.exceptions import ValidationError
 
+from config.async_views import AsyncListAPIView
+from config.compiled import CompiledReadMixin
+from config.conditional import AsyncConditionalGetMixin, ConditionalGetMixin
+from config.documents import AsyncDocumentCacheMixin, DocumentCacheMixin
+from config.fieldsets import SparseFieldsMixin
+from config.pagination import AsyncPageNumberPagination
+from restaurants import documents
 from restaurants.models import Menu, Restaurant
+from restaurants.pagination import RestaurantPagination
 from restaurants.permissions import IsAdminOrReadOnly
 from restaurants.serializers import (
     MenuDetailSerializer,
@@ -10,11 +18,35 @@ from restaurants.serializers import (
     RestaurantDetailSerializer,
     RestaurantSerializer,
 )
+from restaurants.stamps import get_restaurant_stamp
 
 
-class RestaurantListCreateView(generics.ListCreateAPIView):
+def load_restaurants(view, queryset):
+    """
+    Load what the restaurant serializer of a read view renders, narrowed to
+    the view's fieldset.
+    """
+    serializer_class = view.get_serializer_class()
+    if view.fieldset is not None:
+        # The keyset pagination reads the name back from the last restaurant
+        queryset = view.fieldset.load(queryset, serializer_class, keep=("name",))
+        if not view.fieldset.includes(serializer_class, "today_menu"):
+            return queryset
+    return queryset.with_menu_for_date()
+
+
+class RestaurantListCreateView(
+    SparseFieldsMixin, CompiledReadMixin, generics.ListCreateAPIView
+):
     queryset = Restaurant.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = RestaurantPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == "GET":
+            queryset = load_restaurants(self, queryset)
+        return queryset
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -22,11 +54,25 @@ class RestaurantListCreateView(generics.ListCreateAPIView):
         return RestaurantDetailSerializer
 
 
-class RestaurantDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RestaurantDetailView(
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    CompiledReadMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantDetailSerializer
     permission_classes = (IsAdminOrReadOnly,)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.fieldset is not None:
+            queryset = load_restaurants(self, queryset)
+        return queryset
+
+    def get_etag_stamp(self):
+        return get_restaurant_stamp(self.kwargs["pk"], timezone.now().date())
+
 
 class MenuCreateView(generics.CreateAPIView):
     serializer_class = MenuSerializer
@@ -40,9 +86,44 @@ class MenuCreateView(generics.CreateAPIView):
         serializer.save(restaurant=restaurant)
 
 
-class TodayMenuListView(generics.ListAPIView):
+class TodayMenuListView(
+    DocumentCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    CompiledReadMixin,
+    generics.ListAPIView,
+):
     serializer_class = MenuDetailSerializer
 
+    def get_etag_stamp(self):
+        return (documents.get_generation(), timezone.now().date())
+
     def get_queryset(self):
-        today = timezone.now().date()
-        return Menu.objects.filter(date=today).select_related("restaurant")
+        queryset = Menu.objects.filter(date=timezone.now().date())
+        if self.fieldset is not None:
+            return self.fieldset.load(queryset, self.get_serializer_class())
+        return queryset.with_details()
+
+    def get_document_key(self, request):
+        if not self.is_document_cacheable(request):
+            return None
+        return documents.get_document_key(request, timezone.now().date())
+
+
+class AsyncTodayMenuListView(
+    AsyncDocumentCacheMixin,
+    AsyncConditionalGetMixin,
+    AsyncListAPIView,
+    TodayMenuListView,
+):
+    """
+    TodayMenuListView for ASGI servers, reading through the async ORM and
+    cache APIs.
+    """
+
+    pagination_class = AsyncPageNumberPagination
+
+    async def aget_document_key(self, request):
+        if not self.is_document_cacheable(request):
+            return None
+        return await documents.aget_document_key(request, timezone.now().date())
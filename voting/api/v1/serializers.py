@@ -1,10 +1,15 @@
 from rest_framework import serializers
 
-from restaurants.models import Menu
+from restaurants.models import Menu, Restaurant
 from voting.models import Vote
+from voting.services import create_vote
 
 
 class VoteSerializerV1(serializers.ModelSerializer):
+    menu = serializers.PrimaryKeyRelatedField(
+        queryset=Menu.objects.select_related("restaurant")
+    )
+
     class Meta:
         model = Vote
         fields = ("id", "menu", "date")
@@ -16,8 +21,7 @@ class VoteSerializerV1(serializers.ModelSerializer):
         return menu
 
     def create(self, validated_data):
-        validated_data["employee"] = self.context["request"].user
-        return super().create(validated_data)
+        return create_vote(self.context["request"].user, validated_data["menu"])
 
 
 class VoteDetailSerializerV1(serializers.ModelSerializer):
@@ -31,8 +35,57 @@ class VoteDetailSerializerV1(serializers.ModelSerializer):
 
 class VotingResultSerializerV1(serializers.Serializer):
     votes_count = serializers.IntegerField()
-    restaurant_name = serializers.SerializerMethodField()
+    restaurant_name = serializers.CharField(source="menu.restaurant.name")
+
+
+class ResultsHistoryQuerySerializerV1(serializers.Serializer):
+    to = serializers.DateField()
+    restaurant = serializers.PrimaryKeyRelatedField(
+        queryset=Restaurant.objects.all(), required=False
+    )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # "from" is a reserved word, so the field cannot be declared as usual
+        fields["from"] = serializers.DateField()
+        return fields
+
+    def validate(self, attrs):
+        if attrs["from"] > attrs["to"]:
+            raise serializers.ValidationError(
+                {"from": "Start date must not be after the end date"}
+            )
+        return attrs
+
+
+class DailyWinnerSerializerV1(serializers.Serializer):
+    date = serializers.DateField()
+    restaurant_id = serializers.IntegerField(source="menu__restaurant")
+    restaurant_name = serializers.CharField(source="menu__restaurant__name")
+    votes_count = serializers.IntegerField()
+
+
+class RestaurantTotalSerializerV1(serializers.Serializer):
+    restaurant_id = serializers.IntegerField(source="restaurant")
+    restaurant_name = serializers.CharField(source="restaurant__name")
+    votes_count = serializers.IntegerField()
+
+
+class ResultsHistorySerializerV1(serializers.Serializer):
+    winners = DailyWinnerSerializerV1(many=True)
+    totals = RestaurantTotalSerializerV1(many=True)
+
+
+class BulkVoteEntrySerializerV1(serializers.Serializer):
+    employee = serializers.IntegerField()
+    menu = serializers.IntegerField()
+
+
+class BulkVoteSerializerV1(serializers.Serializer):
+    votes = BulkVoteEntrySerializerV1(many=True, allow_empty=False, max_length=1000)
+
 
-    def get_restaurant_name(self, obj):
-        menu = Menu.objects.get(id=obj["menu"])
-        return menu.restaurant.name
+class BulkVoteResultSerializerV1(serializers.Serializer):
+    status = serializers.CharField()
+    id = serializers.IntegerField(required=False)
+    detail = serializers.CharField(required=False)
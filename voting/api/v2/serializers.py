@@ -3,9 +3,14 @@ from rest_framework import serializers
 from restaurants.models import Menu
 from restaurants.serializers import MenuDetailSerializer
 from voting.models import Vote
+from voting.services import create_vote
 
 
 class VoteSerializerV2(serializers.ModelSerializer):
+    menu = serializers.PrimaryKeyRelatedField(
+        queryset=Menu.objects.select_related("restaurant").prefetch_related("items")
+    )
+
     class Meta:
         model = Vote
         fields = ("id", "menu", "date")
@@ -17,8 +22,7 @@ class VoteSerializerV2(serializers.ModelSerializer):
         return menu
 
     def create(self, validated_data):
-        validated_data["employee"] = self.context["request"].user
-        return super().create(validated_data)
+        return create_vote(self.context["request"].user, validated_data["menu"])
 
 
 class VoteDetailSerializerV2(serializers.ModelSerializer):
@@ -41,28 +45,17 @@ class VoteDetailSerializerV2(serializers.ModelSerializer):
             "employee_email",
             "employee_name",
         )
+        method_field_sources = {
+            "employee_name": ("employee.first_name", "employee.last_name")
+        }
 
     def get_employee_name(self, obj):
         return obj.employee.get_full_name()
 
 
 class VotingResultSerializerV2(serializers.Serializer):
-    menu_id = serializers.IntegerField(source="menu")
+    menu_id = serializers.IntegerField(source="menu.id")
     votes_count = serializers.IntegerField()
-    menu_details = serializers.SerializerMethodField()
-    restaurant_name = serializers.SerializerMethodField()
-    percentage = serializers.SerializerMethodField()
-
-    def get_menu_details(self, obj):
-        menu = Menu.objects.get(id=obj["menu"])
-        return MenuDetailSerializer(menu).data
-
-    def get_restaurant_name(self, obj):
-        menu = Menu.objects.get(id=obj["menu"])
-        return menu.restaurant.name
-
-    def get_percentage(self, obj):
-        total_votes = sum(item["votes_count"] for item in self.context["results"])
-        if total_votes == 0:
-            return 0
-        return round((obj["votes_count"] / total_votes) * 100, 1)
+    menu_details = MenuDetailSerializer(source="menu")
+    restaurant_name = serializers.CharField(source="menu.restaurant.name")
+    percentage = serializers.FloatField()
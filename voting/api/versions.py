@@ -0,0 +1,47 @@
+"""
+Serializers of the voting views per API version. A new version of a payload
+is a registration here; views without one keep serving the default version.
+"""
+
+from config.versioning import version_registry
+from voting.api.v1.serializers import (
+    BulkVoteResultSerializerV1,
+    BulkVoteSerializerV1,
+    ResultsHistoryQuerySerializerV1,
+    ResultsHistorySerializerV1,
+    VoteDetailSerializerV1,
+    VoteSerializerV1,
+    VotingResultSerializerV1,
+)
+from voting.api.v2.serializers import (
+    VoteDetailSerializerV2,
+    VoteSerializerV2,
+    VotingResultSerializerV2,
+)
+
+version_registry.register(
+    "vote", "1.0", input=VoteSerializerV1, output=VoteDetailSerializerV1
+)
+version_registry.register(
+    "vote",
+    "2.0",
+    input=VoteSerializerV2,
+    output=VoteDetailSerializerV2,
+    # The output nests the menu with its items and the employee
+    select_related=("employee",),
+    prefetch_related=("menu__items",),
+)
+version_registry.register(
+    "bulk-vote",
+    "1.0",
+    input=BulkVoteSerializerV1,
+    output=BulkVoteResultSerializerV1,
+)
+version_registry.register("results", "1.0", results=VotingResultSerializerV1)
+version_registry.register("results", "2.0", results=VotingResultSerializerV2)
+version_registry.register(
+    "results-history",
+    "1.0",
+    input=ResultsHistoryQuerySerializerV1,
+    results=ResultsHistorySerializerV1,
+)
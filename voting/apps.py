@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VotingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "voting"
+
+    def ready(self):
+        from voting import signals  # noqa: F401
+        from voting.api import versions  # noqa: F401
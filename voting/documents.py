@@ -0,0 +1,14 @@
+"""
+Keys of the rendered results of closed voting days in the document cache
+(config.documents).
+
+Once voting closes a day's results only change when close_day() rebuilds the
+snapshot, which touches the day's tally stamp, or when its menus are edited.
+The ETag of the results views covers both, so documents are stored under it
+and a change simply moves readers to a new key.
+"""
+
+
+def get_document_key(etag):
+    digest = etag.strip('"')
+    return f"voting:results:{digest}"
@@ -0,0 +1,163 @@
+"""
+Live vote count events for the results stream.
+
+Every process runs a single fan-out loop that copies incoming events to the
+queue of each subscribed stream. Events reach that loop either straight from
+the process that recorded the vote ("local" backend) or, when several worker
+processes serve the API, through PostgreSQL LISTEN/NOTIFY ("postgres" backend).
+
+Events either carry a menu's new vote count, or ask streams to refresh the
+whole day when individual counts are unknown.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "voting_results"
+SUBSCRIBER_QUEUE_SIZE = 100
+LISTEN_RETRY_DELAY = 1
+LISTEN_MAX_RETRY_DELAY = 60
+
+
+class ResultsBroadcaster:
+    def __init__(self):
+        self.subscribers = set()
+        self.loop = None
+        self.inbox = None
+        self.listener = None
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is loop:
+            return
+        self.loop = loop
+        self.inbox = asyncio.Queue()
+        loop.create_task(self.fan_out())
+        if settings.VOTING_EVENTS_BACKEND == "postgres" and self.listener is None:
+            self.listener = threading.Thread(
+                target=self.listen, name="voting-results-listener", daemon=True
+            )
+            self.listener.start()
+
+    def deliver(self, event):
+        """
+        Hand an event to the fan-out loop. Safe to call from any thread.
+        """
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.inbox.put_nowait, event)
+
+    async def fan_out(self):
+        while True:
+            event = await self.inbox.get()
+            for queue in list(self.subscribers):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Events carry absolute counts, so a slow client only
+                    # skips intermediate values
+                    pass
+
+    async def subscribe(self, timeout=None):
+        """
+        Yield events as they arrive, or None after ``timeout`` seconds of
+        silence so that callers can send keep-alives.
+        """
+        self.start()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.subscribers.discard(queue)
+
+    def listen(self):
+        """
+        Deliver notifications from PostgreSQL, reconnecting with exponential
+        backoff whenever the connection fails. Notifications sent while
+        disconnected are lost, so streams are asked to refresh on reconnect.
+        """
+        delay = LISTEN_RETRY_DELAY
+        reconnecting = False
+        while True:
+            listen_connection = None
+            try:
+                # A connection of its own, outside of any pool: it stays
+                # open for as long as the process listens
+                listen_connection = connection.Database.connect(
+                    **connection.get_connection_params()
+                )
+                listen_connection.autocommit = True
+                with listen_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                if reconnecting:
+                    self.deliver(get_refresh_event(timezone.now().date()))
+                delay = LISTEN_RETRY_DELAY
+                self.receive(listen_connection)
+            except (connection.Database.Error, OSError):
+                logger.exception(
+                    "Voting results listener failed, reconnecting in %s seconds",
+                    delay,
+                )
+            finally:
+                if listen_connection is not None:
+                    try:
+                        listen_connection.close()
+                    except connection.Database.Error:
+                        pass
+            reconnecting = True
+            time.sleep(delay)
+            delay = min(delay * 2, LISTEN_MAX_RETRY_DELAY)
+
+    def receive(self, listen_connection):
+        if not hasattr(listen_connection, "poll"):
+            # psycopg 3
+            while True:
+                for notify in listen_connection.notifies(timeout=5):
+                    self.deliver(json.loads(notify.payload))
+        while True:
+            if select.select([listen_connection], [], [], 5) == ([], [], []):
+                continue
+            listen_connection.poll()
+            while listen_connection.notifies:
+                notify = listen_connection.notifies.pop(0)
+                self.deliver(json.loads(notify.payload))
+
+
+broadcaster = ResultsBroadcaster()
+
+
+def get_refresh_event(date):
+    return {"date": date.isoformat(), "refresh": True}
+
+
+def publish(event):
+    if settings.VOTING_EVENTS_BACKEND == "postgres":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, json.dumps(event)]
+            )
+    else:
+        broadcaster.deliver(event)
+
+
+def publish_vote_count(date, menu_id, votes_count):
+    publish({"date": date.isoformat(), "menu_id": menu_id, "votes_count": votes_count})
+
+
+def publish_refresh(date):
+    publish(get_refresh_event(date))
@@ -0,0 +1,8 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class VoteAlreadyExists(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Vote with this Employee and Date already exists."
+    default_code = "vote_already_exists"
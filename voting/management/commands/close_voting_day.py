@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from voting.results import close_day
+from voting.validators import is_voting_closed
+
+
+class Command(BaseCommand):
+    help = (
+        "Freeze the voting results of a closed day into DailyResult snapshots "
+        "and refresh the restaurant vote rollups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=date.fromisoformat,
+            help="Day to close in YYYY-MM-DD format. Defaults to today.",
+        )
+        parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            help="Also close every day from this date (YYYY-MM-DD) onwards.",
+        )
+
+    def handle(self, *args, **options):
+        day = options["date"] or timezone.now().date()
+        if not is_voting_closed(day):
+            raise CommandError(f"Voting for {day} is still open")
+
+        current = options["since"] or day
+        while current <= day:
+            results = close_day(current)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Closed voting for {current} with {len(results)} results"
+                )
+            )
+            current += timedelta(days=1)
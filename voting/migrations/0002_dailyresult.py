@@ -0,0 +1,56 @@
+# Generated by Django 5.1.6 on 2026-10-18 01:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0001_initial"),
+        ("voting", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("date", models.DateField(db_index=True)),
+                ("votes_count", models.PositiveIntegerField()),
+                ("rank", models.PositiveIntegerField()),
+                ("percentage", models.FloatField()),
+                (
+                    "menu",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_results",
+                        to="restaurants.menu",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date", "rank"],
+                "indexes": [
+                    models.Index(
+                        fields=["date", "rank"], name="voting_dail_date_53ce9a_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("menu", "date"), name="one_result_per_menu_per_day"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.6 on 2026-10-18 01:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0001_initial"),
+        ("voting", "0002_dailyresult"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RestaurantVoteRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week"), ("month", "Month")],
+                        max_length=5,
+                    ),
+                ),
+                ("period_start", models.DateField()),
+                ("votes_count", models.PositiveIntegerField()),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vote_rollups",
+                        to="restaurants.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-period_start"],
+                "indexes": [
+                    models.Index(
+                        fields=["period", "period_start"],
+                        name="voting_rest_period_ed1a01_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("restaurant", "period", "period_start"),
+                        name="one_rollup_per_restaurant_period",
+                    )
+                ],
+            },
+        ),
+    ]
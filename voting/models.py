@@ -3,7 +3,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
-from restaurants.models import Menu
+from restaurants.models import Menu, Restaurant
 from voting.validators import validate_voting_time
 
 
@@ -52,6 +52,76 @@ class Vote(TimeStampedModel):
             raise ValidationError("You can only vote for today's menu")
         validate_voting_time()
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
+    def save(self, *args, validate=True, **kwargs):
+        """
+        Pass validate=False when the caller has already run clean() and relies on
+        the database constraints instead of full_clean()'s extra queries.
+        """
+        if validate:
+            self.full_clean()
         return super().save(*args, **kwargs)
+
+
+class DailyResult(TimeStampedModel):
+    """
+    Snapshot of a menu's final result for a day, filled once voting is closed.
+    """
+
+    menu = models.ForeignKey(
+        Menu, on_delete=models.CASCADE, related_name="daily_results"
+    )
+    date = models.DateField(db_index=True)
+    votes_count = models.PositiveIntegerField()
+    rank = models.PositiveIntegerField()
+    percentage = models.FloatField()
+
+    class Meta:
+        ordering = ["-date", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["menu", "date"], name="one_result_per_menu_per_day"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["date", "rank"]),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.menu} with {self.votes_count} votes"
+
+
+class RestaurantVoteRollup(TimeStampedModel):
+    """
+    Pre-aggregated vote totals of a restaurant over a day, week or month,
+    built from DailyResult snapshots of closed days.
+    """
+
+    class Period(models.TextChoices):
+        DAY = "day", "Day"
+        WEEK = "week", "Week"
+        MONTH = "month", "Month"
+
+    restaurant = models.ForeignKey(
+        Restaurant, on_delete=models.CASCADE, related_name="vote_rollups"
+    )
+    period = models.CharField(max_length=5, choices=Period.choices)
+    period_start = models.DateField()
+    votes_count = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["-period_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["restaurant", "period", "period_start"],
+                name="one_rollup_per_restaurant_period",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["period", "period_start"]),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.restaurant} - {self.votes_count} votes in "
+            f"{self.get_period_display().lower()} of {self.period_start}"
+        )
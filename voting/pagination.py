@@ -0,0 +1,7 @@
+from config.pagination import KeysetPagination
+
+
+class VoteHistoryPagination(KeysetPagination):
+    # An employee has at most one vote per date, so this matches the
+    # (employee, date) index and is unique
+    ordering = "-date"
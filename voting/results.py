@@ -0,0 +1,174 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from restaurants.models import Menu
+from voting import tally
+from voting.models import DailyResult, Vote
+from voting.rollups import update_rollups
+from voting.validators import is_voting_closed
+
+CLOSED_TIMEOUT = 60 * 60 * 24 * 30
+CLOSE_LOCK_TIMEOUT = 60
+
+
+def calculate_percentage(votes_count, total_votes):
+    if total_votes == 0:
+        return 0
+    return round((votes_count / total_votes) * 100, 1)
+
+
+def build_results(menus, counts):
+    """
+    Turn menus and their vote counts into ranked result rows, ordered by votes.
+    Menus without votes are left out; tied menus share a rank.
+    """
+    total_votes = sum(counts.values())
+    results = sorted(
+        (
+            {
+                "menu": menu,
+                "votes_count": counts[menu.id],
+                "percentage": calculate_percentage(counts[menu.id], total_votes),
+            }
+            for menu in menus
+            if counts.get(menu.id)
+        ),
+        key=lambda row: (-row["votes_count"], row["menu"].id),
+    )
+    previous = None
+    for position, row in enumerate(results, start=1):
+        if previous and previous["votes_count"] == row["votes_count"]:
+            row["rank"] = previous["rank"]
+        else:
+            row["rank"] = position
+        previous = row
+    return results
+
+
+def get_menus_for_date(date):
+    return Menu.objects.filter(date=date).with_details()
+
+
+def get_snapshot(date):
+    return (
+        DailyResult.objects.filter(date=date)
+        .select_related("menu__restaurant")
+        .prefetch_related("menu__items")
+        .order_by("rank", "menu_id")
+    )
+
+
+def get_snapshot_row(result):
+    return {
+        "menu": result.menu,
+        "votes_count": result.votes_count,
+        "percentage": result.percentage,
+        "rank": result.rank,
+    }
+
+
+def get_snapshot_results(date):
+    return [get_snapshot_row(result) for result in get_snapshot(date)]
+
+
+def get_tally_results(date):
+    menus = get_menus_for_date(date)
+    counts = tally.get_counts(date, [menu.id for menu in menus])
+    return build_results(menus, counts)
+
+
+def get_closed_key(date):
+    return f"voting:closed:{date.isoformat()}"
+
+
+def get_close_lock_key(date):
+    return f"voting:closing:{date.isoformat()}"
+
+
+def close_on_read(date):
+    """
+    Close a day whose snapshot has not been built yet and return its results.
+    Only one request closes the day at a time; while it does, the others read
+    the tally, which no longer changes once voting is closed.
+    """
+    lock_key = get_close_lock_key(date)
+    if not cache.add(lock_key, True, CLOSE_LOCK_TIMEOUT):
+        return get_tally_results(date)
+    try:
+        close_day(date)
+    finally:
+        cache.delete(lock_key)
+    return get_snapshot_results(date)
+
+
+def get_results_for_date(date):
+    """
+    Build the voting results for a date. Closed days are read from their
+    DailyResult snapshot, which the first read builds when close_day() has not
+    run for the day yet; open days use the cached vote tally. Either way a
+    request then costs two queries (menus with restaurants, and their items)
+    regardless of how many menus received votes.
+    """
+    if is_voting_closed(date):
+        results = get_snapshot_results(date)
+        if results or cache.get(get_closed_key(date)):
+            return results
+        return close_on_read(date)
+    return get_tally_results(date)
+
+
+async def aget_results_for_date(date):
+    """
+    get_results_for_date() through the async ORM.
+    """
+    if is_voting_closed(date):
+        results = [get_snapshot_row(result) async for result in get_snapshot(date)]
+        if results or await cache.aget(get_closed_key(date)):
+            return results
+        return await sync_to_async(close_on_read)(date)
+
+    menus = [menu async for menu in get_menus_for_date(date)]
+    counts = await tally.aget_counts(date, [menu.id for menu in menus])
+    return build_results(menus, counts)
+
+
+def close_day(date):
+    """
+    Freeze the results of a closed voting day into DailyResult rows. Counts are
+    aggregated from the votes themselves, and running it again for the same
+    date replaces the previous snapshot. The restaurant rollups covering the
+    date are refreshed in the same transaction, and the day is marked closed so
+    that reads of a day without votes do not close it again.
+    """
+    counts = dict(
+        Vote.objects.filter(date=date)
+        .values_list("menu")
+        .annotate(Count("id"))
+        .order_by()
+    )
+    results = build_results(Menu.objects.filter(id__in=counts), counts)
+
+    with transaction.atomic():
+        DailyResult.objects.filter(date=date).delete()
+        snapshot = DailyResult.objects.bulk_create(
+            [
+                DailyResult(
+                    menu=row["menu"],
+                    date=date,
+                    votes_count=row["votes_count"],
+                    rank=row["rank"],
+                    percentage=row["percentage"],
+                )
+                for row in results
+            ]
+        )
+        update_rollups(date)
+    transaction.on_commit(lambda: mark_closed(date))
+    return snapshot
+
+
+def mark_closed(date):
+    cache.set(get_closed_key(date), True, CLOSED_TIMEOUT)
+    tally.touch(date)
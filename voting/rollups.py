@@ -0,0 +1,116 @@
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from voting.models import DailyResult, RestaurantVoteRollup
+
+Period = RestaurantVoteRollup.Period
+
+
+def get_period_start(period, date):
+    if period == Period.WEEK:
+        return date - timedelta(days=date.weekday())
+    if period == Period.MONTH:
+        return date.replace(day=1)
+    return date
+
+
+def get_period_end(period, start):
+    if period == Period.WEEK:
+        return start + timedelta(days=6)
+    if period == Period.MONTH:
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+    return start
+
+
+def update_rollups(date):
+    """
+    Refresh the day, week and month rollups containing a date from its
+    DailyResult snapshots. Only the three affected periods are recomputed, so
+    closing a day stays cheap and repeating it is harmless.
+    """
+    with transaction.atomic():
+        for period in Period.values:
+            start = get_period_start(period, date)
+            totals = (
+                DailyResult.objects.filter(
+                    date__range=(start, get_period_end(period, start))
+                )
+                .values("menu__restaurant")
+                .annotate(votes_count=Sum("votes_count"))
+                .order_by()
+            )
+            RestaurantVoteRollup.objects.filter(
+                period=period, period_start=start
+            ).delete()
+            RestaurantVoteRollup.objects.bulk_create(
+                [
+                    RestaurantVoteRollup(
+                        restaurant_id=row["menu__restaurant"],
+                        period=period,
+                        period_start=start,
+                        votes_count=row["votes_count"],
+                    )
+                    for row in totals
+                ]
+            )
+
+
+def can_use_period(period, day, end):
+    period_end = get_period_end(period, day)
+    if get_period_start(period, day) != day or period_end > end:
+        return False
+    if period == Period.WEEK:
+        # Prefer a whole month starting inside this week over the week itself
+        month_start = get_period_start(Period.MONTH, period_end)
+        return month_start <= day or get_period_end(Period.MONTH, month_start) > end
+    return True
+
+
+def split_range(start, end):
+    """
+    Cover the inclusive range with as many whole months as possible, then whole
+    weeks, then single days, returning (period, period_start) pairs.
+    """
+    segments = []
+    day = start
+    while day <= end:
+        period = next(
+            period
+            for period in (Period.MONTH, Period.WEEK, Period.DAY)
+            if can_use_period(period, day, end)
+        )
+        segments.append((period, day))
+        day = get_period_end(period, day) + timedelta(days=1)
+    return segments
+
+
+def get_restaurant_totals(start, end, restaurant=None):
+    segments = [
+        Q(period=period, period_start=period_start)
+        for period, period_start in split_range(start, end)
+    ]
+    if not segments:
+        return RestaurantVoteRollup.objects.none()
+
+    rollups = RestaurantVoteRollup.objects.filter(reduce(or_, segments))
+    if restaurant:
+        rollups = rollups.filter(restaurant=restaurant)
+    return (
+        rollups.values("restaurant", "restaurant__name")
+        .annotate(votes_count=Sum("votes_count"))
+        .order_by("-votes_count", "restaurant__name")
+    )
+
+
+def get_daily_winners(start, end, restaurant=None):
+    winners = DailyResult.objects.filter(date__range=(start, end), rank=1)
+    if restaurant:
+        winners = winners.filter(menu__restaurant=restaurant)
+    return winners.values(
+        "date", "votes_count", "menu__restaurant", "menu__restaurant__name"
+    ).order_by("date", "menu__restaurant__name")
@@ -0,0 +1,224 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from restaurants.models import Menu
+from voting import tally
+from voting.exceptions import VoteAlreadyExists
+from voting.models import Vote
+from voting.validators import validate_voting_time
+
+Employee = get_user_model()
+
+VOTE_CREATED = "created"
+VOTE_DUPLICATE = "duplicate"
+VOTE_INVALID = "invalid"
+
+# Name of the unique constraint on Vote's (employee, date)
+ONE_VOTE_PER_DAY = "one_vote_per_day"
+
+
+def build_vote(employee, menu, date):
+    vote = Vote(employee_id=employee.pk, menu=menu, date=date)
+    if isinstance(employee, Employee):
+        # Spare the detail serializers a query for the employee
+        vote.employee = employee
+    return vote
+
+
+def is_duplicate_vote(error, vote):
+    """
+    Tell whether an IntegrityError raised by saving a vote comes from the
+    one-vote-per-day constraint: by the constraint name that psycopg reports,
+    or by looking the vote up when the driver does not report one.
+    """
+    diag = getattr(error.__cause__, "diag", None)
+    constraint_name = getattr(diag, "constraint_name", None)
+    if constraint_name is not None:
+        return constraint_name == ONE_VOTE_PER_DAY
+    return Vote.objects.filter(employee_id=vote.employee_id, date=vote.date).exists()
+
+
+def create_vote(employee, menu):
+    """
+    Create today's vote of an employee with a single INSERT. The menu is expected
+    to be loaded and checked by the caller; the one-vote-per-day rule is left to
+    the database constraint instead of being pre-checked with a SELECT. Only the
+    employee's pk is used, so a token-backed request user is enough.
+    """
+    vote = build_vote(employee, menu, timezone.now().date())
+    vote.clean()
+    try:
+        with transaction.atomic():
+            vote.save(validate=False)
+    except IntegrityError as error:
+        if is_duplicate_vote(error, vote):
+            raise VoteAlreadyExists()
+        raise
+    return vote
+
+
+UPSERT_VOTE_SQL = """
+    WITH previous AS (
+        SELECT {menu} FROM {table} WHERE {employee} = %s AND {date} = %s
+        FOR UPDATE
+    )
+    INSERT INTO {table} ({employee}, {menu}, {date}, {created_at}, {updated_at})
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT ({employee}, {date}) DO UPDATE
+    SET {menu} = EXCLUDED.{menu}, {updated_at} = EXCLUDED.{updated_at}
+    RETURNING {id}, (xmax = 0), (SELECT {menu} FROM previous)
+"""
+
+
+def get_upsert_vote_sql():
+    quote = connection.ops.quote_name
+    columns = {field.name: quote(field.column) for field in Vote._meta.concrete_fields}
+    return UPSERT_VOTE_SQL.format(table=quote(Vote._meta.db_table), **columns)
+
+
+def change_vote(employee, menu):
+    """
+    Set today's vote of an employee to the given menu with a single
+    INSERT ... ON CONFLICT DO UPDATE, whether or not they have voted already.
+    The existing vote is read with FOR UPDATE, so concurrent changes by the
+    same employee apply one after the other and each moves the tally away
+    from the menu that the previous one left. When two first votes race, the
+    one that ends up updating has no previous menu to move the tally from,
+    and invalidates it instead.
+
+    Returns the vote and whether it was newly created.
+    """
+    now = timezone.now()
+    vote = build_vote(employee, menu, now.date())
+    vote.clean()
+
+    stamp = tally.begin_change(vote.date)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            get_upsert_vote_sql(),
+            [employee.pk, vote.date, employee.pk, menu.pk, vote.date, now, now],
+        )
+        vote.id, created, previous_menu_id = cursor.fetchone()
+    vote._state.adding = False
+
+    def update_tally():
+        if created:
+            tally.add_vote(vote.date, menu.pk, stamp=stamp)
+        elif previous_menu_id is None:
+            tally.invalidate(vote.date)
+        elif previous_menu_id != menu.pk:
+            tally.add_votes(vote.date, {previous_menu_id: -1, menu.pk: 1}, stamp)
+        else:
+            # Only the stamp moved; the counts are still up to date
+            tally.add_votes(vote.date, {}, stamp)
+
+    transaction.on_commit(update_tally)
+    return vote, created
+
+
+def create_votes_in_bulk(entries, date):
+    """
+    Create many votes for a date at once, e.g. votes replayed by an offline
+    kiosk. Menus, employees and existing votes are validated with one query
+    each and the accepted votes are inserted with a single bulk_create.
+
+    The votes count as cast when the batch is received: the voting window is
+    checked once for the whole batch, which is accepted or refused as a unit.
+
+    Returns one status dict per entry, in the order the entries were given.
+    """
+    validate_voting_time()
+
+    menu_ids = set(
+        Menu.objects.filter(
+            id__in={entry["menu"] for entry in entries}, date=date
+        ).values_list("id", flat=True)
+    )
+    employee_ids = set(
+        Employee.objects.filter(
+            id__in={entry["employee"] for entry in entries}, is_active=True
+        ).values_list("id", flat=True)
+    )
+    voted_employee_ids = set(
+        Vote.objects.filter(date=date, employee_id__in=employee_ids).values_list(
+            "employee_id", flat=True
+        )
+    )
+    statuses, votes = validate_entries(
+        entries, date, menu_ids, employee_ids, voted_employee_ids
+    )
+    stamp = tally.begin_change(date)
+    try:
+        with transaction.atomic():
+            Vote.objects.bulk_create(votes.values())
+    except IntegrityError:
+        # Votes landed concurrently for some of the employees; insert one by
+        # one so that only their entries are refused
+        votes = insert_votes(votes, statuses)
+
+    for index, vote in votes.items():
+        statuses[index] = {"status": VOTE_CREATED, "id": vote.id}
+
+    menu_counts = Counter(vote.menu_id for vote in votes.values())
+    transaction.on_commit(lambda: tally.add_votes(date, menu_counts, stamp))
+    return statuses
+
+
+def insert_votes(votes, statuses):
+    """
+    Insert votes one at a time, recording the status of the ones that the
+    database refuses. Returns the inserted votes.
+    """
+    inserted = {}
+    for index, vote in votes.items():
+        try:
+            with transaction.atomic():
+                Vote.objects.bulk_create([vote])
+        except IntegrityError as error:
+            if is_duplicate_vote(error, vote):
+                statuses[index] = get_duplicate_status()
+            else:
+                statuses[index] = {
+                    "status": VOTE_INVALID,
+                    "detail": "Menu or employee no longer exists",
+                }
+        else:
+            inserted[index] = vote
+    return inserted
+
+
+def get_duplicate_status():
+    return {
+        "status": VOTE_DUPLICATE,
+        "detail": "Vote with this Employee and Date already exists.",
+    }
+
+
+def validate_entries(entries, date, menu_ids, employee_ids, voted_employee_ids):
+    statuses = [None] * len(entries)
+    votes = {}
+    voted_employee_ids = set(voted_employee_ids)
+
+    for index, entry in enumerate(entries):
+        if entry["menu"] not in menu_ids:
+            statuses[index] = {
+                "status": VOTE_INVALID,
+                "detail": "You can only vote for today's menu",
+            }
+        elif entry["employee"] not in employee_ids:
+            statuses[index] = {
+                "status": VOTE_INVALID,
+                "detail": "Employee does not exist or is inactive",
+            }
+        elif entry["employee"] in voted_employee_ids:
+            statuses[index] = get_duplicate_status()
+        else:
+            voted_employee_ids.add(entry["employee"])
+            votes[index] = Vote(
+                employee_id=entry["employee"], menu_id=entry["menu"], date=date
+            )
+
+    return statuses, votes
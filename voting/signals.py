@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from voting import tally
+from voting.models import Vote
+
+
+@receiver(pre_save, sender=Vote)
+def begin_tally_change_on_vote_save(sender, instance, **kwargs):
+    # Updates invalidate the tally instead, so they need no stamp
+    if instance._state.adding:
+        instance._tally_stamp = tally.begin_change(instance.date)
+
+
+@receiver(pre_delete, sender=Vote)
+def begin_tally_change_on_vote_delete(sender, instance, **kwargs):
+    instance._tally_stamp = tally.begin_change(instance.date)
+
+
+@receiver(post_save, sender=Vote)
+def update_tally_on_vote_save(sender, instance, created, **kwargs):
+    if created:
+        stamp = instance._tally_stamp
+        transaction.on_commit(
+            lambda: tally.add_vote(instance.date, instance.menu_id, stamp=stamp)
+        )
+    else:
+        transaction.on_commit(lambda: tally.invalidate(instance.date))
+
+
+@receiver(post_delete, sender=Vote)
+def update_tally_on_vote_delete(sender, instance, **kwargs):
+    stamp = instance._tally_stamp
+    transaction.on_commit(
+        lambda: tally.add_vote(instance.date, instance.menu_id, delta=-1, stamp=stamp)
+    )
@@ -0,0 +1,202 @@
+"""
+Per-day vote tally kept in Django's cache framework.
+
+Each menu's vote count for a date lives under its own key so that new votes can
+be applied with an atomic ``incr``. Every vote change also increments the
+date's stamp, once before it is written and once after it has committed, and a
+marker key per date holds the stamp that the counts are up to date with. The
+tally is rebuilt from the database with a single aggregation whenever the
+marker lags behind the stamp or a menu's count is missing (cold cache,
+eviction or restart), so evicting any single key never resets a count.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from voting.events import publish_refresh, publish_vote_count
+from voting.models import Vote
+
+TALLY_TIMEOUT = 60 * 60 * 24 * 2
+
+
+def get_day_key(date):
+    return f"voting:tally:{date.isoformat()}"
+
+
+def get_menu_key(date, menu_id):
+    return f"voting:tally:{date.isoformat()}:{menu_id}"
+
+
+def get_stamp_key(date):
+    return f"voting:stamp:{date.isoformat()}"
+
+
+def get_stamp(date):
+    """
+    Version stamp of a date's results, changed by every vote change. A missing
+    stamp restarts from the current time so it never repeats an older value.
+    """
+    return cache.get_or_set(get_stamp_key(date), time.time_ns, TALLY_TIMEOUT)
+
+
+def touch(date):
+    try:
+        cache.incr(get_stamp_key(date))
+    except ValueError:
+        # The next read starts a fresh stamp
+        pass
+
+
+def get_votes_by_menu(date):
+    return (
+        Vote.objects.filter(date=date)
+        .values_list("menu")
+        .annotate(Count("id"))
+        .order_by()
+    )
+
+
+def get_tally_values(date, menu_ids, counts, stamp):
+    values = {
+        get_menu_key(date, menu_id): counts.get(menu_id, 0)
+        for menu_id in set(menu_ids) | set(counts)
+    }
+    values[get_day_key(date)] = stamp
+    return values
+
+
+def rebuild(date, menu_ids=()):
+    """
+    Aggregate a date's counts from the database and cache them, unless a vote
+    changed while aggregating: the counts may miss that vote, so they are left
+    for the next read to rebuild.
+    """
+    stamp = get_stamp(date)
+    counts = dict(get_votes_by_menu(date))
+    if cache.get(get_stamp_key(date)) == stamp:
+        cache.set_many(get_tally_values(date, menu_ids, counts, stamp), TALLY_TIMEOUT)
+    return counts
+
+
+async def arebuild(date, menu_ids=()):
+    stamp_key = get_stamp_key(date)
+    stamp = await cache.aget_or_set(stamp_key, time.time_ns, TALLY_TIMEOUT)
+    counts = {menu_id: count async for menu_id, count in get_votes_by_menu(date)}
+    if await cache.aget(stamp_key) == stamp:
+        await cache.aset_many(
+            get_tally_values(date, menu_ids, counts, stamp), TALLY_TIMEOUT
+        )
+    return counts
+
+
+def get_count_keys(date, menu_ids):
+    keys = {get_menu_key(date, menu_id): menu_id for menu_id in menu_ids}
+    return [get_day_key(date), get_stamp_key(date), *keys], keys
+
+
+def read_counts(date, menu_keys, values):
+    """
+    Return the cached counts by menu id, or None when the tally has to be
+    rebuilt.
+    """
+    marker = values.get(get_day_key(date))
+    if (
+        marker is None
+        or marker != values.get(get_stamp_key(date))
+        or any(key not in values for key in menu_keys)
+    ):
+        return None
+    return {menu_id: values[key] for key, menu_id in menu_keys.items()}
+
+
+def get_counts(date, menu_ids):
+    """
+    Return a mapping of menu id to vote count for the given menus on a date.
+    """
+    keys, menu_keys = get_count_keys(date, menu_ids)
+    counts = read_counts(date, menu_keys, cache.get_many(keys))
+    if counts is None:
+        counts = rebuild(date, menu_ids)
+        return {menu_id: counts.get(menu_id, 0) for menu_id in menu_ids}
+    return counts
+
+
+async def aget_counts(date, menu_ids):
+    """
+    get_counts() through the async cache and ORM APIs.
+    """
+    keys, menu_keys = get_count_keys(date, menu_ids)
+    counts = read_counts(date, menu_keys, await cache.aget_many(keys))
+    if counts is None:
+        counts = await arebuild(date, menu_ids)
+        return {menu_id: counts.get(menu_id, 0) for menu_id in menu_ids}
+    return counts
+
+
+def begin_change(date):
+    """
+    Increment a date's stamp before a vote change is written, and return the
+    stamp it held; pass it to add_votes() once the change has committed.
+    Counts aggregated after this may already include the change, and their
+    marker can then no longer match the returned stamp.
+    """
+    try:
+        return cache.incr(get_stamp_key(date)) - 1
+    except ValueError:
+        # The next read starts a fresh stamp and rebuilds
+        return None
+
+
+def add_votes(date, deltas, stamp=None):
+    """
+    Apply a committed vote change, given as count deltas by menu id, to a built
+    tally and publish the menus' new counts to the live results stream.
+
+    The counts are only changed when they are up to date with the stamp that
+    begin_change() returned, i.e. were aggregated before the change was
+    written, and no other change moved the stamp since; otherwise they are
+    left behind for the next read to rebuild, and the published counts are
+    read from the database.
+    """
+    try:
+        new_stamp = cache.incr(get_stamp_key(date))
+    except ValueError:
+        # The next read starts a fresh stamp and rebuilds
+        new_stamp = None
+    day_key = get_day_key(date)
+    votes_counts = {}
+    if stamp is not None and new_stamp == stamp + 2 and cache.get(day_key) == stamp:
+        try:
+            for menu_id, delta in deltas.items():
+                votes_counts[menu_id] = cache.incr(get_menu_key(date, menu_id), delta)
+        except ValueError:
+            # A menu's count was evicted, or never built
+            pass
+        else:
+            cache.set(day_key, new_stamp, TALLY_TIMEOUT)
+    for menu_id in deltas:
+        if menu_id not in votes_counts:
+            votes_counts[menu_id] = Vote.objects.filter(
+                date=date, menu_id=menu_id
+            ).count()
+        publish_vote_count(date, menu_id, votes_counts[menu_id])
+    return votes_counts
+
+
+def add_vote(date, menu_id, delta=1, stamp=None):
+    """
+    add_votes() for a single menu; returns its new count.
+    """
+    return add_votes(date, {menu_id: delta}, stamp)[menu_id]
+
+
+def invalidate(date):
+    """
+    Drop a date's tally after changes that cannot be applied as increments,
+    and ask live results streams to refresh.
+    """
+    cache.delete(get_day_key(date))
+    touch(date)
+    publish_refresh(date)
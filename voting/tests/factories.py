@@ -3,7 +3,7 @@ from django.utils import timezone
 
 from authentication.tests.factories import EmployeeFactory
 from restaurants.tests.factories import MenuFactory
-from voting.models import Vote
+from voting.models import DailyResult, Vote
 
 
 class VoteFactory(factory.django.DjangoModelFactory):
@@ -14,3 +14,14 @@ class VoteFactory(factory.django.DjangoModelFactory):
     employee = factory.SubFactory(EmployeeFactory)
     menu = factory.SubFactory(MenuFactory)
     date = factory.LazyFunction(lambda: timezone.now().date())
+
+
+class DailyResultFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = DailyResult
+
+    menu = factory.SubFactory(MenuFactory)
+    date = factory.SelfAttribute("menu.date")
+    votes_count = 1
+    rank = 1
+    percentage = 100.0
@@ -0,0 +1,59 @@
+from datetime import datetime, time
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from restaurants.tests.factories import MenuFactory
+from voting.models import DailyResult, RestaurantVoteRollup
+from voting.tests.factories import VoteFactory
+
+
+@pytest.mark.django_db
+class TestCloseVotingDayCommand:
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+        self.menu = MenuFactory(date=self.today)
+        VoteFactory.create_batch(2, menu=self.menu)
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_close_today_after_deadline(self):
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 0))
+        out = StringIO()
+
+        call_command("close_voting_day", stdout=out)
+
+        assert f"Closed voting for {self.today} with 1 results" in out.getvalue()
+        assert DailyResult.objects.get(date=self.today).votes_count == 2
+
+    def test_close_today_before_deadline(self):
+        with pytest.raises(CommandError, match="is still open"):
+            call_command("close_voting_day")
+
+        assert not DailyResult.objects.exists()
+
+    def test_close_past_date(self):
+        yesterday = self.today - timezone.timedelta(days=1)
+
+        call_command("close_voting_day", "--date", yesterday.isoformat())
+
+        assert not DailyResult.objects.filter(date=yesterday).exists()
+
+    def test_close_since_date(self):
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 0))
+        since = self.today - timezone.timedelta(days=2)
+        out = StringIO()
+
+        call_command("close_voting_day", "--since", since.isoformat(), stdout=out)
+
+        assert out.getvalue().count("Closed voting for") == 3
+        assert RestaurantVoteRollup.objects.filter(
+            restaurant=self.menu.restaurant, period_start=self.today
+        ).exists()
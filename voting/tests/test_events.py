@@ -0,0 +1,198 @@
+import asyncio
+from datetime import datetime, time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.tests.factories import EmployeeFactory
+from restaurants.tests.factories import MenuFactory
+from voting import tally
+from voting.events import ResultsBroadcaster, broadcaster, publish_vote_count
+from voting.tests.factories import VoteFactory
+from voting.views import TodayResultsStreamView
+
+
+def test_broadcaster_fans_out_to_all_subscribers():
+    async def receive():
+        results_broadcaster = ResultsBroadcaster()
+        first = results_broadcaster.subscribe()
+        second = results_broadcaster.subscribe()
+        first_event = asyncio.ensure_future(anext(first))
+        second_event = asyncio.ensure_future(anext(second))
+        await asyncio.sleep(0)
+
+        results_broadcaster.deliver({"menu_id": 1, "votes_count": 3})
+        events = await first_event, await second_event
+        await first.aclose()
+        await second.aclose()
+        return events, results_broadcaster.subscribers
+
+    events, subscribers = asyncio.run(receive())
+
+    assert events == ({"menu_id": 1, "votes_count": 3},) * 2
+    assert subscribers == set()
+
+
+def test_broadcaster_subscription_times_out():
+    async def receive():
+        subscription = ResultsBroadcaster().subscribe(timeout=0.01)
+        event = await anext(subscription)
+        await subscription.aclose()
+        return event
+
+    assert asyncio.run(receive()) is None
+
+
+def test_listener_reconnects_after_connection_errors(caplog):
+    results_broadcaster = ResultsBroadcaster()
+    listen_connection = MagicMock()
+    listen_connection.poll.side_effect = connection.Database.OperationalError
+    error = connection.Database.OperationalError("connection refused")
+
+    with (
+        patch.object(
+            connection.Database,
+            "connect",
+            side_effect=[error, listen_connection],
+        ),
+        patch("voting.events.select.select", return_value=([listen_connection],)),
+        patch("voting.events.time.sleep", side_effect=[None, StopIteration]),
+        patch.object(results_broadcaster, "deliver") as deliver,
+        pytest.raises(StopIteration),
+    ):
+        results_broadcaster.listen()
+
+    deliver.assert_called_once_with(
+        {"date": timezone.now().date().isoformat(), "refresh": True}
+    )
+    listen_connection.close.assert_called_once()
+    assert [record.message for record in caplog.records] == [
+        "Voting results listener failed, reconnecting in 1 seconds",
+        "Voting results listener failed, reconnecting in 1 seconds",
+    ]
+
+
+@pytest.mark.django_db
+def test_publish_vote_count_through_postgres():
+    with override_settings(VOTING_EVENTS_BACKEND="postgres"):
+        with CaptureQueriesContext(connection) as queries:
+            publish_vote_count(timezone.now().date(), 1, 3)
+
+    assert "pg_notify" in queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_tally_publishes_vote_counts():
+    menu = MenuFactory()
+    tally.get_counts(menu.date, [menu.id])
+    stamp = tally.begin_change(menu.date)
+
+    with patch("voting.tally.publish_vote_count") as publish:
+        tally.add_vote(menu.date, menu.id, stamp=stamp)
+
+    publish.assert_called_once_with(menu.date, menu.id, 1)
+
+
+@pytest.mark.django_db
+class TestTodayResultsStreamView:
+    def setup_method(self):
+        self.url = reverse("voting:today-results-stream")
+        self.employee = EmployeeFactory()
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+        self.menu = MenuFactory(date=self.today)
+        VoteFactory.create_batch(2, menu=self.menu)
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def open_stream(self):
+        token = RefreshToken.for_user(self.employee).access_token
+        request = AsyncRequestFactory().get(
+            self.url, headers={"authorization": f"Bearer {token}"}
+        )
+        return TodayResultsStreamView.as_view()(request)
+
+    def test_stream_requires_authentication(self):
+        response = APIClient().get(self.url)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_stream_sends_snapshot_and_votes(self):
+        async def receive():
+            response = await self.open_stream()
+            content = aiter(response.streaming_content)
+            snapshot = await anext(content)
+            next_event = asyncio.ensure_future(anext(content))
+            await asyncio.sleep(0.01)
+
+            broadcaster.deliver(
+                {
+                    "date": self.today.isoformat(),
+                    "menu_id": self.menu.id,
+                    "votes_count": 3,
+                }
+            )
+            vote = await next_event
+            await content.aclose()
+            return response, snapshot, vote
+
+        response, snapshot, vote = async_to_sync(receive)()
+
+        assert response["Content-Type"] == "text/event-stream"
+        assert (
+            snapshot
+            == (
+                f'event: snapshot\ndata: [{{"menu_id": {self.menu.id}, '
+                f'"votes_count": 2}}]\n\n'
+            ).encode()
+        )
+        assert (
+            vote
+            == (
+                f'event: vote\ndata: {{"date": "{self.today.isoformat()}", '
+                f'"menu_id": {self.menu.id}, "votes_count": 3}}\n\n'
+            ).encode()
+        )
+
+    def test_stream_sends_snapshot_on_refresh(self):
+        async def receive():
+            response = await self.open_stream()
+            content = aiter(response.streaming_content)
+            await anext(content)
+            next_event = asyncio.ensure_future(anext(content))
+            await asyncio.sleep(0.01)
+
+            await sync_to_async(VoteFactory)(menu=self.menu)
+            await sync_to_async(tally.invalidate)(self.today)
+            snapshot = await next_event
+            await content.aclose()
+            return snapshot
+
+        snapshot = async_to_sync(receive)()
+
+        assert snapshot.startswith(b"event: snapshot")
+        assert b'"votes_count": 3' in snapshot
+
+    def test_stream_closes_after_voting_deadline(self):
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 0))
+
+        async def receive():
+            response = await self.open_stream()
+            return [chunk async for chunk in response.streaming_content]
+
+        events = async_to_sync(receive)()
+
+        assert len(events) == 2
+        assert events[1].startswith(b"event: closed")
@@ -3,10 +3,12 @@ from unittest.mock import patch
 
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.utils import timezone
 
 from authentication.tests.factories import EmployeeFactory
 from restaurants.tests.factories import MenuFactory
+from voting.models import DailyResult, RestaurantVoteRollup
 from voting.tests.factories import VoteFactory
 
 
@@ -65,3 +67,37 @@ class TestVoteModel:
         with pytest.raises(ValidationError) as exc_info:
             VoteFactory()
         assert "Voting is only allowed before 11:00 AM" in str(exc_info.value)
+
+
+@pytest.mark.django_db
+class TestDailyResultModel:
+    def test_daily_result_str(self):
+        menu = MenuFactory()
+        result = DailyResult.objects.create(
+            menu=menu, date=menu.date, votes_count=4, rank=1, percentage=80.0
+        )
+        assert str(result) == f"#1 {menu} with 4 votes"
+
+    def test_one_result_per_menu_per_day_constraint(self):
+        menu = MenuFactory()
+        DailyResult.objects.create(
+            menu=menu, date=menu.date, votes_count=4, rank=1, percentage=80.0
+        )
+
+        with pytest.raises(IntegrityError):
+            DailyResult.objects.create(
+                menu=menu, date=menu.date, votes_count=1, rank=2, percentage=20.0
+            )
+
+
+@pytest.mark.django_db
+class TestRestaurantVoteRollupModel:
+    def test_rollup_str(self):
+        menu = MenuFactory()
+        rollup = RestaurantVoteRollup.objects.create(
+            restaurant=menu.restaurant,
+            period=RestaurantVoteRollup.Period.WEEK,
+            period_start=menu.date,
+            votes_count=12,
+        )
+        assert str(rollup) == (f"{menu.restaurant} - 12 votes in week of {menu.date}")
@@ -0,0 +1,212 @@
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from restaurants.tests.factories import MenuFactory, MenuItemFactory
+from voting.models import DailyResult
+from voting.results import (
+    aget_results_for_date,
+    build_results,
+    calculate_percentage,
+    close_day,
+    get_close_lock_key,
+    get_results_for_date,
+)
+from voting.tests.factories import VoteFactory
+
+
+def test_calculate_percentage():
+    assert calculate_percentage(1, 3) == 33.3
+    assert calculate_percentage(2, 2) == 100.0
+
+
+def test_calculate_percentage_zero_total_votes():
+    assert calculate_percentage(0, 0) == 0
+
+
+@pytest.mark.django_db
+def test_build_results_tied_menus_share_rank():
+    menu1, menu2, menu3 = MenuFactory.create_batch(3)
+    counts = {menu1.id: 2, menu2.id: 5, menu3.id: 2}
+
+    results = build_results([menu1, menu2, menu3], counts)
+
+    assert [row["menu"] for row in results] == [menu2, menu1, menu3]
+    assert [row["rank"] for row in results] == [1, 2, 2]
+
+
+@pytest.mark.django_db
+class TestGetResultsForDate:
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        mock_time = datetime.combine(timezone.now().date(), time(10, 0))
+        self.mock_localtime.return_value = mock_time
+        self.today = timezone.now().date()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def create_voted_menus(self, count):
+        for votes in range(1, count + 1):
+            menu = MenuFactory(date=self.today)
+            MenuItemFactory.create_batch(2, menu=menu)
+            VoteFactory.create_batch(votes, menu=menu)
+
+    def test_results_ordered_by_votes(self):
+        menu1 = MenuFactory(date=self.today)
+        menu2 = MenuFactory(date=self.today)
+        VoteFactory.create_batch(1, menu=menu1)
+        VoteFactory.create_batch(3, menu=menu2)
+
+        results = get_results_for_date(self.today)
+
+        assert [row["menu"] for row in results] == [menu2, menu1]
+        assert [row["votes_count"] for row in results] == [3, 1]
+        assert [row["percentage"] for row in results] == [75.0, 25.0]
+
+    def test_results_empty(self):
+        MenuFactory(date=self.today)
+
+        assert get_results_for_date(self.today) == []
+
+    def test_results_load_menu_details(self):
+        self.create_voted_menus(2)
+        results = get_results_for_date(self.today)
+
+        with CaptureQueriesContext(connection) as queries:
+            for row in results:
+                row["menu"].restaurant.name
+                list(row["menu"].items.all())
+
+        assert len(queries) == 0
+
+    def test_query_count_does_not_grow_with_menus(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            self.create_voted_menus(2)
+        with CaptureQueriesContext(connection) as cold_tally:
+            get_results_for_date(self.today)
+        with CaptureQueriesContext(connection) as few_menus:
+            get_results_for_date(self.today)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.create_voted_menus(6)
+        # Menus that are new to the tally join it with one rebuild
+        get_results_for_date(self.today)
+        with CaptureQueriesContext(connection) as many_menus:
+            results = get_results_for_date(self.today)
+
+        assert len(results) == 8
+        assert len(cold_tally) == 3
+        assert len(few_menus) == len(many_menus) == 2
+
+    def test_warm_results_skip_vote_aggregation(self):
+        self.create_voted_menus(2)
+        get_results_for_date(self.today)
+
+        with CaptureQueriesContext(connection) as queries:
+            get_results_for_date(self.today)
+
+        assert not any("GROUP BY" in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+class TestCloseDay:
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+        self.menu1 = MenuFactory(date=self.today)
+        self.menu2 = MenuFactory(date=self.today)
+        MenuItemFactory(menu=self.menu1)
+        VoteFactory.create_batch(3, menu=self.menu1)
+        VoteFactory(menu=self.menu2)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 30))
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_close_day_creates_snapshot(self):
+        close_day(self.today)
+
+        snapshot = DailyResult.objects.filter(date=self.today).order_by("rank")
+        assert [result.menu for result in snapshot] == [self.menu1, self.menu2]
+        assert [result.votes_count for result in snapshot] == [3, 1]
+        assert [result.percentage for result in snapshot] == [75.0, 25.0]
+        assert [result.rank for result in snapshot] == [1, 2]
+
+    def test_close_day_replaces_previous_snapshot(self):
+        close_day(self.today)
+        close_day(self.today)
+
+        assert DailyResult.objects.filter(date=self.today).count() == 2
+
+    def test_closed_day_results_read_from_snapshot(self):
+        close_day(self.today)
+
+        with CaptureQueriesContext(connection) as queries:
+            results = get_results_for_date(self.today)
+
+        assert [row["menu"] for row in results] == [self.menu1, self.menu2]
+        assert [row["votes_count"] for row in results] == [3, 1]
+        assert len(queries) == 2
+        assert not any("voting_vote" in query["sql"] for query in queries)
+
+    def test_closed_day_without_snapshot_is_not_recomputed(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            results = get_results_for_date(self.today)
+
+        assert [row["votes_count"] for row in results] == [3, 1]
+        assert DailyResult.objects.filter(date=self.today).count() == 2
+
+        with CaptureQueriesContext(connection) as queries:
+            assert get_results_for_date(self.today) == results
+
+        assert not any("voting_vote" in query["sql"] for query in queries)
+
+    def test_closed_day_without_votes_is_closed_once(
+        self, django_capture_on_commit_callbacks
+    ):
+        yesterday = self.today - timedelta(days=1)
+        with django_capture_on_commit_callbacks(execute=True):
+            assert get_results_for_date(yesterday) == []
+
+        with CaptureQueriesContext(connection) as queries:
+            assert get_results_for_date(yesterday) == []
+
+        assert len(queries) == 1
+        assert not any("voting_vote" in query["sql"] for query in queries)
+
+    def test_closed_day_being_closed_is_read_from_tally(self):
+        cache.add(get_close_lock_key(self.today), True)
+
+        results = get_results_for_date(self.today)
+
+        assert [row["votes_count"] for row in results] == [3, 1]
+        assert not DailyResult.objects.filter(date=self.today).exists()
+
+    def test_async_closed_day_without_snapshot_is_closed(self):
+        results = async_to_sync(aget_results_for_date)(self.today)
+
+        assert [row["votes_count"] for row in results] == [3, 1]
+        assert DailyResult.objects.filter(date=self.today).count() == 2
+
+    def test_open_day_ignores_snapshot(self):
+        close_day(self.today)
+        DailyResult.objects.filter(menu=self.menu1).update(votes_count=0)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 30))
+
+        results = get_results_for_date(self.today)
+
+        assert results[0]["votes_count"] == 3
@@ -0,0 +1,134 @@
+from datetime import date
+
+import pytest
+
+from restaurants.tests.factories import MenuFactory, RestaurantFactory
+from voting.models import RestaurantVoteRollup
+from voting.rollups import (
+    get_daily_winners,
+    get_period_end,
+    get_restaurant_totals,
+    split_range,
+    update_rollups,
+)
+from voting.tests.factories import DailyResultFactory
+
+Period = RestaurantVoteRollup.Period
+
+
+def test_get_period_end():
+    assert get_period_end(Period.DAY, date(2024, 2, 10)) == date(2024, 2, 10)
+    assert get_period_end(Period.WEEK, date(2024, 2, 5)) == date(2024, 2, 11)
+    assert get_period_end(Period.MONTH, date(2024, 2, 1)) == date(2024, 2, 29)
+    assert get_period_end(Period.MONTH, date(2024, 12, 1)) == date(2024, 12, 31)
+
+
+def test_split_range_uses_largest_periods():
+    segments = split_range(date(2024, 1, 27), date(2024, 3, 13))
+
+    assert segments == [
+        (Period.DAY, date(2024, 1, 27)),
+        (Period.DAY, date(2024, 1, 28)),
+        (Period.DAY, date(2024, 1, 29)),
+        (Period.DAY, date(2024, 1, 30)),
+        (Period.DAY, date(2024, 1, 31)),
+        (Period.MONTH, date(2024, 2, 1)),
+        (Period.DAY, date(2024, 3, 1)),
+        (Period.DAY, date(2024, 3, 2)),
+        (Period.DAY, date(2024, 3, 3)),
+        (Period.WEEK, date(2024, 3, 4)),
+        (Period.DAY, date(2024, 3, 11)),
+        (Period.DAY, date(2024, 3, 12)),
+        (Period.DAY, date(2024, 3, 13)),
+    ]
+
+
+def test_split_range_one_year():
+    assert len(split_range(date(2023, 1, 1), date(2023, 12, 31))) == 12
+    assert len(split_range(date(2023, 1, 2), date(2023, 12, 31))) == 17
+
+
+def test_split_range_empty():
+    assert split_range(date(2024, 2, 2), date(2024, 2, 1)) == []
+
+
+@pytest.mark.django_db
+class TestRollups:
+    def setup_method(self):
+        self.restaurant1 = RestaurantFactory()
+        self.restaurant2 = RestaurantFactory()
+
+    def close(self, day, votes):
+        for restaurant, votes_count in zip((self.restaurant1, self.restaurant2), votes):
+            DailyResultFactory(
+                menu=MenuFactory(restaurant=restaurant, date=day),
+                votes_count=votes_count,
+                rank=1 if votes_count == max(votes) else 2,
+            )
+        update_rollups(day)
+
+    def test_update_rollups_creates_every_period(self):
+        self.close(date(2024, 2, 14), (3, 1))
+
+        rollups = RestaurantVoteRollup.objects.filter(restaurant=self.restaurant1)
+        assert {(rollup.period, rollup.period_start) for rollup in rollups} == {
+            (Period.DAY, date(2024, 2, 14)),
+            (Period.WEEK, date(2024, 2, 12)),
+            (Period.MONTH, date(2024, 2, 1)),
+        }
+
+    def test_update_rollups_accumulates_period_totals(self):
+        self.close(date(2024, 2, 14), (3, 1))
+        self.close(date(2024, 2, 15), (2, 4))
+        update_rollups(date(2024, 2, 15))
+
+        week = RestaurantVoteRollup.objects.get(
+            restaurant=self.restaurant1, period=Period.WEEK
+        )
+        month = RestaurantVoteRollup.objects.get(
+            restaurant=self.restaurant2, period=Period.MONTH
+        )
+        assert week.votes_count == 5
+        assert month.votes_count == 5
+
+    def test_get_restaurant_totals(self, django_assert_num_queries):
+        for day in range(1, 30):
+            self.close(date(2024, 2, day), (2, 1))
+        self.close(date(2024, 3, 1), (0, 4))
+
+        with django_assert_num_queries(1):
+            totals = list(get_restaurant_totals(date(2024, 2, 1), date(2024, 3, 1)))
+
+        assert totals == [
+            {
+                "restaurant": self.restaurant1.id,
+                "restaurant__name": self.restaurant1.name,
+                "votes_count": 58,
+            },
+            {
+                "restaurant": self.restaurant2.id,
+                "restaurant__name": self.restaurant2.name,
+                "votes_count": 33,
+            },
+        ]
+
+    def test_get_restaurant_totals_for_restaurant(self):
+        self.close(date(2024, 2, 14), (3, 1))
+
+        totals = get_restaurant_totals(
+            date(2024, 2, 1), date(2024, 2, 29), self.restaurant2
+        )
+
+        assert [row["votes_count"] for row in totals] == [1]
+
+    def test_get_daily_winners(self):
+        self.close(date(2024, 2, 14), (3, 1))
+        self.close(date(2024, 2, 15), (2, 4))
+        self.close(date(2024, 2, 16), (2, 4))
+
+        winners = list(get_daily_winners(date(2024, 2, 14), date(2024, 2, 15)))
+
+        assert [(row["date"], row["menu__restaurant"]) for row in winners] == [
+            (date(2024, 2, 14), self.restaurant1.id),
+            (date(2024, 2, 15), self.restaurant2.id),
+        ]
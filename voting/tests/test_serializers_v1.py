@@ -75,8 +75,9 @@ class TestVotingResultSerializerV1:
     def test_serialize_voting_result(self):
         menu = MenuFactory()
         result_data = {
-            "menu": menu.id,
+            "menu": menu,
             "votes_count": 5,
+            "percentage": 100.0,
         }
         serializer = VotingResultSerializerV1(result_data)
 
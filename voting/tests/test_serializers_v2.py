@@ -80,16 +80,11 @@ class TestVotingResultSerializerV2:
         menu = MenuFactory()
         MenuItemFactory(menu=menu)
         result_data = {
-            "menu": menu.id,
+            "menu": menu,
             "votes_count": 5,
+            "percentage": 50.0,
         }
-        context = {
-            "results": [
-                {"votes_count": 5},
-                {"votes_count": 5},
-            ]
-        }
-        serializer = VotingResultSerializerV2(result_data, context=context)
+        serializer = VotingResultSerializerV2(result_data)
 
         assert serializer.data["menu_id"] == menu.id
         assert serializer.data["votes_count"] == result_data["votes_count"]
@@ -97,14 +92,16 @@ class TestVotingResultSerializerV2:
         assert serializer.data["menu_details"]["id"] == menu.id
         assert serializer.data["percentage"] == 50.0
 
-    def test_serialize_voting_result_zero_total_votes(self):
+    def test_serialize_voting_result_menu_details(self):
         menu = MenuFactory()
-        MenuItemFactory(menu=menu)
+        item = MenuItemFactory(menu=menu)
         result_data = {
-            "menu": menu.id,
+            "menu": menu,
             "votes_count": 0,
+            "percentage": 0,
         }
-        context = {"results": []}
-        serializer = VotingResultSerializerV2(result_data, context=context)
+        serializer = VotingResultSerializerV2(result_data)
 
         assert serializer.data["percentage"] == 0
+        assert serializer.data["menu_details"]["restaurant"] == str(menu.restaurant)
+        assert serializer.data["menu_details"]["items"][0]["id"] == item.id
@@ -0,0 +1,315 @@
+import threading
+import time as clock
+from datetime import datetime, time
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from authentication.tests.factories import EmployeeFactory
+from restaurants.tests.factories import MenuFactory
+from voting import tally
+from voting.exceptions import VoteAlreadyExists
+from voting.models import Vote
+from voting.services import (
+    VOTE_CREATED,
+    VOTE_DUPLICATE,
+    VOTE_INVALID,
+    build_vote,
+    change_vote,
+    create_vote,
+    create_votes_in_bulk,
+    is_duplicate_vote,
+    validate_entries,
+)
+from voting.tests.factories import VoteFactory
+
+
+@pytest.mark.django_db
+class TestCreateVote:
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+        self.menu = MenuFactory(date=self.today)
+        self.employee = EmployeeFactory()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_create_vote(self, django_assert_num_business_queries):
+        # the insert alone, without validation queries
+        with django_assert_num_business_queries(1):
+            vote = create_vote(self.employee, self.menu)
+
+        assert vote.pk is not None
+        assert vote.date == self.today
+        assert vote.menu == self.menu
+
+    def test_create_duplicate_vote(self):
+        create_vote(self.employee, self.menu)
+
+        with pytest.raises(VoteAlreadyExists):
+            create_vote(self.employee, MenuFactory(date=self.today))
+
+        assert Vote.objects.filter(employee=self.employee).count() == 1
+
+    def test_duplicate_vote_detected_without_constraint_name(self):
+        VoteFactory(employee=self.employee, menu=self.menu)
+        error = IntegrityError("duplicate key value")
+
+        assert is_duplicate_vote(
+            error, build_vote(self.employee, self.menu, self.today)
+        )
+        assert not is_duplicate_vote(
+            error, build_vote(EmployeeFactory(), self.menu, self.today)
+        )
+
+    def test_create_vote_after_deadline(self):
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 0))
+
+        with pytest.raises(ValidationError):
+            create_vote(self.employee, self.menu)
+
+        assert not Vote.objects.exists()
+
+
+@pytest.mark.django_db
+class TestChangeVote:
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+        self.menu1 = MenuFactory(date=self.today)
+        self.menu2 = MenuFactory(date=self.today)
+        self.employee = EmployeeFactory()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_change_vote_creates_missing_vote(self, django_assert_num_business_queries):
+        with django_assert_num_business_queries(1):
+            vote, created = change_vote(self.employee, self.menu1)
+
+        assert created
+        assert Vote.objects.get(employee=self.employee).pk == vote.pk
+
+    def test_change_vote_updates_existing_vote(
+        self, django_assert_num_business_queries
+    ):
+        existing = VoteFactory(employee=self.employee, menu=self.menu1)
+
+        with django_assert_num_business_queries(1) as queries:
+            vote, created = change_vote(self.employee, self.menu2)
+
+        assert not created
+        assert vote.pk == existing.pk
+        existing.refresh_from_db()
+        assert existing.menu == self.menu2
+        assert "FOR UPDATE" in queries.captured_queries[-1]["sql"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_changes_keep_tally_consistent(self):
+        VoteFactory(employee=self.employee, menu=self.menu1)
+        menu3 = MenuFactory(date=self.today)
+        menu_ids = [self.menu1.id, self.menu2.id, menu3.id]
+        tally.get_counts(self.today, menu_ids)
+        first_changed = threading.Event()
+
+        def change(menu, hold=False):
+            try:
+                with transaction.atomic():
+                    change_vote(self.employee, menu)
+                    if hold:
+                        # Keep the vote locked while the second change starts
+                        first_changed.set()
+                        clock.sleep(0.2)
+            finally:
+                connection.close()
+
+        first = threading.Thread(target=change, args=(self.menu2, True))
+        second = threading.Thread(target=change, args=(menu3,))
+        first.start()
+        first_changed.wait()
+        second.start()
+        first.join()
+        second.join()
+
+        assert Vote.objects.get(employee=self.employee).menu == menu3
+        assert tally.get_counts(self.today, menu_ids) == {
+            self.menu1.id: 0,
+            self.menu2.id: 0,
+            menu3.id: 1,
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_first_votes_keep_tally_consistent(self):
+        menu_ids = [self.menu1.id, self.menu2.id]
+        tally.get_counts(self.today, menu_ids)
+        first_voted = threading.Event()
+
+        def change(menu, hold=False):
+            try:
+                with transaction.atomic():
+                    change_vote(self.employee, menu)
+                    if hold:
+                        # Keep the new vote uncommitted while the second starts
+                        first_voted.set()
+                        clock.sleep(0.2)
+            finally:
+                connection.close()
+
+        first = threading.Thread(target=change, args=(self.menu1, True))
+        second = threading.Thread(target=change, args=(self.menu2,))
+        with patch.object(tally, "invalidate", wraps=tally.invalidate) as invalidate:
+            first.start()
+            first_voted.wait()
+            second.start()
+            first.join()
+            second.join()
+
+        invalidate.assert_called_once_with(self.today)
+        assert Vote.objects.get(employee=self.employee).menu == self.menu2
+        assert tally.get_counts(self.today, menu_ids) == {
+            self.menu1.id: 0,
+            self.menu2.id: 1,
+        }
+
+    def test_change_vote_adjusts_tally(self, django_capture_on_commit_callbacks):
+        VoteFactory(employee=self.employee, menu=self.menu1)
+        menu_ids = [self.menu1.id, self.menu2.id]
+        tally.get_counts(self.today, menu_ids)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            change_vote(self.employee, self.menu2)
+            change_vote(self.employee, self.menu2)
+
+        assert tally.get_counts(self.today, menu_ids) == {
+            self.menu1.id: 0,
+            self.menu2.id: 1,
+        }
+
+    def test_change_vote_after_deadline(self):
+        VoteFactory(employee=self.employee, menu=self.menu1)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 0))
+
+        with pytest.raises(ValidationError):
+            change_vote(self.employee, self.menu2)
+
+        assert Vote.objects.get(employee=self.employee).menu == self.menu1
+
+
+@pytest.mark.django_db
+class TestCreateVotesInBulk:
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+        self.menu = MenuFactory(date=self.today)
+        self.employees = EmployeeFactory.create_batch(3)
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_create_votes(self):
+        entries = [
+            {"employee": employee.id, "menu": self.menu.id}
+            for employee in self.employees
+        ]
+
+        statuses = create_votes_in_bulk(entries, self.today)
+
+        assert [entry["status"] for entry in statuses] == [VOTE_CREATED] * 3
+        assert Vote.objects.filter(menu=self.menu).count() == 3
+        assert {entry["id"] for entry in statuses} == set(
+            Vote.objects.values_list("id", flat=True)
+        )
+
+    def test_statuses_follow_entry_order(self):
+        VoteFactory(employee=self.employees[1], menu=self.menu)
+        tomorrow_menu = MenuFactory(date=self.today + timezone.timedelta(days=1))
+        entries = [
+            {"employee": self.employees[0].id, "menu": self.menu.id},
+            {"employee": self.employees[1].id, "menu": self.menu.id},
+            {"employee": self.employees[2].id, "menu": tomorrow_menu.id},
+            {"employee": 0, "menu": self.menu.id},
+            {"employee": self.employees[0].id, "menu": self.menu.id},
+        ]
+
+        statuses = create_votes_in_bulk(entries, self.today)
+
+        assert [entry["status"] for entry in statuses] == [
+            VOTE_CREATED,
+            VOTE_DUPLICATE,
+            VOTE_INVALID,
+            VOTE_INVALID,
+            VOTE_DUPLICATE,
+        ]
+        assert Vote.objects.count() == 2
+
+    def test_concurrent_votes_are_reported_as_duplicates(
+        self, django_capture_on_commit_callbacks
+    ):
+        tally.get_counts(self.today, [self.menu.id])
+        entries = [
+            {"employee": employee.id, "menu": self.menu.id}
+            for employee in self.employees
+        ]
+
+        def validate_then_vote(*args):
+            validated = validate_entries(*args)
+            # Lands between the check for existing votes and the insert
+            VoteFactory(employee=self.employees[1], menu=self.menu)
+            return validated
+
+        with (
+            patch("voting.services.validate_entries", side_effect=validate_then_vote),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            statuses = create_votes_in_bulk(entries, self.today)
+
+        assert [entry["status"] for entry in statuses] == [
+            VOTE_CREATED,
+            VOTE_DUPLICATE,
+            VOTE_CREATED,
+        ]
+        assert Vote.objects.count() == 3
+        assert tally.get_counts(self.today, [self.menu.id]) == {self.menu.id: 3}
+
+    def test_query_count_does_not_grow_with_votes(
+        self, django_assert_num_business_queries
+    ):
+        employees = EmployeeFactory.create_batch(20)
+        entries = [
+            {"employee": employee.id, "menu": self.menu.id} for employee in employees
+        ]
+
+        # menus, employees, existing votes and the insert
+        with django_assert_num_business_queries(4):
+            create_votes_in_bulk(entries, self.today)
+
+    def test_votes_update_built_tally(self, django_capture_on_commit_callbacks):
+        tally.get_counts(self.today, [self.menu.id])
+        entries = [
+            {"employee": employee.id, "menu": self.menu.id}
+            for employee in self.employees
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            create_votes_in_bulk(entries, self.today)
+
+        assert tally.get_counts(self.today, [self.menu.id]) == {self.menu.id: 3}
+
+    def test_after_voting_deadline(self):
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 5))
+        entries = [{"employee": self.employees[0].id, "menu": self.menu.id}]
+
+        with pytest.raises(ValidationError):
+            create_votes_in_bulk(entries, self.today)
+
+        assert not Vote.objects.exists()
@@ -0,0 +1,159 @@
+from datetime import datetime, time
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.utils import timezone
+
+from restaurants.tests.factories import MenuFactory
+from voting import tally
+from voting.tests.factories import VoteFactory
+
+
+@pytest.mark.django_db
+class TestTally:
+    def setup_method(self):
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        mock_time = datetime.combine(timezone.now().date(), time(10, 0))
+        self.mock_localtime.return_value = mock_time
+        self.today = timezone.now().date()
+        self.menu1 = MenuFactory(date=self.today)
+        self.menu2 = MenuFactory(date=self.today)
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def get_counts(self):
+        return tally.get_counts(self.today, [self.menu1.id, self.menu2.id])
+
+    def test_get_counts_rebuilds_on_miss(self):
+        VoteFactory.create_batch(2, menu=self.menu1)
+
+        assert self.get_counts() == {self.menu1.id: 2, self.menu2.id: 0}
+        assert cache.get(tally.get_day_key(self.today)) == tally.get_stamp(self.today)
+
+    def test_get_counts_served_from_cache(self, django_assert_num_queries):
+        VoteFactory(menu=self.menu1)
+        self.get_counts()
+
+        with django_assert_num_queries(0):
+            assert self.get_counts() == {self.menu1.id: 1, self.menu2.id: 0}
+
+    def test_aget_counts_matches_get_counts(self, django_assert_num_queries):
+        VoteFactory.create_batch(2, menu=self.menu1)
+
+        counts = async_to_sync(tally.aget_counts)(
+            self.today, [self.menu1.id, self.menu2.id]
+        )
+
+        assert counts == {self.menu1.id: 2, self.menu2.id: 0}
+        with django_assert_num_queries(0):
+            assert self.get_counts() == counts
+
+    def test_evicted_count_is_rebuilt(self, django_capture_on_commit_callbacks):
+        VoteFactory.create_batch(2, menu=self.menu1)
+        self.get_counts()
+        cache.delete(tally.get_menu_key(self.today, self.menu1.id))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            VoteFactory(menu=self.menu1)
+
+        assert cache.get(tally.get_menu_key(self.today, self.menu1.id)) is None
+        assert self.get_counts() == {self.menu1.id: 3, self.menu2.id: 0}
+
+    def test_evicted_stamp_rebuilds(self, django_assert_num_queries):
+        VoteFactory(menu=self.menu1)
+        self.get_counts()
+        cache.delete(tally.get_stamp_key(self.today))
+
+        with django_assert_num_queries(1):
+            assert self.get_counts() == {self.menu1.id: 1, self.menu2.id: 0}
+
+    def test_vote_during_rebuild_is_not_lost(self, django_assert_num_queries):
+        get_stamp = tally.get_stamp
+
+        def get_stamp_then_vote(date):
+            stamp = get_stamp(date)
+            # Commits after the stamp was read, so the rebuild may miss it
+            vote = VoteFactory(menu=self.menu1)
+            tally.add_vote(vote.date, vote.menu_id)
+            return stamp
+
+        with patch("voting.tally.get_stamp", get_stamp_then_vote):
+            self.get_counts()
+
+        assert cache.get(tally.get_day_key(self.today)) is None
+        with django_assert_num_queries(1):
+            assert self.get_counts() == {self.menu1.id: 1, self.menu2.id: 0}
+
+    def test_vote_aggregated_before_its_increment_is_counted_once(
+        self, django_capture_on_commit_callbacks
+    ):
+        self.get_counts()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            VoteFactory(menu=self.menu1)
+            # A rebuild between the write and the vote's on-commit increment
+            # aggregates the vote already
+            cache.delete(tally.get_menu_key(self.today, self.menu2.id))
+            assert self.get_counts() == {self.menu1.id: 1, self.menu2.id: 0}
+
+        assert self.get_counts() == {self.menu1.id: 1, self.menu2.id: 0}
+
+    def test_vote_applied_without_rebuild(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        self.get_counts()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            VoteFactory(menu=self.menu1)
+
+        with django_assert_num_queries(0):
+            assert self.get_counts() == {self.menu1.id: 1, self.menu2.id: 0}
+
+    def test_vote_creation_updates_built_tally(
+        self, django_capture_on_commit_callbacks
+    ):
+        self.get_counts()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            VoteFactory(menu=self.menu2)
+            VoteFactory(menu=self.menu2)
+
+        assert self.get_counts() == {self.menu1.id: 0, self.menu2.id: 2}
+
+    def test_vote_deletion_updates_built_tally(
+        self, django_capture_on_commit_callbacks
+    ):
+        vote = VoteFactory(menu=self.menu1)
+        self.get_counts()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            vote.delete()
+
+        assert self.get_counts() == {self.menu1.id: 0, self.menu2.id: 0}
+
+    def test_add_vote_publishes_count_of_unbuilt_tally(self):
+        VoteFactory(menu=self.menu1)
+
+        with patch("voting.tally.publish_vote_count") as publish:
+            assert tally.add_vote(self.today, self.menu1.id) == 1
+
+        publish.assert_called_once_with(self.today, self.menu1.id, 1)
+        assert cache.get(tally.get_menu_key(self.today, self.menu1.id)) is None
+
+    def test_vote_update_invalidates_tally(self, django_capture_on_commit_callbacks):
+        vote = VoteFactory(menu=self.menu1)
+        self.get_counts()
+
+        with patch("voting.tally.publish_refresh") as publish_refresh:
+            with django_capture_on_commit_callbacks(execute=True):
+                vote.menu = self.menu2
+                vote.save()
+
+        publish_refresh.assert_called_once_with(self.today)
+
+        assert cache.get(tally.get_day_key(self.today)) is None
+        assert self.get_counts() == {self.menu1.id: 0, self.menu2.id: 1}
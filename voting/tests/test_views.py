@@ -1,15 +1,25 @@
+import gzip
+import json
 from datetime import datetime, time
 from unittest.mock import patch
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 
 from authentication.tests.factories import EmployeeFactory
 from restaurants.tests.factories import MenuFactory, MenuItemFactory
-from voting.tests.factories import VoteFactory
+from voting.models import DailyResult, Vote
+from voting.pagination import VoteHistoryPagination
+from voting.results import close_day
+from voting.rollups import update_rollups
+from voting.tests.factories import DailyResultFactory, VoteFactory
+from voting.views import AsyncTodayResultsView, AsyncUserVoteHistoryView
 
 
 @pytest.mark.django_db
@@ -84,11 +94,131 @@ class TestCreateVoteView:
         data = {"menu": menu2.id}
         response = self.client.post(self.url, data)
 
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == status.HTTP_409_CONFLICT
         assert "Vote with this Employee and Date already exists" in str(
             response.data["detail"]
         )
 
+    def test_change_vote(self):
+        menu1 = MenuFactory(date=timezone.now().date())
+        menu2 = MenuFactory(date=timezone.now().date())
+        VoteFactory(employee=self.employee, menu=menu1)
+
+        response = self.client.put(
+            self.url, {"menu": menu2.id}, HTTP_MOBILE_APP_VERSION="2.0"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["menu"]["id"] == menu2.id
+        assert response.data["restaurant_name"] == menu2.restaurant.name
+
+    def test_change_vote_without_previous_vote(self):
+        menu = MenuFactory(date=timezone.now().date())
+
+        response = self.client.put(self.url, {"menu": menu.id})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["restaurant_name"] == menu.restaurant.name
+
+    def test_change_vote_after_11am(self):
+        menu = MenuFactory(date=timezone.now().date())
+        mock_time = datetime.combine(timezone.now().date(), time(11, 1))
+        self.mock_localtime.return_value = mock_time
+
+        response = self.client.put(self.url, {"menu": menu.id})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Voting is only allowed before 11:00 AM" in str(response.data["detail"])
+
+    def test_create_vote_query_count_v1(self, django_assert_num_business_queries):
+        menu = MenuFactory(date=timezone.now().date())
+        MenuItemFactory(menu=menu)
+
+        # menu with restaurant, then the insert
+        with django_assert_num_business_queries(2):
+            response = self.client.post(
+                self.url, {"menu": menu.id}, HTTP_MOBILE_APP_VERSION="1.0"
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["restaurant_name"] == menu.restaurant.name
+
+    def test_create_vote_query_count_v2(self, django_assert_num_business_queries):
+        menu = MenuFactory(date=timezone.now().date())
+        item = MenuItemFactory(menu=menu)
+
+        # menu with restaurant and its items, then the insert
+        with django_assert_num_business_queries(3):
+            response = self.client.post(
+                self.url, {"menu": menu.id}, HTTP_MOBILE_APP_VERSION="2.0"
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["menu"]["items"][0]["id"] == item.id
+        assert response.data["employee_email"] == self.employee.email
+
+
+@pytest.mark.django_db
+class TestBulkCreateVoteView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse("voting:bulk-create-vote")
+        self.admin = EmployeeFactory(is_staff=True)
+        self.client.force_authenticate(user=self.admin)
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        mock_time = datetime.combine(timezone.now().date(), time(10, 0))
+        self.mock_localtime.return_value = mock_time
+        self.menu = MenuFactory(date=timezone.now().date())
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_bulk_create_votes(self):
+        employees = EmployeeFactory.create_batch(2)
+        data = {
+            "votes": [
+                {"employee": employees[0].id, "menu": self.menu.id},
+                {"employee": employees[1].id, "menu": self.menu.id},
+                {"employee": employees[1].id, "menu": self.menu.id},
+            ]
+        }
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["status"] for row in response.data["results"]] == [
+            "created",
+            "created",
+            "duplicate",
+        ]
+        assert response.data["results"][0]["id"]
+        assert "id" not in response.data["results"][2]
+
+    def test_bulk_create_votes_as_regular_user(self):
+        employee = EmployeeFactory()
+        self.client.force_authenticate(user=employee)
+        data = {"votes": [{"employee": employee.id, "menu": self.menu.id}]}
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_create_votes_empty(self):
+        response = self.client.post(self.url, {"votes": []}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_create_votes_after_11am(self):
+        mock_time = datetime.combine(timezone.now().date(), time(11, 1))
+        self.mock_localtime.return_value = mock_time
+        data = {"votes": [{"employee": self.admin.id, "menu": self.menu.id}]}
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Voting is only allowed before 11:00 AM" in response.data["detail"]
+
 
 @pytest.mark.django_db
 class TestUserVoteHistoryView:
@@ -120,6 +250,41 @@ class TestUserVoteHistoryView:
         )
         assert response.data["results"][0]["menu_date"] == vote.menu.date.isoformat()
 
+    def test_get_vote_history_cursor_pagination(self, django_assert_num_queries):
+        today = timezone.now().date()
+        votes = Vote.objects.bulk_create(
+            Vote(employee=self.employee, date=date, menu=MenuFactory(date=date))
+            for date in (today - timezone.timedelta(days=days) for days in range(25))
+        )
+        response = self.client.get(self.url, {"cursor": ""})
+        response = self.client.get(response.data["next"])
+
+        with django_assert_num_queries(1):
+            last = self.client.get(response.data["next"])
+
+        assert [row["id"] for row in response.data["results"]] == [
+            vote.id for vote in votes[10:20]
+        ]
+        assert [row["id"] for row in last.data["results"]] == [
+            vote.id for vote in votes[20:]
+        ]
+
+    def test_get_vote_history_page_number_by_default(self):
+        today = timezone.now().date()
+        votes = Vote.objects.bulk_create(
+            Vote(employee=self.employee, date=date, menu=MenuFactory(date=date))
+            for date in (today - timezone.timedelta(days=days) for days in range(12))
+        )
+
+        first = self.client.get(self.url)
+        response = self.client.get(self.url, {"page": 2})
+
+        assert first.data["count"] == 12
+        assert response.data["count"] == 12
+        assert [row["id"] for row in response.data["results"]] == [
+            vote.id for vote in votes[10:]
+        ]
+
     def test_get_vote_history_v2(self):
         vote = VoteFactory(employee=self.employee)
         MenuItemFactory(menu=vote.menu)
@@ -136,6 +301,106 @@ class TestUserVoteHistoryView:
         )
         assert response.data["results"][0]["menu_date"] == vote.menu.date.isoformat()
 
+    def test_get_vote_history_v2_queries(self, django_assert_num_queries):
+        today = timezone.now().date()
+        Vote.objects.bulk_create(
+            Vote(employee=self.employee, date=date, menu=MenuFactory(date=date))
+            for date in (today - timezone.timedelta(days=days) for days in range(3))
+        )
+        for vote in Vote.objects.all():
+            MenuItemFactory.create_batch(2, menu=vote.menu)
+
+        # Votes with their menus, restaurants and employee, then menu items
+        with django_assert_num_queries(2):
+            response = self.client.get(
+                self.url, {"cursor": ""}, HTTP_MOBILE_APP_VERSION="2.0"
+            )
+
+        assert [len(row["menu"]["items"]) for row in response.data["results"]] == [
+            2,
+            2,
+            2,
+        ]
+
+    def test_get_vote_history_v2_fields(self, django_assert_num_queries):
+        vote = VoteFactory(employee=self.employee)
+        MenuItemFactory.create_batch(2, menu=vote.menu)
+
+        # Votes with their menus and restaurants only; no employee, no items
+        with django_assert_num_queries(1) as queries:
+            response = self.client.get(
+                self.url,
+                {"fields": "id,restaurant_name,menu_date", "cursor": ""},
+                HTTP_MOBILE_APP_VERSION="2.0",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == [
+            {
+                "id": vote.id,
+                "restaurant_name": vote.menu.restaurant.name,
+                "menu_date": vote.menu.date.isoformat(),
+            }
+        ]
+        assert "authentication_" not in queries.captured_queries[0]["sql"]
+        assert "address" not in queries.captured_queries[0]["sql"]
+
+    def test_get_vote_history_v2_expand(self, django_assert_num_queries):
+        vote = VoteFactory(employee=self.employee)
+        item = MenuItemFactory(menu=vote.menu)
+
+        with django_assert_num_queries(1):
+            collapsed = self.client.get(
+                self.url,
+                {"fields": "id,employee_name,menu.date", "cursor": ""},
+                HTTP_MOBILE_APP_VERSION="2.0",
+            )
+        with django_assert_num_queries(2):
+            expanded = self.client.get(
+                self.url,
+                {"fields": "id,menu.date", "expand": "menu.items", "cursor": ""},
+                HTTP_MOBILE_APP_VERSION="2.0",
+            )
+
+        assert collapsed.json()["results"] == [
+            {
+                "id": vote.id,
+                "employee_name": self.employee.get_full_name(),
+                "menu": {"date": vote.menu.date.isoformat()},
+            }
+        ]
+        assert expanded.json()["results"][0]["menu"] == {
+            "date": vote.menu.date.isoformat(),
+            "items": [
+                {
+                    "id": item.id,
+                    "name": item.name,
+                    "description": item.description,
+                    "price": str(item.price),
+                }
+            ],
+        }
+
+    def test_get_vote_history_fields_cursor_pagination(self):
+        today = timezone.now().date()
+        votes = Vote.objects.bulk_create(
+            Vote(employee=self.employee, date=date, menu=MenuFactory(date=date))
+            for date in (today - timezone.timedelta(days=days) for days in range(12))
+        )
+
+        first = self.client.get(self.url, {"fields": "id", "cursor": ""})
+        second = self.client.get(first.data["next"])
+
+        assert second.json()["results"] == [{"id": vote.id} for vote in votes[10:]]
+
+    def test_get_vote_history_unknown_field(self):
+        response = self.client.get(
+            self.url, {"fields": "id,menu.price"}, HTTP_MOBILE_APP_VERSION="2.0"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["fields"] == "Unknown field: menu.price"
+
     def test_get_vote_history_empty(self):
         response = self.client.get(self.url)
 
@@ -228,3 +493,383 @@ class TestTodayResultsView:
         assert (
             response.data["results"][0]["restaurant_name"] == today_menu.restaurant.name
         )
+
+    def get_results_query_count(self, version):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_MOBILE_APP_VERSION=version)
+        assert response.status_code == status.HTTP_200_OK
+        return len(queries)
+
+    @pytest.mark.parametrize("version", ["1.0", "2.0"])
+    def test_get_today_results_query_count_is_constant(
+        self, version, django_capture_on_commit_callbacks
+    ):
+        menu = MenuFactory(date=timezone.now().date())
+        MenuItemFactory(menu=menu)
+        VoteFactory(menu=menu)
+        self.get_results_query_count(version)
+        few_menus_queries = self.get_results_query_count(version)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(5):
+                menu = MenuFactory(date=timezone.now().date())
+                MenuItemFactory.create_batch(3, menu=menu)
+                VoteFactory.create_batch(2, menu=menu)
+        # Menus that are new to the tally join it with one rebuild
+        self.get_results_query_count(version)
+        many_menus_queries = self.get_results_query_count(version)
+
+        assert few_menus_queries == many_menus_queries
+
+    def test_get_today_results_reflect_new_votes(
+        self, django_capture_on_commit_callbacks
+    ):
+        menu = MenuFactory(date=timezone.now().date())
+        VoteFactory(menu=menu)
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            VoteFactory(menu=menu)
+        response = self.client.get(self.url)
+
+        assert response.data["results"][0]["votes_count"] == 2
+
+    def test_get_today_results_percentage_v2(self):
+        menu1 = MenuFactory(date=timezone.now().date())
+        menu2 = MenuFactory(date=timezone.now().date())
+        for _ in range(3):
+            VoteFactory(menu=menu1)
+        VoteFactory(menu=menu2)
+
+        response = self.client.get(self.url, HTTP_MOBILE_APP_VERSION="2.0")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["menu_id"] == menu1.id
+        assert response.data["results"][0]["percentage"] == 75.0
+        assert response.data["results"][1]["menu_details"]["id"] == menu2.id
+        assert response.data["results"][1]["percentage"] == 25.0
+
+    def test_get_today_results_not_modified(self, django_assert_num_queries):
+        menu = MenuFactory(date=timezone.now().date())
+        VoteFactory(menu=menu)
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        # Both the vote and the menu stamps live in the cache
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_get_today_results_etag_changes_after_vote(
+        self, django_capture_on_commit_callbacks
+    ):
+        menu = MenuFactory(date=timezone.now().date())
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            VoteFactory(menu=menu)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["results"][0]["votes_count"] == 1
+
+    def test_get_today_results_etag_per_version(self):
+        MenuFactory(date=timezone.now().date())
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(
+            self.url, HTTP_MOBILE_APP_VERSION="2.0", HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+class TestDateResultsView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.employee = EmployeeFactory()
+        self.client.force_authenticate(user=self.employee)
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def get_url(self, date):
+        return reverse("voting:date-results", kwargs={"date": date})
+
+    def test_get_closed_day_results_from_snapshot(self):
+        menu = MenuFactory(date=self.today)
+        VoteFactory.create_batch(2, menu=menu)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(12, 0))
+        close_day(self.today)
+
+        response = self.client.get(
+            self.get_url(self.today), HTTP_MOBILE_APP_VERSION="2.0"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"][0]["menu_id"] == menu.id
+        assert json.loads(response.content)["results"][0]["votes_count"] == 2
+        assert response.json()["results"][0]["percentage"] == 100.0
+
+    def test_get_closed_day_results_without_snapshot(self):
+        menu = MenuFactory(date=self.today)
+        VoteFactory(menu=menu)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(11, 1))
+
+        response = self.client.get(self.get_url(self.today))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["count"] == 1
+        assert response.json()["results"][0]["votes_count"] == 1
+        assert DailyResult.objects.filter(date=self.today, menu=menu).exists()
+
+    def test_get_day_without_votes(self):
+        yesterday = self.today - timezone.timedelta(days=1)
+
+        response = self.client.get(self.get_url(yesterday))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 0
+
+    def test_get_closed_day_results_served_from_cache(self, django_assert_num_queries):
+        menu = MenuFactory(date=self.today)
+        VoteFactory(menu=menu)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(12, 0))
+        close_day(self.today)
+        first = self.client.get(self.get_url(self.today))
+
+        with django_assert_num_queries(0):
+            response = self.client.get(self.get_url(self.today))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == first.content
+        assert response["ETag"] == first["ETag"]
+
+    def test_get_closed_day_results_cache_follows_new_snapshot(
+        self, django_capture_on_commit_callbacks
+    ):
+        menus = MenuFactory.create_batch(2, date=self.today)
+        VoteFactory(menu=menus[0])
+        self.mock_localtime.return_value = datetime.combine(self.today, time(12, 0))
+        close_day(self.today)
+        self.client.get(self.get_url(self.today))
+
+        Vote.objects.update(menu=menus[1])
+        with django_capture_on_commit_callbacks(execute=True):
+            close_day(self.today)
+        response = self.client.get(self.get_url(self.today))
+
+        assert response.json()["results"] == [
+            {"votes_count": 1, "restaurant_name": menus[1].restaurant.name}
+        ]
+
+    def test_get_closed_day_results_precompressed(self):
+        for menu in MenuFactory.create_batch(5, date=self.today):
+            MenuItemFactory.create_batch(3, menu=menu)
+            VoteFactory(menu=menu)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(12, 0))
+        close_day(self.today)
+        url = self.get_url(self.today)
+        plain = self.client.get(url, HTTP_MOBILE_APP_VERSION="2.0")
+
+        with patch("config.compression.compress_stored") as compress_stored:
+            response = self.client.get(
+                url, HTTP_MOBILE_APP_VERSION="2.0", HTTP_ACCEPT_ENCODING="gzip"
+            )
+
+        compress_stored.assert_not_called()
+        assert response["Content-Encoding"] == "gzip"
+        assert response["ETag"] == f"W/{plain['ETag']}"
+        assert gzip.decompress(response.content) == plain.content
+
+    def test_get_invalid_date(self):
+        response = self.client.get("/api/v1/voting/results/2024-13-45/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestResultsHistoryView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse("voting:results-history")
+        self.employee = EmployeeFactory()
+        self.client.force_authenticate(user=self.employee)
+        self.winner = DailyResultFactory(
+            menu=MenuFactory(date=timezone.datetime(2024, 2, 14).date()),
+            votes_count=3,
+        )
+        self.runner_up = DailyResultFactory(
+            menu=MenuFactory(date=self.winner.date), votes_count=1, rank=2
+        )
+        update_rollups(self.winner.date)
+
+    def test_get_results_history(self):
+        response = self.client.get(self.url, {"from": "2024-02-01", "to": "2024-02-29"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["winners"] == [
+            {
+                "date": "2024-02-14",
+                "restaurant_id": self.winner.menu.restaurant.id,
+                "restaurant_name": self.winner.menu.restaurant.name,
+                "votes_count": 3,
+            }
+        ]
+        assert [row["votes_count"] for row in response.data["totals"]] == [3, 1]
+
+    def test_get_results_history_for_restaurant(self):
+        restaurant = self.runner_up.menu.restaurant
+        response = self.client.get(
+            self.url,
+            {"from": "2024-02-01", "to": "2024-02-29", "restaurant": restaurant.id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["winners"] == []
+        assert response.data["totals"][0]["restaurant_id"] == restaurant.id
+
+    def test_get_results_history_outside_range(self):
+        response = self.client.get(self.url, {"from": "2024-03-01", "to": "2024-03-31"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"winners": [], "totals": []}
+
+    def test_get_results_history_invalid_range(self):
+        response = self.client.get(self.url, {"from": "2024-03-01", "to": "2024-02-01"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "from" in response.data
+
+    def test_get_results_history_missing_dates(self):
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "from" in response.data
+        assert "to" in response.data
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    def setup_method(self):
+        self.client = APIClient()
+        self.factory = APIRequestFactory()
+        self.employee = EmployeeFactory()
+        self.client.force_authenticate(user=self.employee)
+        self.patcher = patch("django.utils.timezone.localtime")
+        self.mock_localtime = self.patcher.start()
+        self.today = timezone.now().date()
+        self.mock_localtime.return_value = datetime.combine(self.today, time(10, 0))
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def get(self, view_class, url, **extra):
+        request = self.factory.get(url, **extra)
+        force_authenticate(request, user=self.employee)
+        response = async_to_sync(view_class.as_view())(request)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    @pytest.mark.parametrize("version", ["1.0", "2.0"])
+    def test_today_results_match_sync_view(self, version):
+        menus = MenuFactory.create_batch(2, date=self.today)
+        MenuItemFactory(menu=menus[0])
+        VoteFactory.create_batch(2, menu=menus[0])
+        VoteFactory(menu=menus[1])
+        url = reverse("voting:today-results")
+
+        response = self.get(AsyncTodayResultsView, url, HTTP_MOBILE_APP_VERSION=version)
+        expected = self.client.get(url, HTTP_MOBILE_APP_VERSION=version)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+        assert response["ETag"] == expected["ETag"]
+
+    def test_today_results_from_snapshot(self):
+        menu = MenuFactory(date=self.today)
+        VoteFactory.create_batch(2, menu=menu)
+        self.mock_localtime.return_value = datetime.combine(self.today, time(12, 0))
+        close_day(self.today)
+        url = reverse("voting:today-results")
+
+        response = self.get(AsyncTodayResultsView, url)
+
+        assert json.loads(response.content)["results"][0]["votes_count"] == 2
+
+    def test_today_results_not_modified(self):
+        MenuFactory(date=self.today)
+        url = reverse("voting:today-results")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.get(AsyncTodayResultsView, url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_today_results_invalid_page(self):
+        response = self.get(
+            AsyncTodayResultsView, reverse("voting:today-results"), data={"page": 5}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_today_results_require_authentication(self):
+        request = self.factory.get(reverse("voting:today-results"))
+        response = async_to_sync(AsyncTodayResultsView.as_view())(request)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_vote_history_matches_sync_view(self):
+        VoteFactory(employee=self.employee)
+        url = reverse("voting:vote-history")
+
+        response = self.get(AsyncUserVoteHistoryView, url)
+        expected = self.client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+
+    @pytest.mark.parametrize("data", [{}, {"page": 2}, {"cursor": ""}])
+    def test_vote_history_pages_through_async_orm(self, data):
+        Vote.objects.bulk_create(
+            Vote(employee=self.employee, date=date, menu=MenuFactory(date=date))
+            for date in (
+                self.today - timezone.timedelta(days=days) for days in range(12)
+            )
+        )
+        url = reverse("voting:vote-history")
+
+        with patch.object(
+            VoteHistoryPagination, "paginate_queryset", side_effect=AssertionError
+        ):
+            response = self.get(AsyncUserVoteHistoryView, url, data=data)
+        expected = self.client.get(url, data)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+
+    def test_vote_history_cursor_pages_match_sync_view(self):
+        Vote.objects.bulk_create(
+            Vote(employee=self.employee, date=date, menu=MenuFactory(date=date))
+            for date in (
+                self.today - timezone.timedelta(days=days) for days in range(12)
+            )
+        )
+        first = self.client.get(reverse("voting:vote-history"), {"cursor": ""})
+
+        response = self.get(AsyncUserVoteHistoryView, first.data["next"])
+        expected = self.client.get(first.data["next"])
+
+        assert len(expected.data["results"]) == 2
+        assert response.content == expected.content
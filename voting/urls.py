@@ -1,11 +1,38 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, register_converter
 
-from voting.views import CreateVoteView, TodayResultsView, UserVoteHistoryView
+from voting.converters import DateConverter
+from voting.views import (
+    AsyncTodayResultsView,
+    AsyncUserVoteHistoryView,
+    BulkCreateVoteView,
+    CreateVoteView,
+    DateResultsView,
+    ResultsHistoryView,
+    TodayResultsStreamView,
+    TodayResultsView,
+    UserVoteHistoryView,
+)
 
 app_name = "voting"
 
+today_results_view = AsyncTodayResultsView if settings.ASYNC_VIEWS else TodayResultsView
+vote_history_view = (
+    AsyncUserVoteHistoryView if settings.ASYNC_VIEWS else UserVoteHistoryView
+)
+
+register_converter(DateConverter, "date")
+
 urlpatterns = [
     path("", CreateVoteView.as_view(), name="create-vote"),
-    path("my/", UserVoteHistoryView.as_view(), name="vote-history"),
-    path("results/today/", TodayResultsView.as_view(), name="today-results"),
+    path("bulk/", BulkCreateVoteView.as_view(), name="bulk-create-vote"),
+    path("my/", vote_history_view.as_view(), name="vote-history"),
+    path("results/", ResultsHistoryView.as_view(), name="results-history"),
+    path("results/today/", today_results_view.as_view(), name="today-results"),
+    path(
+        "results/today/stream/",
+        TodayResultsStreamView.as_view(),
+        name="today-results-stream",
+    ),
+    path("results/<date:date>/", DateResultsView.as_view(), name="date-results"),
 ]
@@ -1,8 +1,20 @@
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+VOTING_DEADLINE_HOUR = 11
+
 
 def validate_voting_time():
     now = timezone.localtime()
-    if now.hour >= 11:
+    if now.hour >= VOTING_DEADLINE_HOUR:
         raise ValidationError("Voting is only allowed before 11:00 AM")
+
+
+def is_voting_closed(date):
+    """
+    Voting for a date is closed once its 11:00 AM deadline has passed.
+    """
+    now = timezone.localtime()
+    return date < now.date() or (
+        date == now.date() and now.hour >= VOTING_DEADLINE_HOUR
+    )
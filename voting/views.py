@@ -1,90 +1,276 @@
+import json
+from contextlib import aclosing
+
+from asgiref.sync import sync_to_async
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
-from django.db.models import Count
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from rest_framework import generics, status
+from django.views import View
+from rest_framework import exceptions, generics, permissions, status
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from voting.api.v1.serializers import (
-    VoteDetailSerializerV1,
-    VoteSerializerV1,
-    VotingResultSerializerV1,
-)
-from voting.api.v2.serializers import (
-    VoteDetailSerializerV2,
-    VoteSerializerV2,
-    VotingResultSerializerV2,
-)
+from config.async_views import AsyncListAPIView
+from config.compiled import CompiledReadMixin, get_read_serializer
+from config.conditional import AsyncConditionalGetMixin, ConditionalGetMixin
+from config.documents import AsyncDocumentCacheMixin, DocumentCacheMixin
+from config.fieldsets import SparseFieldsMixin
+from config.pagination import AsyncPageNumberPagination
+from config.versioning import VersionedSerializerMixin
+from restaurants import documents as menu_documents
+from voting import documents, tally
+from voting.events import broadcaster
 from voting.models import Vote
+from voting.pagination import VoteHistoryPagination
+from voting.results import aget_results_for_date, get_results_for_date
+from voting.rollups import get_daily_winners, get_restaurant_totals
+from voting.services import change_vote, create_votes_in_bulk
+from voting.validators import is_voting_closed
 
 
-class VersionedSerializerMixin:
-    """
-    Mixin that selects the appropriate serializer based on the API version.
-    """
+class CreateVoteView(VersionedSerializerMixin, generics.CreateAPIView):
+    versioned_name = "vote"
+    serializer_role = "input"
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            vote = serializer.save()
+        except ValidationError as error:
+            return Response({"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
-    serializer_classes = {}
-    default_version = "1.0"
+        response_serializer = self.get_detail_serializer(vote)
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        """
+        Change today's vote, or create it if the employee has not voted yet.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            vote, created = change_vote(request.user, serializer.validated_data["menu"])
+        except ValidationError as error:
+            return Response({"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
-    def get_serializer_class(self):
-        version = getattr(self.request, "version", self.default_version)
-        return self.serializer_classes.get(
-            version, self.serializer_classes[self.default_version]
+        response_serializer = self.get_detail_serializer(vote)
+        return Response(
+            response_serializer.data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
         )
 
+    def get_detail_serializer(self, vote):
+        return get_read_serializer(self.versioned_serializers.output, vote)
 
-class CreateVoteView(VersionedSerializerMixin, generics.CreateAPIView):
-    serializer_classes = {
-        "1.0": VoteSerializerV1,
-        "2.0": VoteSerializerV2,
-    }
 
-    def create(self, request, *args, **kwargs):
+class BulkCreateVoteView(VersionedSerializerMixin, generics.GenericAPIView):
+    """
+    Create many votes of different employees in one request, for kiosks that
+    replay votes collected while offline. Every vote gets its own status; the
+    votes are dated when the request arrives, so a batch replayed after the
+    voting deadline is refused as a whole.
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+    versioned_name = "bulk-vote"
+    serializer_role = "input"
+
+    def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         try:
-            vote = serializer.save()
-            response_serializer = (
-                VoteDetailSerializerV2(vote)
-                if request.version == "2.0"
-                else VoteDetailSerializerV1(vote)
+            statuses = create_votes_in_bulk(
+                serializer.validated_data["votes"], timezone.now().date()
             )
-            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
-        except (ValidationError, IntegrityError) as error:
+        except ValidationError as error:
             return Response({"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
+        response_serializer = self.versioned_serializers.output(statuses, many=True)
+        return Response({"results": response_serializer.data})
 
-class UserVoteHistoryView(VersionedSerializerMixin, generics.ListAPIView):
-    serializer_classes = {
-        "1.0": VoteDetailSerializerV1,
-        "2.0": VoteDetailSerializerV2,
-    }
+
+class UserVoteHistoryView(
+    SparseFieldsMixin,
+    CompiledReadMixin,
+    VersionedSerializerMixin,
+    generics.ListAPIView,
+):
+    versioned_name = "vote"
+    pagination_class = VoteHistoryPagination
 
     def get_queryset(self):
-        return Vote.objects.filter(employee=self.request.user).select_related(
-            "menu", "menu__restaurant"
+        queryset = Vote.objects.filter(employee_id=self.request.user.pk)
+        if self.fieldset is not None:
+            # The keyset pagination reads the date back from the last vote
+            return self.fieldset.load(
+                queryset, self.get_serializer_class(), keep=("date",)
+            )
+        return self.versioned_serializers.load_related(
+            queryset.select_related("menu", "menu__restaurant")
         )
 
 
-class TodayResultsView(VersionedSerializerMixin, generics.ListAPIView):
-    serializer_classes = {
-        "1.0": VotingResultSerializerV1,
-        "2.0": VotingResultSerializerV2,
-    }
+class AsyncUserVoteHistoryView(AsyncListAPIView, UserVoteHistoryView):
+    """
+    UserVoteHistoryView for ASGI servers; the page is counted and fetched
+    with Django's async ORM.
+    """
 
-    def get_queryset(self):
-        today = timezone.now().date()
+
+class TodayResultsView(
+    DocumentCacheMixin,
+    ConditionalGetMixin,
+    CompiledReadMixin,
+    VersionedSerializerMixin,
+    generics.ListAPIView,
+):
+    """
+    Results of today's voting. Once voting has closed the JSON is served from
+    the results document cache, with its compressed variants.
+    """
+
+    versioned_name = "results"
+    serializer_role = "results"
+
+    def get_date(self):
+        return timezone.now().date()
+
+    def get_etag_stamp(self):
+        date = self.get_date()
         return (
-            Vote.objects.filter(date=today)
-            .select_related("menu", "menu__restaurant")
-            .values("menu")
-            .annotate(votes_count=Count("id"))
-            .order_by("-votes_count")
+            tally.get_stamp(date),
+            is_voting_closed(date),
+            menu_documents.get_generation(),
         )
 
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        if self.request.version == "2.0":
-            context["results"] = self.get_queryset()
-        return context
+    def get_queryset(self):
+        return get_results_for_date(self.get_date())
+
+    def get_document_key(self, request):
+        if (
+            self.etag is None
+            or not self.is_document_cacheable(request)
+            or not is_voting_closed(self.get_date())
+        ):
+            return None
+        return documents.get_document_key(self.etag)
+
+
+class AsyncTodayResultsView(
+    AsyncDocumentCacheMixin,
+    AsyncConditionalGetMixin,
+    AsyncListAPIView,
+    TodayResultsView,
+):
+    """
+    TodayResultsView for ASGI servers, reading through the async ORM.
+    """
+
+    pagination_class = AsyncPageNumberPagination
+
+    async def aget_queryset(self):
+        return await aget_results_for_date(self.get_date())
+
+
+class TodayResultsStreamView(View):
+    """
+    Server-Sent Events stream of today's results for the voting window. Sends a
+    snapshot of the counts first, then a small event whenever a vote changes a
+    menu's count, or a new snapshot when the counts have to be refreshed, and
+    ends once voting closes. Requires an ASGI server.
+    """
+
+    keep_alive_interval = 15
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user = await sync_to_async(self.authenticate)(request)
+        except exceptions.APIException as error:
+            return JsonResponse({"detail": str(error.detail)}, status=401)
+        if not user or not user.is_authenticated:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=401,
+            )
+
+        response = StreamingHttpResponse(
+            self.stream(timezone.now().date()), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def authenticate(self, request):
+        authenticators = [
+            authentication()
+            for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ]
+        return Request(request, authenticators=authenticators).user
+
+    async def stream(self, date):
+        yield await self.get_snapshot_event(date)
+
+        if not is_voting_closed(date):
+            async with aclosing(
+                broadcaster.subscribe(timeout=self.keep_alive_interval)
+            ) as events:
+                async for event in events:
+                    if is_voting_closed(date):
+                        break
+                    if event is None:
+                        yield ": keep-alive\n\n"
+                    elif event["date"] != date.isoformat():
+                        continue
+                    elif event.get("refresh"):
+                        yield await self.get_snapshot_event(date)
+                    else:
+                        yield self.format_event("vote", event)
+        yield self.format_event("closed", {"date": date.isoformat()})
+
+    async def get_snapshot_event(self, date):
+        results = await sync_to_async(get_results_for_date)(date)
+        return self.format_event(
+            "snapshot",
+            [
+                {"menu_id": row["menu"].id, "votes_count": row["votes_count"]}
+                for row in results
+            ],
+        )
+
+    def format_event(self, name, data):
+        return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+class DateResultsView(TodayResultsView):
+    def get_date(self):
+        return self.kwargs["date"]
+
+
+class ResultsHistoryView(VersionedSerializerMixin, generics.GenericAPIView):
+    """
+    Per-day winners and per-restaurant vote totals over a date range, read from
+    the snapshots and rollups of closed days.
+    """
+
+    versioned_name = "results-history"
+    serializer_role = "results"
+
+    def get(self, request, *args, **kwargs):
+        query = self.versioned_serializers.input(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start = query.validated_data["from"]
+        end = query.validated_data["to"]
+        restaurant = query.validated_data.get("restaurant")
+
+        serializer = self.get_serializer(
+            {
+                "winners": get_daily_winners(start, end, restaurant),
+                "totals": get_restaurant_totals(start, end, restaurant),
+            }
+        )
+        return Response(serializer.data)